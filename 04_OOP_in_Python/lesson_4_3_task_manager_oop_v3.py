@@ -13,15 +13,27 @@ This version of the task manager:
 - Implements proper encapsulation
 - Uses inheritance for different task types
 - Has a more organized structure
+- Uses __slots__ to keep task objects small
+- Keeps tasks grouped by status and priority for fast filtered views
 """
 
-from typing import List, Optional
+import sys
+from typing import Dict, List, Optional
 from datetime import datetime
 from abc import ABC, abstractmethod
 
+# Status strings shared by all tasks, so each task refers to the same
+# two objects instead of holding its own copy
+PENDING = "pending"
+COMPLETED = "completed"
+
 class Task(ABC):
     """Abstract base class for tasks"""
     
+    # __slots__ replaces the per-instance __dict__ with fixed attribute
+    # slots, which makes every task object considerably smaller
+    __slots__ = ("description", "priority", "status", "created_at")
+    
     def __init__(self, description: str, priority: str = "medium"):
         """Initialize a new task
         
@@ -30,8 +42,8 @@ class Task(ABC):
             priority: The task priority
         """
         self.description = description
-        self.priority = priority
-        self.status = "pending"
+        self.priority = sys.intern(priority)
+        self.status = PENDING
         self.created_at = datetime.now()
     
     @abstractmethod
@@ -45,7 +57,7 @@ class Task(ABC):
     
     def mark_complete(self) -> None:
         """Mark the task as complete"""
-        self.status = "completed"
+        self.status = COMPLETED
     
     def __str__(self) -> str:
         return (f"{self.get_type()} Task: {self.description} "
@@ -54,12 +66,16 @@ class Task(ABC):
 class BasicTask(Task):
     """A basic task with no additional features"""
     
+    __slots__ = ()
+    
     def get_type(self) -> str:
         return "Basic"
 
 class TimedTask(Task):
     """A task with a deadline"""
     
+    __slots__ = ("deadline",)
+    
     def __init__(self, description: str, deadline: datetime, priority: str = "medium"):
         """Initialize a new timed task
         
@@ -80,7 +96,7 @@ class TimedTask(Task):
         Returns:
             True if overdue, False otherwise
         """
-        return datetime.now() > self.deadline and self.status != "completed"
+        return datetime.now() > self.deadline and self.status != COMPLETED
     
     def __str__(self) -> str:
         base_str = super().__str__()
@@ -92,6 +108,19 @@ class TaskManager:
     def __init__(self):
         """Initialize a new task manager"""
         self.tasks: List[Task] = []
+        # Tasks grouped by status and by priority, so filtered reads only
+        # touch the matching tasks (dicts keep insertion order)
+        self.by_status: Dict[str, Dict[Task, None]] = {}
+        self.by_priority: Dict[str, Dict[Task, None]] = {}
+    
+    def _index_task(self, task: Task) -> None:
+        """Add a task to the status and priority buckets
+        
+        Args:
+            task: The task to add
+        """
+        self.by_status.setdefault(task.status, {})[task] = None
+        self.by_priority.setdefault(task.priority, {})[task] = None
     
     def add_task(self, task: Task) -> None:
         """Add a new task
@@ -100,20 +129,33 @@ class TaskManager:
             task: The task to add
         """
         self.tasks.append(task)
+        self._index_task(task)
         print(f"Task added: {task.description}")
     
-    def get_tasks(self, status: Optional[str] = None) -> List[Task]:
-        """Get tasks with optional status filter
+    def get_tasks(self, status: Optional[str] = None,
+                  priority: Optional[str] = None) -> List[Task]:
+        """Get tasks with optional status and priority filters
+        
+        Filtered reads only visit the tasks in the matching buckets.
         
         Args:
             status: Optional status to filter by
+            priority: Optional priority to filter by
             
         Returns:
             List of matching tasks
         """
-        if status is None:
+        if status is None and priority is None:
             return self.tasks
-        return [task for task in self.tasks if task.status == status]
+        if priority is None:
+            return list(self.by_status.get(status, {}))
+        if status is None:
+            return list(self.by_priority.get(priority, {}))
+        by_status = self.by_status.get(status, {})
+        by_priority = self.by_priority.get(priority, {})
+        if len(by_status) <= len(by_priority):
+            return [task for task in by_status if task in by_priority]
+        return [task for task in by_priority if task in by_status]
     
     def mark_task_complete(self, task_index: int) -> bool:
         """Mark a task as complete
@@ -125,7 +167,10 @@ class TaskManager:
             True if successful, False otherwise
         """
         if 0 <= task_index < len(self.tasks):
-            self.tasks[task_index].mark_complete()
+            task = self.tasks[task_index]
+            del self.by_status[task.status][task]
+            task.mark_complete()
+            self.by_status.setdefault(task.status, {})[task] = None
             return True
         return False
     
@@ -14,17 +14,32 @@ This version of the task manager:
 - Handles file errors gracefully
 - Validates task data
 - Uses context managers
+- Can store tasks in an indexed SQLite database instead
+- Uses __slots__ to keep task objects small
+- Restores saved tasks without re-running their constructors
+- Keeps tasks grouped by status and priority for fast filtered views
 """
 
 import json
 import os
-from typing import List, Optional
+import sqlite3
+import sys
+from typing import Dict, List, Optional
 from datetime import datetime
 from abc import ABC, abstractmethod
 
+# Task statuses
+PENDING = "pending"
+COMPLETED = "completed"
+
+TASK_PRIORITIES = ("low", "medium", "high")
+TASK_STATUSES = (PENDING, COMPLETED)
+
 class Task(ABC):
     """Abstract base class for tasks"""
     
+    __slots__ = ("description", "priority", "status", "created_at")
+    
     def __init__(self, description: str, priority: str = "medium"):
         """Initialize a new task
         
@@ -33,8 +48,8 @@ class Task(ABC):
             priority: The task priority
         """
         self.description = description
-        self.priority = priority
-        self.status = "pending"
+        self.priority = sys.intern(priority)
+        self.status = PENDING
         self.created_at = datetime.now()
     
     @abstractmethod
@@ -48,7 +63,7 @@ class Task(ABC):
     
     def mark_complete(self) -> None:
         """Mark the task as complete"""
-        self.status = "completed"
+        self.status = COMPLETED
     
     def to_dict(self) -> dict:
         """Convert task to dictionary
@@ -85,6 +100,40 @@ class Task(ABC):
             )
         raise ValueError(f"Unknown task type: {task_type}")
     
+    @classmethod
+    def from_trusted_dict(cls, data: dict) -> 'Task':
+        """Create task from a dictionary written by to_dict
+        
+        The constructors are skipped, so the saved status and creation
+        time are kept and no per-task work such as datetime.now() is done.
+        The priority and status are still checked, since the status and
+        priority buckets rely on them. Only use this for records whose
+        schema has been checked.
+        
+        Args:
+            data: Dictionary containing task data
+            
+        Returns:
+            Task instance
+            
+        Raises:
+            ValueError: If the priority or status is unknown
+        """
+        priority = data["priority"]
+        if priority not in TASK_PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority}")
+        status = data.get("status", PENDING)
+        if status not in TASK_STATUSES:
+            raise ValueError(f"Unknown status: {status}")
+        task = object.__new__(TASK_CLASSES[data["type"]])
+        task.description = data["description"]
+        task.priority = sys.intern(priority)
+        task.status = sys.intern(status)
+        task.created_at = datetime.fromisoformat(data["created_at"])
+        if isinstance(task, TimedTask):
+            task.deadline = datetime.fromisoformat(data["deadline"])
+        return task
+    
     def __str__(self) -> str:
         return (f"{self.get_type()} Task: {self.description} "
                 f"(Priority: {self.priority}, Status: {self.status})")
@@ -92,12 +141,16 @@ class Task(ABC):
 class BasicTask(Task):
     """A basic task with no additional features"""
     
+    __slots__ = ()
+    
     def get_type(self) -> str:
         return "Basic"
 
 class TimedTask(Task):
     """A task with a deadline"""
     
+    __slots__ = ("deadline",)
+    
     def __init__(self, description: str, deadline: datetime, priority: str = "medium"):
         """Initialize a new timed task
         
@@ -118,7 +171,7 @@ class TimedTask(Task):
         Returns:
             True if overdue, False otherwise
         """
-        return datetime.now() > self.deadline and self.status != "completed"
+        return datetime.now() > self.deadline and self.status != COMPLETED
     
     def to_dict(self) -> dict:
         """Convert task to dictionary
@@ -134,6 +187,31 @@ class TimedTask(Task):
         base_str = super().__str__()
         return f"{base_str} (Deadline: {self.deadline})"
 
+TASK_CLASSES = {"Basic": BasicTask, "Timed": TimedTask}
+
+def check_task_schema(data: list) -> None:
+    """Check that loaded JSON looks like a list of saved tasks
+    
+    Only the first record is inspected; the rest are assumed to have
+    been written the same way.
+    
+    Args:
+        data: The loaded JSON data
+        
+    Raises:
+        ValueError: If the data does not match the task schema
+    """
+    if not isinstance(data, list):
+        raise ValueError("Task file must contain a list of tasks")
+    if not data:
+        return
+    first = data[0]
+    for field in ("type", "description", "priority", "status", "created_at"):
+        if field not in first:
+            raise ValueError(f"Task record is missing {field}")
+    if first["type"] not in TASK_CLASSES:
+        raise ValueError(f"Unknown task type: {first['type']}")
+
 class TaskManager:
     """A class to manage tasks"""
     
@@ -145,6 +223,10 @@ class TaskManager:
         """
         self.filename = filename
         self.tasks: List[Task] = []
+        # Tasks grouped by status and by priority, so filtered reads only
+        # touch the matching tasks (dicts keep insertion order)
+        self.by_status: Dict[str, Dict[Task, None]] = {}
+        self.by_priority: Dict[str, Dict[Task, None]] = {}
         self.load_tasks()
     
     def load_tasks(self) -> None:
@@ -155,10 +237,28 @@ class TaskManager:
         try:
             with open(self.filename, "r") as file:
                 data = json.load(file)
-                self.tasks = [Task.from_dict(task_data) for task_data in data]
+            check_task_schema(data)
+            self.tasks = [Task.from_trusted_dict(task_data) for task_data in data]
         except (json.JSONDecodeError, KeyError, ValueError) as e:
             print(f"Error loading tasks: {e}")
             self.tasks = []
+        self._rebuild_indexes()
+    
+    def _rebuild_indexes(self) -> None:
+        """Rebuild the status and priority buckets from the task list"""
+        self.by_status = {}
+        self.by_priority = {}
+        for task in self.tasks:
+            self._index_task(task)
+    
+    def _index_task(self, task: Task) -> None:
+        """Add a task to the status and priority buckets
+        
+        Args:
+            task: The task to add
+        """
+        self.by_status.setdefault(task.status, {})[task] = None
+        self.by_priority.setdefault(task.priority, {})[task] = None
     
     def save_tasks(self) -> None:
         """Save tasks to file"""
@@ -176,21 +276,34 @@ class TaskManager:
             task: The task to add
         """
         self.tasks.append(task)
+        self._index_task(task)
         self.save_tasks()
         print(f"Task added: {task.description}")
     
-    def get_tasks(self, status: Optional[str] = None) -> List[Task]:
-        """Get tasks with optional status filter
+    def get_tasks(self, status: Optional[str] = None,
+                  priority: Optional[str] = None) -> List[Task]:
+        """Get tasks with optional status and priority filters
+        
+        Filtered reads only visit the tasks in the matching buckets.
         
         Args:
             status: Optional status to filter by
+            priority: Optional priority to filter by
             
         Returns:
             List of matching tasks
         """
-        if status is None:
+        if status is None and priority is None:
             return self.tasks
-        return [task for task in self.tasks if task.status == status]
+        if priority is None:
+            return list(self.by_status.get(status, {}))
+        if status is None:
+            return list(self.by_priority.get(priority, {}))
+        by_status = self.by_status.get(status, {})
+        by_priority = self.by_priority.get(priority, {})
+        if len(by_status) <= len(by_priority):
+            return [task for task in by_status if task in by_priority]
+        return [task for task in by_priority if task in by_status]
     
     def mark_task_complete(self, task_index: int) -> bool:
         """Mark a task as complete
@@ -202,7 +315,10 @@ class TaskManager:
             True if successful, False otherwise
         """
         if 0 <= task_index < len(self.tasks):
-            self.tasks[task_index].mark_complete()
+            task = self.tasks[task_index]
+            del self.by_status[task.status][task]
+            task.mark_complete()
+            self.by_status.setdefault(task.status, {})[task] = None
             self.save_tasks()
             return True
         return False
@@ -224,6 +340,194 @@ class TaskManager:
             if isinstance(task, TimedTask) and task.is_overdue():
                 print("   ⚠️ This task is overdue!")
 
+class SQLiteTaskManager(TaskManager):
+    """A task manager that stores tasks in an SQLite database
+    
+    Tasks are not kept in memory. Filters and overdue checks are SQL
+    queries that use the indexes on status, priority, deadline and
+    created_at, and every change is a single-row INSERT or UPDATE.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY,
+            type TEXT NOT NULL,
+            description TEXT NOT NULL,
+            priority TEXT NOT NULL,
+            status TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            deadline TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+        CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority);
+        CREATE INDEX IF NOT EXISTS idx_tasks_deadline ON tasks(deadline);
+        CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks(created_at);
+    """
+    
+    INSERT = ("INSERT INTO tasks (type, description, priority, status, "
+              "created_at, deadline) VALUES (?, ?, ?, ?, ?, ?)")
+    
+    def __init__(self, filename: str = "tasks.db"):
+        """Initialize a new SQLite task manager
+        
+        Args:
+            filename: Name of the database file
+        """
+        self.filename = filename
+        self.load_tasks()
+    
+    @property
+    def tasks(self) -> List[Task]:
+        """All tasks, read from the database"""
+        return self.get_tasks()
+    
+    def load_tasks(self) -> None:
+        """Open the database and create the schema if needed"""
+        self.connection = sqlite3.connect(self.filename)
+        self.connection.executescript(self.SCHEMA)
+    
+    def save_tasks(self) -> None:
+        """Commit pending changes (each change is already committed)"""
+        self.connection.commit()
+    
+    def close(self) -> None:
+        """Close the database connection"""
+        self.connection.close()
+    
+    def import_json(self, json_filename: str) -> int:
+        """Copy the tasks of a JSON task file into the database
+        
+        Args:
+            json_filename: The JSON file written by TaskManager
+            
+        Returns:
+            The number of imported tasks
+        """
+        try:
+            with open(json_filename, "r") as file:
+                data = json.load(file)
+            with self.connection:
+                self.connection.executemany(
+                    self.INSERT, [self._row_values(task_data) for task_data in data])
+        except (json.JSONDecodeError, KeyError, IOError, sqlite3.Error) as e:
+            print(f"Error importing tasks: {e}")
+            return 0
+        return len(data)
+    
+    @staticmethod
+    def _row_values(data: dict) -> tuple:
+        """Convert a task dictionary to the column values of a row"""
+        return (data["type"], data["description"], data["priority"],
+                data.get("status", "pending"),
+                data.get("created_at", datetime.now().isoformat()),
+                data.get("deadline"))
+    
+    @staticmethod
+    def _row_to_task(row: tuple) -> Task:
+        """Convert a database row to a task"""
+        _, task_type, description, priority, status, created_at, deadline = row
+        return Task.from_trusted_dict({"type": task_type, "description": description,
+                                       "priority": priority, "status": status,
+                                       "created_at": created_at, "deadline": deadline})
+    
+    def _query(self, where: str = "", params: tuple = ()) -> List[tuple]:
+        """Run a SELECT on the tasks table and return rows in insertion order"""
+        sql = ("SELECT id, type, description, priority, status, created_at, "
+               "deadline FROM tasks")
+        if where:
+            sql += " WHERE " + where
+        return self.connection.execute(sql + " ORDER BY id", params).fetchall()
+    
+    def add_task(self, task: Task) -> None:
+        """Add a new task with a single INSERT
+        
+        Args:
+            task: The task to add
+        """
+        try:
+            with self.connection:
+                self.connection.execute(self.INSERT, self._row_values(task.to_dict()))
+        except sqlite3.Error as e:
+            print(f"Error saving task: {e}")
+            return
+        print(f"Task added: {task.description}")
+    
+    def get_tasks(self, status: Optional[str] = None,
+                  priority: Optional[str] = None) -> List[Task]:
+        """Get tasks with optional status and priority filters
+        
+        Args:
+            status: Optional status to filter by
+            priority: Optional priority to filter by
+            
+        Returns:
+            List of matching tasks
+        """
+        conditions, params = [], []
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if priority is not None:
+            conditions.append("priority = ?")
+            params.append(priority)
+        rows = self._query(" AND ".join(conditions), tuple(params))
+        return [self._row_to_task(row) for row in rows]
+    
+    def get_overdue_tasks(self) -> List[Task]:
+        """Get pending tasks whose deadline has passed
+        
+        Returns:
+            List of overdue tasks
+        """
+        rows = self._query("deadline < ? AND status != 'completed'",
+                           (datetime.now().isoformat(),))
+        return [self._row_to_task(row) for row in rows]
+    
+    def mark_task_complete(self, task_index: int) -> bool:
+        """Mark a task as complete with a single UPDATE
+        
+        Tasks are never deleted in this version, so the task at index i
+        is the row with ID i + 1 and is updated through the primary key.
+        
+        Args:
+            task_index: The index of the task
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if task_index < 0:
+            return False
+        with self.connection:
+            cursor = self.connection.execute(
+                "UPDATE tasks SET status = 'completed' WHERE id = ?",
+                (task_index + 1,))
+        return cursor.rowcount == 1
+    
+    def view_tasks(self, status: Optional[str] = None) -> None:
+        """Display tasks with optional status filter
+        
+        Args:
+            status: Optional status to filter by
+        """
+        if status is None:
+            rows = self._query()
+        else:
+            rows = self._query("status = ?", (status,))
+        if not rows:
+            print("No tasks found!")
+            return
+        
+        overdue_ids = {row[0] for row in self._query(
+            "deadline < ? AND status != 'completed'",
+            (datetime.now().isoformat(),))}
+        
+        print("\nTasks:")
+        for i, row in enumerate(rows, 1):
+            print(f"{i}. {self._row_to_task(row)}")
+            if row[0] in overdue_ids:
+                print("   ⚠️ This task is overdue!")
+
+
 def display_menu() -> None:
     """Display the main menu"""
     print("\nTask Manager v4")
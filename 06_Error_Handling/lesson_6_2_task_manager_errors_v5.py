@@ -14,14 +14,67 @@ This version of the task manager:
 - Handles file operation errors gracefully
 - Provides clear error messages
 - Implements error recovery
+- Can append changes to a journal instead of rewriting the whole file
+- Compacts the journal into a fresh snapshot in the background
+- Streams large task files instead of parsing them in one piece
+- Can save tasks in a compact binary format
+- Uses __slots__ to keep task objects small
+- Loads saved tasks without re-validating them, so overdue tasks still load
+- Gives every task a stable ID for direct lookup, completion and deletion
+- Keeps tasks grouped by status and priority for fast filtered views
+- Finds overdue tasks and the next deadline with a deadline heap
+- Answers time-range queries from sorted timestamp indexes
+- Searches task descriptions with an inverted word index
+- Finds similar descriptions despite typos using a trigram index
+- Completes task descriptions with Tab from earlier descriptions
+- Can refuse duplicate tasks, checked first with a Bloom filter
+- Lists the most urgent pending tasks by priority and deadline
+- Keeps running task counts for summaries without reading every task
+- Groups many changes into one transaction that is saved once
+- Completes or deletes all tasks that match a condition in one pass
+- Can save in a background thread so menu actions never wait for the disk
+  (run with --write-behind)
+- Can write journal snapshots from a forked process without pausing
+- Lets several processes share one task file safely
+
+Other ways of storing tasks live in their own modules next to this one:
+- task_manager_sqlite: an indexed SQLite database
+- task_manager_lazy: task objects loaded only when they are used
+- task_manager_mapped: a memory-mapped file with in-place status updates
+- task_table: a column-oriented table for fast filters (NumPy)
 """
 
+import atexit
+import bisect
+import hashlib
+import heapq
 import json
+import math
 import os
-from typing import List, Optional
-from datetime import datetime
+import re
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from itertools import chain
+from typing import (Any, BinaryIO, Callable, Dict, Iterable, Iterator, List,
+                    Optional, Set, TextIO, Tuple)
+from datetime import datetime, timedelta
 from abc import ABC, abstractmethod
 
+try:
+    import readline
+except ImportError:  # Not available on Windows; descriptions are not completed
+    readline = None
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; shared mode needs it
+    fcntl = None
+
 class TaskError(Exception):
     """Base class for task-related errors"""
     pass
@@ -34,9 +87,238 @@ class FileOperationError(TaskError):
     """Exception for file operation errors"""
     pass
 
+class DuplicateTaskError(ValidationError):
+    """Exception for a task that duplicates an existing one"""
+    pass
+
+# Task statuses
+PENDING = "pending"
+COMPLETED = "completed"
+
+# Values stored as small integer codes in binary and index files
+TASK_TYPES = ("Basic", "Timed")
+TASK_PRIORITIES = ("low", "medium", "high")
+TASK_STATUSES = (PENDING, COMPLETED)
+
+# Binary task files start with BINARY_MAGIC, followed by one record per
+# task: the task ID, type, priority and status codes, created_at, deadline and
+# completed_at in microseconds since EPOCH (NO_TIME if not set), the
+# description length in bytes and then the UTF-8 description.
+BINARY_MAGIC = b"TASKBIN2"
+BINARY_RECORD = struct.Struct("<qBBBqqqI")
+EPOCH = datetime(1970, 1, 1)
+NO_TIME = -2 ** 63
+
+def to_microseconds(moment: datetime) -> int:
+    """Convert a datetime to microseconds since EPOCH"""
+    return (moment - EPOCH) // timedelta(microseconds=1)
+
+def from_microseconds(value: int) -> datetime:
+    """Convert microseconds since EPOCH back to a datetime"""
+    return EPOCH + timedelta(microseconds=value)
+
+WORD_PATTERN = re.compile(r"\w+")
+
+def tokenize(text: str) -> Set[str]:
+    """Split text into the lowercase words used by the search index
+    
+    Args:
+        text: The text to split
+        
+    Returns:
+        The distinct words of the text
+    """
+    return set(WORD_PATTERN.findall(text.lower()))
+
+def normalize_description(description: str) -> str:
+    """Get the form of a description used to detect duplicates
+    
+    Case and runs of whitespace are ignored.
+    
+    Args:
+        description: The task description
+        
+    Returns:
+        The normalized description
+    """
+    return " ".join(description.casefold().split())
+
+def trigrams(text: str) -> Set[str]:
+    """Split text into the three-character pieces used by fuzzy search
+    
+    Each word is padded so that its start and end form trigrams of
+    their own, which makes matches on the start of a word count more.
+    
+    Args:
+        text: The text to split
+        
+    Returns:
+        The distinct trigrams of the text
+    """
+    grams = set()
+    for word in WORD_PATTERN.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+def trigram_similarity(shared: int, first: int, second: int) -> float:
+    """Jaccard similarity of two trigram sets from their sizes
+    
+    Args:
+        shared: Number of trigrams in both sets
+        first: Size of the first set
+        second: Size of the second set
+        
+    Returns:
+        A score between 0 and 1
+    """
+    return shared / (first + second - shared) if shared else 0.0
+
+def iter_json_array(file: TextIO, buffer_size: int = 64 * 1024) -> Iterator[Any]:
+    """Yield the elements of a JSON array one at a time
+    
+    The file is read in chunks of buffer_size characters and text that
+    has been parsed is dropped, so only the current element and one chunk
+    are held in memory instead of the whole document.
+    
+    Args:
+        file: A text file containing a JSON array
+        buffer_size: Number of characters to read at a time
+        
+    Yields:
+        The parsed array elements
+        
+    Raises:
+        json.JSONDecodeError: If the file is not a valid JSON array
+    """
+    for _, _, value in scan_json_array(file, buffer_size):
+        yield value
+
+def scan_json_array(file: TextIO,
+                    buffer_size: int = 64 * 1024) -> Iterator[Tuple[int, int, Any]]:
+    """Yield each element of a JSON array with its position in the file
+    
+    Works like iter_json_array. Positions count characters from the start
+    of the file; open the file with encoding="latin-1" to get byte offsets.
+    
+    Args:
+        file: A text file containing a JSON array
+        buffer_size: Number of characters to read at a time
+        
+    Yields:
+        Tuples of (start, end, element)
+        
+    Raises:
+        json.JSONDecodeError: If the file is not a valid JSON array
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    consumed = 0  # characters dropped from the front of the buffer
+    eof = False
+    started = False
+    
+    while True:
+        # Skip whitespace and the separators between elements
+        while pos < len(buffer) and buffer[pos] in " \t\r\n":
+            pos += 1
+        
+        if pos == len(buffer):
+            if eof:
+                raise json.JSONDecodeError("Unexpected end of file", buffer, pos)
+            consumed += len(buffer)
+            buffer = file.read(buffer_size)
+            pos = 0
+            eof = not buffer
+            continue
+        
+        char = buffer[pos]
+        if not started:
+            if char != "[":
+                raise json.JSONDecodeError("Expected '['", buffer, pos)
+            started = True
+            expect_value = True
+            after_comma = False
+            pos += 1
+            continue
+        if char == "]" and not after_comma:
+            # Only whitespace may follow the array
+            rest = buffer[pos + 1:]
+            while True:
+                if rest.strip(" \t\r\n"):
+                    raise json.JSONDecodeError("Extra data after the array",
+                                               buffer, pos + 1)
+                if eof:
+                    return
+                rest = file.read(buffer_size)
+                eof = not rest
+        if not expect_value:
+            if char != ",":
+                raise json.JSONDecodeError("Expected ',' or ']'", buffer, pos)
+            expect_value = True
+            after_comma = True
+            pos += 1
+            continue
+        
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+            # A number is only complete if a delimiter follows it, since
+            # "1." or "1.5e" may continue in the next chunk
+            complete = eof or (end < len(buffer) and (
+                not isinstance(value, (int, float)) or isinstance(value, bool)
+                or buffer[end] in " \t\r\n,]"))
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            complete = False
+        
+        if not complete:
+            # The element continues in the next chunk
+            chunk = file.read(buffer_size)
+            eof = not chunk
+            consumed += pos
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+        
+        yield consumed + pos, consumed + end, value
+        expect_value = False
+        after_comma = False
+        pos = end
+        if pos >= buffer_size:
+            consumed += pos
+            buffer = buffer[pos:]
+            pos = 0
+
+def read_binary_records(file: BinaryIO) -> Iterator[bytes]:
+    """Yield the task records of a binary task file
+    
+    Args:
+        file: A file opened in binary mode
+        
+    Yields:
+        One record per task, for Task.from_bytes
+        
+    Raises:
+        ValidationError: If the file is not a binary task file
+    """
+    if file.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+        raise ValidationError("Not a binary task file")
+    while True:
+        header = file.read(BINARY_RECORD.size)
+        if not header:
+            return
+        if len(header) != BINARY_RECORD.size:
+            raise ValidationError("Truncated task record")
+        length = BINARY_RECORD.unpack(header)[-1]
+        yield header + file.read(length)
+
 class Task(ABC):
     """Abstract base class for tasks"""
     
+    __slots__ = ("id", "description", "priority", "status", "created_at",
+                 "completed_at")
+    
     def __init__(self, description: str, priority: str = "medium"):
         """Initialize a new task
         
@@ -53,10 +335,12 @@ class Task(ABC):
         if priority not in ["low", "medium", "high"]:
             raise ValidationError("Priority must be low, medium, or high")
         
+        self.id: Optional[int] = None  # Assigned by the task manager
         self.description = description
-        self.priority = priority
-        self.status = "pending"
+        self.priority = sys.intern(priority)
+        self.status = PENDING
         self.created_at = datetime.now()
+        self.completed_at: Optional[datetime] = None
     
     @abstractmethod
     def get_type(self) -> str:
@@ -69,7 +353,8 @@ class Task(ABC):
     
     def mark_complete(self) -> None:
         """Mark the task as complete"""
-        self.status = "completed"
+        self.status = COMPLETED
+        self.completed_at = datetime.now()
     
     def to_dict(self) -> dict:
         """Convert task to dictionary
@@ -78,11 +363,14 @@ class Task(ABC):
             Dictionary representation of task
         """
         return {
+            "id": self.id,
             "type": self.get_type(),
             "description": self.description,
             "priority": self.priority,
             "status": self.status,
-            "created_at": self.created_at.isoformat()
+            "created_at": self.created_at.isoformat(),
+            "completed_at": (self.completed_at.isoformat()
+                             if self.completed_at else None)
         }
     
     @classmethod
@@ -101,17 +389,153 @@ class Task(ABC):
         try:
             task_type = data["type"]
             if task_type == "Basic":
-                return BasicTask(data["description"], data["priority"])
+                task = BasicTask(data["description"], data["priority"])
             elif task_type == "Timed":
-                return TimedTask(
+                task = TimedTask(
                     data["description"],
                     datetime.fromisoformat(data["deadline"]),
                     data["priority"]
                 )
-            raise ValidationError(f"Unknown task type: {task_type}")
+            else:
+                raise ValidationError(f"Unknown task type: {task_type}")
+            task.id = data.get("id")
+            task.status = sys.intern(data.get("status", PENDING))
+            if "created_at" in data:
+                task.created_at = datetime.fromisoformat(data["created_at"])
+            if data.get("completed_at"):
+                task.completed_at = datetime.fromisoformat(data["completed_at"])
+            return task
         except (KeyError, ValueError) as e:
             raise ValidationError(f"Invalid task data: {e}") from e
     
+    @classmethod
+    def from_trusted_dict(cls, data: dict) -> 'Task':
+        """Create task from a dictionary written by to_dict
+        
+        Unlike from_dict this does not re-run the checks for new tasks, so
+        it is faster and a timed task whose deadline has passed still
+        loads. The ID, description, priority and status are still checked,
+        since the indexes and counts rely on them. Use it for stored data
+        whose schema has been checked with check_task_schema.
+        
+        Args:
+            data: Dictionary containing task data
+            
+        Returns:
+            Task instance
+            
+        Raises:
+            ValidationError: If a field is missing or malformed
+        """
+        try:
+            task_class = TASK_CLASSES[data["type"]]
+            deadline = data.get("deadline")
+            if task_class is TimedTask and not deadline:
+                raise ValidationError("Timed task without a deadline")
+            task_id = data.get("id")
+            if task_id is not None and (type(task_id) is not int
+                                        or task_id < 1):
+                raise ValidationError(f"Invalid task ID: {task_id!r}")
+            description = data["description"]
+            if not isinstance(description, str) or not description:
+                raise ValidationError("Task description cannot be empty")
+            priority = data["priority"]
+            if priority not in TASK_PRIORITIES:
+                raise ValidationError(f"Unknown priority: {priority}")
+            status = data.get("status", PENDING)
+            if status not in TASK_STATUSES:
+                raise ValidationError(f"Unknown status: {status}")
+            completed_at = data.get("completed_at")
+            return task_class._restore(
+                task_id,
+                description,
+                sys.intern(priority),
+                sys.intern(status),
+                datetime.fromisoformat(data["created_at"]),
+                datetime.fromisoformat(completed_at) if completed_at else None,
+                datetime.fromisoformat(deadline) if deadline else None)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValidationError(f"Invalid task data: {e}") from e
+    
+    @classmethod
+    def _restore(cls, task_id: Optional[int], description: str, priority: str,
+                 status: str, created_at: datetime,
+                 completed_at: Optional[datetime] = None,
+                 deadline: Optional[datetime] = None) -> 'Task':
+        """Create a task from stored values without validating them
+        
+        Args:
+            task_id: The task ID
+            description: The task description
+            priority: The task priority
+            status: The task status
+            created_at: When the task was created
+            completed_at: When the task was completed, if it was
+            deadline: The deadline of a timed task
+            
+        Returns:
+            Task instance
+        """
+        task = object.__new__(cls)
+        task.id = task_id
+        task.description = description
+        task.priority = priority
+        task.status = status
+        task.created_at = created_at
+        task.completed_at = completed_at
+        if deadline is not None:
+            task.deadline = deadline
+        return task
+    
+    def to_bytes(self) -> bytes:
+        """Convert task to a binary record
+        
+        Returns:
+            Binary representation of task
+        """
+        description = self.description.encode("utf-8")
+        deadline = getattr(self, "deadline", None)
+        return BINARY_RECORD.pack(
+            self.id or 0,
+            TASK_TYPES.index(self.get_type()),
+            TASK_PRIORITIES.index(self.priority),
+            TASK_STATUSES.index(self.status),
+            to_microseconds(self.created_at),
+            NO_TIME if deadline is None else to_microseconds(deadline),
+            NO_TIME if self.completed_at is None
+            else to_microseconds(self.completed_at),
+            len(description)) + description
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Task':
+        """Create task from a binary record
+        
+        Args:
+            data: A record produced by to_bytes
+            
+        Returns:
+            Task instance
+            
+        Raises:
+            ValidationError: If data is invalid
+        """
+        try:
+            (task_id, type_code, priority_code, status_code, created_at,
+             deadline, completed_at, length) = BINARY_RECORD.unpack_from(data)
+            description = data[BINARY_RECORD.size:BINARY_RECORD.size + length]
+            if len(description) != length:
+                raise ValidationError("Truncated task record")
+            return TASK_CLASSES[TASK_TYPES[type_code]]._restore(
+                task_id or None,
+                description.decode("utf-8"),
+                TASK_PRIORITIES[priority_code],
+                TASK_STATUSES[status_code],
+                from_microseconds(created_at),
+                None if completed_at == NO_TIME else from_microseconds(completed_at),
+                None if deadline == NO_TIME else from_microseconds(deadline))
+        except (struct.error, IndexError, UnicodeDecodeError) as e:
+            raise ValidationError(f"Invalid task record: {e}") from e
+    
     def __str__(self) -> str:
         return (f"{self.get_type()} Task: {self.description} "
                 f"(Priority: {self.priority}, Status: {self.status})")
@@ -119,12 +543,16 @@ class Task(ABC):
 class BasicTask(Task):
     """A basic task with no additional features"""
     
+    __slots__ = ()
+    
     def get_type(self) -> str:
         return "Basic"
 
 class TimedTask(Task):
     """A task with a deadline"""
     
+    __slots__ = ("deadline",)
+    
     def __init__(self, description: str, deadline: datetime, priority: str = "medium"):
         """Initialize a new timed task
         
@@ -152,7 +580,7 @@ class TimedTask(Task):
         Returns:
             True if overdue, False otherwise
         """
-        return datetime.now() > self.deadline and self.status != "completed"
+        return datetime.now() > self.deadline and self.status != COMPLETED
     
     def to_dict(self) -> dict:
         """Convert task to dictionary
@@ -168,128 +596,1860 @@ class TimedTask(Task):
         base_str = super().__str__()
         return f"{base_str} (Deadline: {self.deadline})"
 
+TASK_CLASSES = {"Basic": BasicTask, "Timed": TimedTask}
+
+# Fields every stored task record has
+TASK_FIELDS = ("type", "description", "priority", "status", "created_at")
+
+def check_task_schema(data: Any) -> None:
+    """Check that a stored task record looks like the output of to_dict
+    
+    Args:
+        data: The stored record
+        
+    Raises:
+        ValidationError: If the record does not match the task schema
+    """
+    if not isinstance(data, dict):
+        raise ValidationError("Task record must be an object")
+    missing = [field for field in TASK_FIELDS if field not in data]
+    if missing:
+        raise ValidationError(f"Task record is missing: {', '.join(missing)}")
+    if data["type"] not in TASK_CLASSES:
+        raise ValidationError(f"Unknown task type: {data['type']}")
+    if data["priority"] not in TASK_PRIORITIES:
+        raise ValidationError(f"Unknown priority: {data['priority']}")
+    if data["status"] not in TASK_STATUSES:
+        raise ValidationError(f"Unknown status: {data['status']}")
+    if not isinstance(data["description"], str) or not data["description"]:
+        raise ValidationError("Task description cannot be empty")
+
+def hydrate_tasks(records: Iterable[Any]) -> Iterator[Task]:
+    """Create tasks from stored records using the trusted load path
+    
+    The full schema is checked once, on the first record; the remaining
+    records go straight to Task.from_trusted_dict, which still checks
+    the priority and status of each one.
+    
+    Args:
+        records: Task dictionaries read from a task file
+        
+    Yields:
+        The tasks
+        
+    Raises:
+        ValidationError: If a record is invalid
+    """
+    records = iter(records)
+    for data in records:
+        check_task_schema(data)
+        yield Task.from_trusted_dict(data)
+        break
+    for data in records:
+        yield Task.from_trusted_dict(data)
+
+# Timestamp fields that can be queried by range
+TIME_FIELDS = ("created_at", "completed_at", "deadline")
+
+class TimeIndex:
+    """A sorted index of task IDs by timestamp for range queries
+    
+    Entries are (timestamp, ID) pairs kept in a sorted list, so the
+    start and end of a range are found with two binary searches and
+    the entries in between are read in time order.
+    """
+    
+    __slots__ = ("entries",)
+    
+    def __init__(self):
+        """Initialize an empty index"""
+        self.entries: List[Tuple[datetime, int]] = []
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def add(self, moment: datetime, task_id: int) -> None:
+        """Add an entry
+        
+        Args:
+            moment: The timestamp
+            task_id: The ID of the task
+        """
+        entry = (moment, task_id)
+        if not self.entries or self.entries[-1] < entry:
+            self.entries.append(entry)  # Usual case: the newest timestamp
+        else:
+            bisect.insort(self.entries, entry)
+    
+    def remove(self, moment: datetime, task_id: int) -> None:
+        """Remove an entry if it is present
+        
+        Args:
+            moment: The timestamp
+            task_id: The ID of the task
+        """
+        entry = (moment, task_id)
+        position = bisect.bisect_left(self.entries, entry)
+        if position < len(self.entries) and self.entries[position] == entry:
+            del self.entries[position]
+    
+    def count_before(self, moment: datetime) -> int:
+        """Count the entries with a timestamp before a moment
+        
+        Args:
+            moment: The exclusive upper bound
+            
+        Returns:
+            The number of entries
+        """
+        return bisect.bisect_left(self.entries, (moment,))
+    
+    def between(self, start: Optional[datetime] = None,
+                end: Optional[datetime] = None) -> Iterator[int]:
+        """Yield the IDs with start <= timestamp < end in time order
+        
+        Args:
+            start: Optional inclusive lower bound
+            end: Optional exclusive upper bound
+            
+        Yields:
+            Task IDs
+        """
+        entries = self.entries
+        # A 1-tuple sorts before every entry with the same timestamp
+        low = 0 if start is None else bisect.bisect_left(entries, (start,))
+        high = len(entries) if end is None else bisect.bisect_left(entries, (end,))
+        # Copy the range, so changes made while the caller iterates cannot
+        # shift the entries under it
+        for _, task_id in entries[low:high]:
+            yield task_id
+
+class BloomFilter:
+    """A compact set of strings that can only say "no" for certain
+    
+    Each string sets hash_count bits in a bit array. If any of those
+    bits is clear the string was never added; if all are set it was
+    probably added, with a false positive rate of about error_rate
+    while no more than capacity strings have been added.
+    """
+    
+    __slots__ = ("capacity", "size", "hash_count", "bits", "count")
+    
+    def __init__(self, capacity: int = 1024, error_rate: float = 0.01):
+        """Initialize an empty filter
+        
+        Args:
+            capacity: Number of strings the filter is sized for
+            error_rate: Target false positive rate at that size
+        """
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+    
+    def _positions(self, item: str) -> Iterator[int]:
+        """Get the bit positions of a string (double hashing)"""
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+    
+    def add(self, item: str) -> None:
+        """Add a string
+        
+        Args:
+            item: The string to add
+        """
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+    
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7))
+                   for position in self._positions(item))
+
 class TaskManager:
     """A class to manage tasks"""
     
-    def __init__(self, filename: str = "tasks.json"):
+    def __init__(self, filename: str = "tasks.json", journal: bool = False,
+                 compact_max_records: int = 1000,
+                 compact_max_bytes: int = 1024 * 1024,
+                 file_format: str = "json", write_behind: bool = False,
+                 flush_interval_ms: int = 500, flush_max_changes: int = 100,
+                 snapshot_mode: str = "thread", shared: bool = False):
         """Initialize a new task manager
         
         Args:
             filename: Name of the file to store tasks
+            journal: If True, append each change to a journal file instead
+                of rewriting the whole task file
+            compact_max_records: Journal records that trigger a compaction
+            compact_max_bytes: Journal size in bytes that triggers a compaction
+            file_format: "json" for a JSON task file, "binary" for the
+                compact binary record format
+            write_behind: If True, changes are stored by a background
+                thread instead of before each call returns
+            flush_interval_ms: Longest time in write-behind mode that a
+                change waits before it is stored
+            flush_max_changes: Number of waiting changes in write-behind
+                mode that are stored at once without waiting longer
+            snapshot_mode: How journal compactions write the snapshot:
+                "thread" copies the tasks and writes them in a background
+                thread, "fork" writes them from a forked child process
+            shared: If True, other processes may use the same task file:
+                saves take a file lock and first merge in what others saved
+            
+        Raises:
+            ValidationError: If the file format or snapshot mode is unknown,
+                or the options are not available on this platform or
+                cannot be combined
         """
+        if file_format not in ("json", "binary"):
+            raise ValidationError("File format must be json or binary")
+        if snapshot_mode not in ("thread", "fork"):
+            raise ValidationError("Snapshot mode must be thread or fork")
+        if snapshot_mode == "fork" and not hasattr(os, "fork"):
+            raise ValidationError("Fork snapshots need os.fork, which this "
+                                  "platform does not have")
+        if shared and fcntl is None:
+            raise ValidationError("Shared mode needs fcntl file locks, which "
+                                  "this platform does not have")
+        if shared and journal:
+            raise ValidationError("Shared mode does not support journal files")
+        
         self.filename = filename
-        self.tasks: List[Task] = []
+        self.file_format = file_format
+        self.journal = journal
+        self.journal_filename = filename + ".journal"
+        self.compacting_filename = filename + ".journal.compacting"
+        self.lock_filename = filename + ".lock"
+        self.next_id_filename = filename + ".next_id"
+        self.compact_max_records = compact_max_records
+        self.compact_max_bytes = compact_max_bytes
+        self.snapshot_mode = snapshot_mode
+        self.write_behind = write_behind
+        self.flush_interval_ms = flush_interval_ms
+        self.flush_max_changes = flush_max_changes
+        self.shared = shared
+        self._clear()
+        # (operation, task, undo) for each change of the running batch
+        self._batch: Optional[List[Tuple[str, Task, Callable[[], None]]]] = None
+        
+        # Guards the tasks and indexes. Readers take it as well, so they
+        # never see a reload that is only halfway done.
+        self._lock = threading.RLock()
+        # Held from applying a change in memory until it is staged, so a
+        # rebase never misses a change that is only in memory
+        self._change_lock = threading.RLock()
+        self._compaction_thread: Optional[threading.Thread] = None
+        self._compaction_pid: Optional[int] = None
+        self._compaction_started = 0.0
+        self._compaction_error: Optional[Exception] = None
+        self._journal_records = 0
+        self._journal_bytes = 0
+        self._compactions = 0
+        self._last_compaction_seconds = 0.0
+        # Changes waiting for the writer thread in write-behind mode
+        self._pending_changes: List[Tuple[str, Task, Callable[[], None]]] = []
+        self._first_pending = 0.0
+        self._changed = threading.Condition(self._lock)
+        self._flush_lock = threading.Lock()
+        self._writer_thread: Optional[threading.Thread] = None
+        self._write_error: Optional[Exception] = None
+        self._closing = False
+        # Identity of the task file version that was loaded or saved last
+        self._version: Optional[Tuple[int, int, int]] = None
+        
         self.load_tasks()
+        
+        if write_behind:
+            self._writer_thread = threading.Thread(target=self._run_writer,
+                                                   daemon=True)
+            self._writer_thread.start()
+            atexit.register(self.flush)
+    
+    def _clear(self) -> None:
+        """Start with no tasks and empty indexes"""
+        # Tasks by ID, in the order they were added
+        self.tasks: Dict[int, Task] = {}
+        self.next_id = 1
+        # Task IDs grouped by status and by priority, so filtered reads
+        # only touch the matching tasks
+        self.by_status: Dict[str, Dict[int, Task]] = {}
+        self.by_priority: Dict[str, Dict[int, Task]] = {}
+        # Min-heap of (deadline, ID) for pending timed tasks. Entries of
+        # tasks that were completed or deleted are dropped when reached.
+        self._deadlines: List[Tuple[datetime, int]] = []
+        # Min-heap of urgency keys for all pending tasks, kept the same way
+        self._urgency: List[Tuple[int, datetime, int]] = []
+        self.time_indexes = {field: TimeIndex() for field in TIME_FIELDS}
+        # Inverted index: the IDs of the tasks whose description has a word
+        self.word_index: Dict[str, Set[int]] = {}
+        # The same for the trigrams of each description, for fuzzy search
+        self.trigram_index: Dict[str, Set[int]] = {}
+        self.trigram_counts: Dict[int, int] = {}
+        # Normalized descriptions, to rule out duplicates without a search
+        self.description_filter = BloomFilter()
+        # Number of tasks for each (status, priority) pair and the deadlines
+        # of pending tasks, kept up to date on every change for stats()
+        self.counts: Counter = Counter()
+        self.pending_deadlines = TimeIndex()
     
     def load_tasks(self) -> None:
         """Load tasks from file
         
+        In journal mode the journal is replayed on top of the snapshot.
+        If the journal has grown past the thresholds it is compacted.
+        
+        Raises:
+            FileOperationError: If file operations fail
+        """
+        self._load_snapshot()
+        self._load_next_id()
+        
+        if self.journal:
+            self._journal_records = 0
+            self._journal_bytes = 0
+            self._replay_journal(self.compacting_filename)
+            self._replay_journal(self.journal_filename)
+            self._maybe_compact()
+    
+    def _load_snapshot(self) -> None:
+        """Load the tasks stored in the task file
+        
         Raises:
             FileOperationError: If file operations fail
         """
+        self._version = None
         if not os.path.exists(self.filename):
             return
-        
         try:
-            with open(self.filename, "r") as file:
-                data = json.load(file)
-                self.tasks = [Task.from_dict(task_data) for task_data in data]
-        except (json.JSONDecodeError, IOError) as e:
+            if self.file_format == "binary":
+                with open(self.filename, "rb") as file:
+                    self._version = self._file_version(os.fstat(file.fileno()))
+                    for record in read_binary_records(file):
+                        self._insert(Task.from_bytes(record))
+            else:
+                with open(self.filename, "r") as file:
+                    self._version = self._file_version(os.fstat(file.fileno()))
+                    for task in hydrate_tasks(iter_json_array(file)):
+                        self._insert(task)
+        except (json.JSONDecodeError, ValidationError, IOError) as e:
             raise FileOperationError(f"Error loading tasks: {e}") from e
     
-    def save_tasks(self) -> None:
-        """Save tasks to file
+    @staticmethod
+    def _file_version(stat: os.stat_result) -> Tuple[int, int, int]:
+        """Identify a version of the task file
+        
+        Every save writes a new file and renames it into place, so each
+        version has its own inode.
+        
+        Args:
+            stat: The status of the file
+            
+        Returns:
+            The inode, modification time and size of the file
+        """
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    
+    def _disk_version(self) -> Optional[Tuple[int, int, int]]:
+        """Get the version of the task file on disk (None if there is none)"""
+        try:
+            return self._file_version(os.stat(self.filename))
+        except FileNotFoundError:
+            return None
+    
+    def _reload(self) -> None:
+        """Replace the tasks in memory with the contents of the task file
         
         Raises:
             FileOperationError: If file operations fail
         """
-        try:
-            with open(self.filename, "w") as file:
-                json.dump([task.to_dict() for task in self.tasks], 
-                         file, indent=2)
-        except IOError as e:
-            raise FileOperationError(f"Error saving tasks: {e}") from e
+        with self._lock:
+            self._clear()
+            self._load_snapshot()
+            self._load_next_id()
     
-    def add_task(self, task: Task) -> None:
-        """Add a new task
+    def _load_next_id(self) -> None:
+        """Read the stored next ID, so IDs of deleted tasks are not reused
         
-        Args:
-            task: The task to add
+        Raises:
+            FileOperationError: If the file cannot be read
+        """
+        self.next_id = max(self.next_id, self._stored_next_id())
+    
+    def _stored_next_id(self) -> int:
+        """Read the next ID from its file
+        
+        Returns:
+            The stored next ID, or 1 if none is stored yet
             
         Raises:
-            FileOperationError: If saving fails
+            FileOperationError: If the file cannot be read
         """
-        self.tasks.append(task)
+        if not os.path.exists(self.next_id_filename):
+            return 1
         try:
-            self.save_tasks()
-            print(f"Task added: {task.description}")
-        except FileOperationError as e:
-            self.tasks.pop()  # Revert the addition
-            raise
+            with open(self.next_id_filename, "r") as file:
+                return json.load(file)["next_id"]
+        except (IOError, ValueError, KeyError, TypeError) as e:
+            raise FileOperationError(f"Error loading next task ID: {e}") from e
     
-    def get_tasks(self, status: Optional[str] = None) -> List[Task]:
-        """Get tasks with optional status filter
+    def _save_next_id(self) -> None:
+        """Store the next ID, before a snapshot that may drop the largest ID
         
-        Args:
-            status: Optional status to filter by
-            
-        Returns:
-            List of matching tasks
+        The stored value only grows: IDs that other processes reserved
+        since this one last read it are kept. So writing it before the
+        snapshot is in place is safe.
+        
+        Raises:
+            FileOperationError: If the stored value cannot be read
+            OSError: If the file cannot be written
         """
-        if status is None:
-            return self.tasks
-        return [task for task in self.tasks if task.status == status]
+        next_id = max(self.next_id, self._stored_next_id())
+        temp_filename = self.next_id_filename + ".tmp"
+        with open(temp_filename, "w") as file:
+            json.dump({"next_id": next_id}, file)
+        os.replace(temp_filename, self.next_id_filename)
     
-    def mark_task_complete(self, task_index: int) -> bool:
-        """Mark a task as complete
+    def _reserve_id(self) -> int:
+        """Take the next task ID in shared mode, so no other process uses it
         
-        Args:
-            task_index: The index of the task
+        The stored next ID is read and moved on under the file lock, so
+        a task keeps its ID when changes are redone after a rebase.
+        
+        Returns:
+            The reserved ID
             
+        Raises:
+            FileOperationError: If the stored next ID cannot be read or written
+        """
+        with self._exclusive_lock():
+            with self._lock:
+                self._load_next_id()
+                task_id = self.next_id
+                self.next_id += 1
+                try:
+                    self._save_next_id()
+                except OSError as e:
+                    raise FileOperationError(f"Error reserving task ID: {e}") from e
+        return task_id
+    
+    def refresh(self) -> bool:
+        """Load the newest version of the task file if another process saved one
+        
+        Readers never take the file lock and never block writers: a save
+        renames a complete new file into place, so the version a reader
+        has loaded stays consistent until it refreshes. Changes that are
+        still waiting in write-behind mode are stored first; changes
+        made meanwhile are redone on top of the new version. Reads wait
+        until the new version and the redone changes are both in place.
+        
         Returns:
-            True if successful, False otherwise
+            True if a newer version was loaded
             
         Raises:
-            FileOperationError: If saving fails
+            FileOperationError: If file operations fail
         """
-        if 0 <= task_index < len(self.tasks):
-            self.tasks[task_index].mark_complete()
+        self.flush()
+        if self._disk_version() == self._version:
+            return False
+        self._rebase([])
+        return True
+    
+    @contextmanager
+    def _exclusive_lock(self) -> Iterator[None]:
+        """Hold the advisory lock that serializes writers of a shared file
+        
+        Raises:
+            FileOperationError: If the lock file cannot be opened
+        """
+        try:
+            lock_file = open(self.lock_filename, "a")
+        except IOError as e:
+            raise FileOperationError(f"Error opening lock file: {e}") from e
+        with lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
             try:
-                self.save_tasks()
-                return True
-            except FileOperationError as e:
-                self.tasks[task_index].status = "pending"  # Revert the change
-                raise
-        return False
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
     
-    def view_tasks(self, status: Optional[str] = None) -> None:
-        """Display tasks with optional status filter
+    def _rebase(self, changes: List[Tuple[str, Task, Callable[[], None]]]) -> None:
+        """Load the version another process saved and redo changes on top
+        
+        Besides the given changes, the changes still waiting for the
+        writer thread and those of a running batch are only in memory,
+        so they are redone as well. No change can start and no read can
+        see the tasks until the reload and the redone changes are complete.
+        Added tasks keep the IDs they reserved. Completing or deleting a
+        task that the other process already deleted does nothing. The entries are replaced with ones whose undo fits the
+        reloaded tasks.
         
         Args:
-            status: Optional status to filter by
+            changes: The (operation, task, undo) entries, in order
+            
+        Raises:
+            FileOperationError: If the task file cannot be loaded
         """
-        tasks = self.get_tasks(status)
-        if not tasks:
-            print("No tasks found!")
-            return
+        with self._change_lock, self._lock:
+            self._reload()
+            redone: List[List[Tuple[str, Task, Callable[[], None]]]] = []
+            for entries in (changes, self._pending_changes, self._batch):
+                # A batch that is being committed is also self._batch
+                if entries is None or any(entries is done for done in redone):
+                    continue
+                for number, (operation, task, _) in enumerate(entries):
+                    entries[number] = (operation, *self._redo(operation, task))
+                redone.append(entries)
+    
+    def _redo(self, operation: str, task: Task) -> Tuple[Task, Callable[[], None]]:
+        """Apply a change again to the tasks in memory
         
-        print("\nTasks:")
-        for i, task in enumerate(tasks, 1):
-            print(f"{i}. {task}")
-            if isinstance(task, TimedTask) and task.is_overdue():
-                print("   ⚠️ This task is overdue!")
-
-def display_menu() -> None:
-    """Display the main menu"""
-    print("\nTask Manager v5")
-    print("1. Add basic task")
-    print("2. Add timed task")
-    print("3. View all tasks")
-    print("4. View pending tasks")
-    print("5. Mark task as complete")
-    print("6. Exit")
-
-def get_valid_input(prompt: str, valid_choices: List[str]) -> str:
+        Args:
+            operation: "add", "complete" or "delete"
+            task: The task of the original change
+            
+        Returns:
+            The changed task and a function that undoes the change
+        """
+        if operation == "add":
+            current = self.tasks.get(task.id)
+            if current is not None and current.created_at == task.created_at:
+                return current, lambda: self._remove(current)
+            if current is not None:
+                # Only a writer that does not reserve IDs can have taken it
+                task.id = None
+            self._insert(task)
+            
+            def undo() -> None:
+                self._remove(task)
+                task.id = None
+            
+            return task, undo
+        current = self.tasks.get(task.id)
+        # IDs are never reused, but check that it is the same task
+        if current is None or current.created_at != task.created_at:
+            return task, lambda: None
+        if operation == "complete":
+            status, completed_at = current.status, current.completed_at
+            self._set_status(current, COMPLETED, task.completed_at)
+            return current, lambda: self._set_status(current, status, completed_at)
+        self._remove(current)
+        return current, lambda: self._insert(current)
+    
+    def _snapshot_data(self) -> List[Any]:
+        """Capture the current tasks for writing a snapshot
+        
+        Returns:
+            One item per task, in the form _write_snapshot expects
+        """
+        if self.file_format == "binary":
+            return [task.to_bytes() for task in self.tasks.values()]
+        return [task.to_dict() for task in self.tasks.values()]
+    
+    def save_tasks(self) -> None:
+        """Save tasks to file
+        
+        The snapshot is written to a temporary file first and then moved
+        into place, so a crash never leaves a half-written task file. In
+        journal mode the journal is cleared afterwards because the snapshot
+        already contains every change.
+        
+        Raises:
+            FileOperationError: If file operations fail
+        """
+        if self.journal:
+            self.wait_for_compaction()
+        
+        with self._lock:
+            self._write_snapshot(self._snapshot_data())
+            if self.journal:
+                try:
+                    open(self.journal_filename, "w").close()
+                    if os.path.exists(self.compacting_filename):
+                        os.remove(self.compacting_filename)
+                except (IOError, OSError) as e:
+                    raise FileOperationError(f"Error clearing journal: {e}") from e
+                self._journal_records = 0
+                self._journal_bytes = 0
+    
+    def _write_snapshot(self, data: List[Any]) -> None:
+        """Atomically replace the task file with the given task data
+        
+        Args:
+            data: Task dictionaries, or binary records in binary format
+            
+        Raises:
+            FileOperationError: If file operations fail
+        """
+        temp_filename = self.filename + ".tmp"
+        try:
+            self._save_next_id()
+            if self.file_format == "binary":
+                with open(temp_filename, "wb") as file:
+                    file.write(BINARY_MAGIC)
+                    file.writelines(data)
+            else:
+                with open(temp_filename, "w") as file:
+                    json.dump(data, file, indent=2)
+            os.replace(temp_filename, self.filename)
+        except (IOError, OSError) as e:
+            raise FileOperationError(f"Error saving tasks: {e}") from e
+    
+    def _append_journal(self, record: dict) -> None:
+        """Append one change record (or batch record) to the journal
+        
+        Starts a background compaction once the journal passes one of
+        the thresholds.
+        
+        Args:
+            record: The change to store
+            
+        Raises:
+            FileOperationError: If writing fails
+        """
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            try:
+                with open(self.journal_filename, "a") as file:
+                    file.write(line)
+            except IOError as e:
+                raise FileOperationError(f"Error writing journal: {e}") from e
+            self._journal_records += 1
+            self._journal_bytes += len(line)
+        self._maybe_compact()
+    
+    def _replay_journal(self, journal_filename: str) -> None:
+        """Apply the records of a journal file to the loaded tasks
+        
+        Each record stores the ID of the task it applies to, so records
+        that are already part of the snapshot change nothing. A damaged last line (for
+        example after a crash during a write) is ignored.
+        
+        Args:
+            journal_filename: The journal file to replay
+            
+        Raises:
+            FileOperationError: If the journal cannot be read
+        """
+        if not os.path.exists(journal_filename):
+            return
+        
+        try:
+            with open(journal_filename, "r") as file:
+                lines = file.readlines()
+        except IOError as e:
+            raise FileOperationError(f"Error loading journal: {e}") from e
+        
+        for line_number, line in enumerate(lines, 1):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                if line_number == len(lines):
+                    break
+                raise FileOperationError(
+                    f"Corrupt journal record on line {line_number}: {e}") from e
+            self._apply_record(record)
+            self._journal_records += 1
+            self._journal_bytes += len(line)
+    
+    def _apply_record(self, record: dict) -> None:
+        """Apply a single journal record
+        
+        Records refer to tasks by ID, so replaying a record that is already
+        part of the snapshot changes nothing.
+        
+        Args:
+            record: The change to apply
+            
+        Raises:
+            FileOperationError: If the record is invalid
+        """
+        try:
+            operation = record["op"]
+            if operation == "add":
+                task = Task.from_trusted_dict(record["task"])
+                if task.id not in self.tasks:
+                    self._insert(task)
+            elif operation == "complete":
+                task = self.tasks.get(record["id"])
+                if task is not None:
+                    self._set_status(task, COMPLETED,
+                                     datetime.fromisoformat(record["completed_at"]))
+            elif operation == "delete":
+                task = self.tasks.get(record["id"])
+                if task is not None:
+                    self._remove(task)
+            elif operation == "batch":
+                for change in record["records"]:
+                    self._apply_record(change)
+            else:
+                raise FileOperationError(f"Unknown journal operation: {operation}")
+        except (KeyError, ValueError, ValidationError) as e:
+            raise FileOperationError(f"Invalid journal record: {e}") from e
+    
+    def _maybe_compact(self, force: bool = False) -> None:
+        """Start a background compaction if the journal is too large
+        
+        The change that triggered the compaction is already stored, so an
+        error starting the compaction does not fail that change. It is
+        kept and raised by wait_for_compaction instead.
+        
+        Args:
+            force: If True, compact whatever the size of the journal
+        """
+        if (force or self._journal_records >= self.compact_max_records
+                or self._journal_bytes >= self.compact_max_bytes):
+            try:
+                self.compact()
+            except FileOperationError as e:
+                self._compaction_error = e
+    
+    def compact(self, wait: bool = False) -> None:
+        """Write a fresh snapshot and drop the journal records it contains
+        
+        The current journal is renamed so that new changes go to an empty
+        journal while the snapshot is written in the background. Until
+        the snapshot is in place the renamed journal is still replayed by
+        load_tasks, so no change is lost if the program stops halfway.
+        
+        In "thread" mode the tasks are copied first, which pauses the
+        caller for a time that grows with the number of tasks. In "fork"
+        mode a child process gets a copy-on-write view of memory and
+        writes the snapshot from it, so the only pause is the fork itself.
+        
+        Args:
+            wait: If True, block until the snapshot has been written
+            
+        Raises:
+            FileOperationError: If the journal cannot be rotated or the
+                compaction cannot be started, or if waiting and the
+                compaction fails
+        """
+        if not self.journal:
+            return
+        
+        with self._lock:
+            if not self._compaction_running():
+                if self.snapshot_mode == "fork":
+                    self._rotate_journal()
+                    self._compaction_started = time.perf_counter()
+                    try:
+                        pid = os.fork()
+                    except OSError as e:
+                        raise FileOperationError(
+                            f"Error starting compaction: {e}") from e
+                    if pid == 0:
+                        self._run_forked_compaction()
+                    self._compaction_pid = pid
+                else:
+                    data = self._snapshot_data()
+                    self._rotate_journal()
+                    thread = threading.Thread(target=self._run_compaction,
+                                              args=(data,))
+                    try:
+                        thread.start()
+                    except RuntimeError as e:
+                        raise FileOperationError(
+                            f"Error starting compaction: {e}") from e
+                    self._compaction_thread = thread
+        
+        if wait:
+            self.wait_for_compaction()
+    
+    def _rotate_journal(self) -> None:
+        """Move the journal records aside for a compaction
+        
+        Raises:
+            FileOperationError: If file operations fail
+        """
+        try:
+            if not os.path.exists(self.journal_filename):
+                return
+            if os.path.exists(self.compacting_filename):
+                # A previous compaction did not finish; keep its records
+                with open(self.journal_filename, "r") as source, \
+                        open(self.compacting_filename, "a") as target:
+                    target.write(source.read())
+                os.remove(self.journal_filename)
+            else:
+                os.replace(self.journal_filename, self.compacting_filename)
+        except (IOError, OSError) as e:
+            raise FileOperationError(f"Error rotating journal: {e}") from e
+        self._journal_records = 0
+        self._journal_bytes = 0
+    
+    def _run_compaction(self, data: List[Any]) -> None:
+        """Write the snapshot and remove the rotated journal
+        
+        Args:
+            data: Task dictionaries captured when the compaction started
+        """
+        started = time.perf_counter()
+        try:
+            self._write_snapshot(data)
+            # There is no rotated journal if the journal was still empty
+            if os.path.exists(self.compacting_filename):
+                os.remove(self.compacting_filename)
+        except (FileOperationError, OSError) as e:
+            self._compaction_error = e
+            return
+        self._compactions += 1
+        self._last_compaction_seconds = time.perf_counter() - started
+    
+    def _run_forked_compaction(self) -> None:
+        """Write the snapshot in a forked child process and exit
+        
+        The exit status tells the parent whether the snapshot was written.
+        The child never returns to the caller's code.
+        """
+        status = 1
+        try:
+            self._after_fork()
+            self._write_snapshot(self._snapshot_data())
+            if os.path.exists(self.compacting_filename):
+                os.remove(self.compacting_filename)
+            status = 0
+        finally:
+            os._exit(status)
+    
+    def _after_fork(self) -> None:
+        """Replace the locks in a forked child process
+        
+        Only the thread that forked runs in the child, so a lock that
+        another thread held at the time of the fork is never released.
+        """
+        self._lock = threading.RLock()
+        self._change_lock = threading.RLock()
+    
+    def _reap_compaction(self, block: bool) -> bool:
+        """Collect the exit status of a forked compaction
+        
+        Args:
+            block: If True, wait for the child process to finish
+            
+        Returns:
+            True if no forked compaction is running any more
+        """
+        if self._compaction_pid is None:
+            return True
+        pid, status = os.waitpid(self._compaction_pid, 0 if block else os.WNOHANG)
+        if pid == 0:
+            return False
+        self._compaction_pid = None
+        exit_code = os.waitstatus_to_exitcode(status)
+        if exit_code != 0:
+            self._compaction_error = FileOperationError(
+                f"snapshot process exited with status {exit_code}")
+            return True
+        self._compactions += 1
+        self._last_compaction_seconds = time.perf_counter() - self._compaction_started
+        return True
+    
+    def _compaction_running(self) -> bool:
+        """Check whether a compaction thread or process is still running"""
+        thread = self._compaction_thread
+        if thread is not None and thread.is_alive():
+            return True
+        return not self._reap_compaction(block=False)
+    
+    def wait_for_compaction(self) -> None:
+        """Block until a running compaction has finished
+        
+        Raises:
+            FileOperationError: If the compaction failed
+        """
+        thread = self._compaction_thread
+        if thread is not None:
+            thread.join()
+        self._reap_compaction(block=True)
+        if self._compaction_error is not None:
+            error, self._compaction_error = self._compaction_error, None
+            raise FileOperationError(f"Compaction failed: {error}") from error
+    
+    def compaction_stats(self) -> dict:
+        """Get journal and compaction statistics
+        
+        Returns:
+            Dictionary with the journal size and compaction counters
+        """
+        compacting = self._compaction_running()
+        return {
+            "journal_records": self._journal_records,
+            "journal_bytes": self._journal_bytes,
+            "compact_max_records": self.compact_max_records,
+            "compact_max_bytes": self.compact_max_bytes,
+            "snapshot_mode": self.snapshot_mode,
+            "compactions": self._compactions,
+            "last_compaction_seconds": self._last_compaction_seconds,
+            "compacting": compacting,
+        }
+    
+    def _insert(self, task: Task) -> None:
+        """Put a task into the in-memory collection, giving it an ID if needed
+        
+        Args:
+            task: The task to insert
+        """
+        if task.id is None:
+            task.id = self.next_id
+        self.tasks[task.id] = task
+        self.next_id = max(self.next_id, task.id + 1)
+        self._count_task(task, 1)
+        self._index_task(task)
+    
+    def _remove(self, task: Task) -> None:
+        """Take a task out of the in-memory collection
+        
+        Args:
+            task: The task to remove
+        """
+        del self.tasks[task.id]
+        self._count_task(task, -1)
+        self._unindex_task(task)
+    
+    def _count_task(self, task: Task, delta: int) -> None:
+        """Add a task to the aggregate counters, or take it out
+        
+        Args:
+            task: The task
+            delta: 1 to count the task, -1 to uncount it
+        """
+        self.counts[(task.status, task.priority)] += delta
+        deadline = getattr(task, "deadline", None)
+        if task.status == PENDING and deadline is not None:
+            if delta > 0:
+                self.pending_deadlines.add(deadline, task.id)
+            else:
+                self.pending_deadlines.remove(deadline, task.id)
+    
+    def _index_task(self, task: Task) -> None:
+        """Add a task to the status and priority buckets
+        
+        Args:
+            task: The task to add
+        """
+        self.by_status.setdefault(task.status, {})[task.id] = task
+        self.by_priority.setdefault(task.priority, {})[task.id] = task
+        self._push_pending(task)
+        for field, index in self.time_indexes.items():
+            moment = getattr(task, field, None)
+            if moment is not None:
+                index.add(moment, task.id)
+        for word in tokenize(task.description):
+            self.word_index.setdefault(word, set()).add(task.id)
+        grams = trigrams(task.description)
+        for gram in grams:
+            self.trigram_index.setdefault(gram, set()).add(task.id)
+        self.trigram_counts[task.id] = len(grams)
+        if self.description_filter.count >= self.description_filter.capacity:
+            # Full: rebuild at twice the size (this also drops deleted tasks)
+            self.description_filter = BloomFilter(
+                max(self.description_filter.capacity, 2 * len(self.tasks)))
+            for other in self.tasks.values():
+                self.description_filter.add(normalize_description(other.description))
+        else:
+            self.description_filter.add(normalize_description(task.description))
+    
+    def _unindex_task(self, task: Task) -> None:
+        """Remove a task from the status and priority buckets
+        
+        Args:
+            task: The task to remove
+        """
+        self.by_status.get(task.status, {}).pop(task.id, None)
+        self.by_priority.get(task.priority, {}).pop(task.id, None)
+        for field, index in self.time_indexes.items():
+            moment = getattr(task, field, None)
+            if moment is not None:
+                index.remove(moment, task.id)
+        for index, terms in ((self.word_index, tokenize(task.description)),
+                             (self.trigram_index, trigrams(task.description))):
+            for term in terms:
+                task_ids = index.get(term)
+                if task_ids is not None:
+                    task_ids.discard(task.id)
+                    if not task_ids:
+                        del index[term]
+        self.trigram_counts.pop(task.id, None)
+    
+    def _set_status(self, task: Task, status: str,
+                    completed_at: Optional[datetime]) -> None:
+        """Change the status of a task and move it to the matching bucket
+        
+        Args:
+            task: The task to change
+            status: The new status
+            completed_at: The new completion time
+        """
+        changed = task.status != status
+        if changed:
+            self._count_task(task, -1)
+        bucket = self.by_status.get(task.status, {})
+        indexed = bucket.pop(task.id, None) is not None
+        if indexed and task.completed_at is not None:
+            self.time_indexes["completed_at"].remove(task.completed_at, task.id)
+        task.status = status
+        task.completed_at = completed_at
+        if changed:
+            self._count_task(task, 1)
+        if indexed:
+            self.by_status.setdefault(status, {})[task.id] = task
+            self._push_pending(task)
+            if completed_at is not None:
+                self.time_indexes["completed_at"].add(completed_at, task.id)
+    
+    def _push_pending(self, task: Task) -> None:
+        """Add a pending task to the urgency heap, and to the deadline heap
+        if it is a timed task
+        
+        Args:
+            task: The task to add
+        """
+        if task.status == COMPLETED:
+            return
+        heapq.heappush(self._urgency, self._urgency_key(task))
+        if isinstance(task, TimedTask):
+            heapq.heappush(self._deadlines, (task.deadline, task.id))
+    
+    @staticmethod
+    def _urgency_key(task: Task) -> Tuple[int, datetime, int]:
+        """Get the sort key of a task for next_tasks
+        
+        Higher priorities come first, then earlier deadlines; tasks
+        without a deadline come after those with one.
+        
+        Args:
+            task: The task
+            
+        Returns:
+            A (negated priority rank, deadline, ID) tuple
+        """
+        deadline = getattr(task, "deadline", None) or datetime.max
+        return (-TASK_PRIORITIES.index(task.priority), deadline, task.id)
+    
+    def _deadline_task(self, entry: Tuple[datetime, int]) -> Optional[Task]:
+        """Get the task of a deadline heap entry if the entry is still valid
+        
+        Args:
+            entry: A (deadline, ID) heap entry
+            
+        Returns:
+            The task, or None if it was completed, deleted or changed
+        """
+        deadline, task_id = entry
+        task = self.tasks.get(task_id)
+        if (task is None or task.status == COMPLETED
+                or getattr(task, "deadline", None) != deadline):
+            return None
+        return task
+    
+    @staticmethod
+    def _journal_record(operation: str, task: Task) -> dict:
+        """Create the journal record of a change
+        
+        Args:
+            operation: "add", "complete" or "delete"
+            task: The changed task
+            
+        Returns:
+            The record
+        """
+        if operation == "add":
+            return {"op": "add", "task": task.to_dict()}
+        if operation == "complete":
+            return {"op": "complete", "id": task.id,
+                    "completed_at": task.completed_at.isoformat()}
+        return {"op": "delete", "id": task.id}
+    
+    def _persist(self, operation: str, task: Task,
+                 undo: Callable[[], None]) -> None:
+        """Store a change that was already made in memory
+        
+        Inside a batch the change is only staged, and in write-behind
+        mode it is handed to the writer thread. Otherwise it is stored at
+        once. The change is undone in memory if storing fails, or in
+        write-behind mode if the last background write failed.
+        
+        Args:
+            operation: "add", "complete" or "delete"
+            task: The changed task
+            undo: Function that reverts the change in memory
+            
+        Raises:
+            FileOperationError: If saving fails
+        """
+        if self._batch is not None:
+            self._batch.append((operation, task, undo))
+            return
+        changes = [(operation, task, undo)]
+        try:
+            if self.write_behind:
+                self._queue_changes(changes)
+            elif self.shared:
+                self._commit_batch(changes)
+            else:
+                getattr(self, f"_persist_{operation}")(task)
+        except FileOperationError:
+            with self._lock:
+                changes[0][2]()
+            raise
+    
+    def _persist_add(self, task: Task) -> None:
+        """Store a task that was just added
+        
+        Args:
+            task: The added task
+            
+        Raises:
+            FileOperationError: If saving fails
+        """
+        if self.journal:
+            self._append_journal(self._journal_record("add", task))
+        else:
+            self.save_tasks()
+    
+    def _persist_complete(self, task: Task) -> None:
+        """Store the completion of a task
+        
+        Args:
+            task: The completed task
+            
+        Raises:
+            FileOperationError: If saving fails
+        """
+        if self.journal:
+            self._append_journal(self._journal_record("complete", task))
+        else:
+            self.save_tasks()
+    
+    def _persist_delete(self, task: Task) -> None:
+        """Store the deletion of a task
+        
+        Args:
+            task: The deleted task
+            
+        Raises:
+            FileOperationError: If saving fails
+        """
+        if self.journal:
+            self._append_journal(self._journal_record("delete", task))
+        else:
+            self.save_tasks()
+    
+    @contextmanager
+    def batch(self) -> Iterator['TaskManager']:
+        """Group changes into one transaction that is stored once
+        
+        Changes made inside the block are visible at once but only
+        stored when the block ends: the task file is written once, or a
+        single batch record is appended to the journal. If the block
+        raises, or storing fails, every change of the batch is undone.
+        A batch inside another batch joins the outer one.
+        
+        Yields:
+            The task manager
+            
+        Raises:
+            FileOperationError: If saving fails
+        """
+        if self._batch is not None:
+            yield self
+            return
+        self._batch = []
+        try:
+            yield self
+            if self.write_behind:
+                # Queued and closed at once, so a rebase redoes them once
+                with self._change_lock:
+                    self._queue_changes(self._batch)
+                    self._batch = None
+            elif self._batch:
+                # Taken before the file lock, as a single change does
+                with self._change_lock:
+                    self._commit_batch(self._batch)
+        except BaseException:
+            with self._change_lock, self._lock:
+                for _, _, undo in reversed(self._batch):
+                    undo()
+            raise
+        finally:
+            self._batch = None
+    
+    def _commit_batch(self,
+                      changes: List[Tuple[str, Task, Callable[[], None]]]) -> None:
+        """Store the staged changes of a batch
+        
+        Args:
+            changes: The (operation, task, undo) entries, in order
+            
+        Raises:
+            FileOperationError: If saving fails
+        """
+        if self.journal:
+            # One line, so a crash leaves either all or none of the batch
+            self._append_journal({"op": "batch", "records": [
+                self._journal_record(operation, task)
+                for operation, task, _ in changes]})
+        elif self.shared:
+            with self._exclusive_lock():
+                if self._disk_version() != self._version:
+                    self._rebase(changes)
+                self.save_tasks()
+                self._version = self._disk_version()
+        else:
+            self.save_tasks()
+    
+    def _queue_changes(self,
+                       changes: List[Tuple[str, Task, Callable[[], None]]]) -> None:
+        """Hand changes to the writer thread
+        
+        Args:
+            changes: The (operation, task, undo) entries, in order
+            
+        Raises:
+            FileOperationError: If the last background write failed; the
+                changes are not queued
+        """
+        with self._changed:
+            self._raise_write_error()
+            if not self._pending_changes:
+                self._first_pending = time.monotonic()
+            self._pending_changes.extend(changes)
+            self._changed.notify()
+    
+    def _run_writer(self) -> None:
+        """Store waiting changes in the background until close() is called
+        
+        Changes are stored once the oldest one has waited flush_interval_ms
+        or flush_max_changes have piled up. After a failed write the
+        changes are kept and tried again one interval later, and the
+        error is raised by the next change, flush() or close().
+        """
+        interval = self.flush_interval_ms / 1000
+        while True:
+            with self._changed:
+                while not self._pending_changes and not self._closing:
+                    self._changed.wait()
+                while (len(self._pending_changes) < self.flush_max_changes
+                       and not self._closing):
+                    remaining = self._first_pending + interval - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._changed.wait(remaining)
+                if self._closing:
+                    return  # close() writes what is left
+            try:
+                self._write_pending()
+                self._write_error = None
+            except FileOperationError as e:
+                self._write_error = e
+                with self._changed:
+                    self._first_pending = time.monotonic()
+    
+    def _write_pending(self) -> None:
+        """Store the changes waiting for the writer thread
+        
+        Raises:
+            FileOperationError: If saving fails (the changes stay queued)
+        """
+        with self._flush_lock:
+            with self._lock:
+                changes, self._pending_changes = self._pending_changes, []
+            if not changes:
+                return
+            try:
+                self._commit_batch(changes)
+            except Exception as e:
+                with self._lock:
+                    self._pending_changes[:0] = changes
+                if isinstance(e, FileOperationError):
+                    raise
+                raise FileOperationError(f"Error saving tasks: {e}") from e
+    
+    def _raise_write_error(self) -> None:
+        """Raise the error of the last background write, if it failed
+        
+        The error is only kept while its changes are still waiting, since
+        a later write that succeeds stores them. It is raised once.
+        
+        Raises:
+            FileOperationError: If the last background write failed
+        """
+        error, self._write_error = self._write_error, None
+        if error is not None:
+            raise FileOperationError(f"Background save failed: {error}") from error
+    
+    def flush(self) -> None:
+        """Store every change that is waiting for the writer thread
+        
+        Returns once the changes are written. Does nothing unless
+        write-behind mode is on.
+        
+        Raises:
+            FileOperationError: If saving fails
+        """
+        self._write_pending()
+        self._write_error = None
+    
+    def close(self) -> None:
+        """Stop the writer thread and store the changes it has not written
+        
+        Raises:
+            FileOperationError: If saving fails
+        """
+        if self._writer_thread is not None:
+            with self._changed:
+                self._closing = True
+                self._changed.notify()
+            self._writer_thread.join()
+            self._writer_thread = None
+            atexit.unregister(self.flush)
+        self.flush()
+        if self.journal:
+            self.wait_for_compaction()
+    
+    def find_duplicate(self, description: str) -> Optional[Task]:
+        """Find a task with the same description, ignoring case and spacing
+        
+        The Bloom filter rules out most new descriptions at once. Only
+        probable duplicates are checked against the tasks that contain
+        all of their words.
+        
+        Args:
+            description: The description to look for
+            
+        Returns:
+            The existing task, or None if there is none
+        """
+        key = normalize_description(description)
+        with self._lock:
+            if key not in self.description_filter:
+                return None
+            candidates = self.search(key) if tokenize(key) else self.tasks.values()
+            for task in candidates:
+                if normalize_description(task.description) == key:
+                    return task
+        return None
+    
+    def add_task(self, task: Task, check_duplicates: bool = False) -> None:
+        """Add a new task and give it an ID
+        
+        Args:
+            task: The task to add
+            check_duplicates: If True, refuse a task whose description
+                matches an existing task
+            
+        Raises:
+            DuplicateTaskError: If check_duplicates is set and the task
+                is a duplicate
+            FileOperationError: If saving fails
+        """
+        if check_duplicates:
+            duplicate = self.find_duplicate(task.description)
+            if duplicate is not None:
+                raise DuplicateTaskError(
+                    f"Task {duplicate.id} already has this description")
+        # Reserved before the change lock: the writer thread takes the
+        # file lock first and the change lock second
+        task.id = self._reserve_id() if self.shared else None
+        
+        def undo() -> None:
+            self._remove(task)
+            task.id = None
+        
+        with self._change_lock:
+            with self._lock:
+                self._insert(task)
+            self._persist("add", task, undo)
+        print(f"Task added: {task.description}")
+    
+    def get_task(self, task_id: int) -> Optional[Task]:
+        """Get a task by its ID
+        
+        Args:
+            task_id: The ID of the task
+            
+        Returns:
+            The task, or None if there is no task with that ID
+        """
+        with self._lock:
+            return self.tasks.get(task_id)
+    
+    def get_tasks(self, status: Optional[str] = None,
+                  priority: Optional[str] = None) -> List[Task]:
+        """Get tasks with optional status and priority filters
+        
+        Filtered reads only visit the tasks in the matching buckets.
+        
+        Args:
+            status: Optional status to filter by
+            priority: Optional priority to filter by
+            
+        Returns:
+            List of matching tasks
+        """
+        with self._lock:
+            if status is None and priority is None:
+                return list(self.tasks.values())
+            if priority is None:
+                return list(self.by_status.get(status, {}).values())
+            if status is None:
+                return list(self.by_priority.get(priority, {}).values())
+            by_status = self.by_status.get(status, {})
+            by_priority = self.by_priority.get(priority, {})
+            if len(by_status) <= len(by_priority):
+                return [task for task_id, task in by_status.items()
+                        if task_id in by_priority]
+            return [task for task_id, task in by_priority.items()
+                    if task_id in by_status]
+    
+    def mark_task_complete(self, task_id: int) -> bool:
+        """Mark a task as complete
+        
+        Args:
+            task_id: The ID of the task
+            
+        Returns:
+            True if successful, False otherwise
+            
+        Raises:
+            FileOperationError: If saving fails
+        """
+        with self._change_lock:
+            task = self.tasks.get(task_id)
+            if task is None:
+                return False
+            status, completed_at = task.status, task.completed_at
+            with self._lock:
+                self._set_status(task, COMPLETED, datetime.now())
+            self._persist("complete", task,
+                          lambda: self._set_status(task, status, completed_at))
+        return True
+    
+    def delete_task(self, task_id: int) -> bool:
+        """Delete a task
+        
+        Args:
+            task_id: The ID of the task
+            
+        Returns:
+            True if successful, False otherwise
+            
+        Raises:
+            FileOperationError: If saving fails
+        """
+        with self._change_lock:
+            task = self.tasks.get(task_id)
+            if task is None:
+                return False
+            with self._lock:
+                self._remove(task)
+            self._persist("delete", task, lambda: self._insert(task))
+        return True
+    
+    def complete_where(self, predicate: Callable[[Task], bool],
+                       priority: Optional[str] = None) -> int:
+        """Mark every pending task that matches a condition as complete
+        
+        Only the pending bucket (narrowed by priority if given) is
+        checked, and all changes are stored in one batch.
+        
+        Args:
+            predicate: Function that returns True for the tasks to complete
+            priority: Optional priority to limit the candidates to
+            
+        Returns:
+            The number of completed tasks
+            
+        Raises:
+            FileOperationError: If saving fails (no task is changed then)
+        """
+        tasks = [task for task in self.get_tasks(PENDING, priority)
+                 if predicate(task)]
+        with self.batch():
+            for task in tasks:
+                self.mark_task_complete(task.id)
+        return len(tasks)
+    
+    def delete_where(self, predicate: Callable[[Task], bool],
+                     status: Optional[str] = None,
+                     priority: Optional[str] = None) -> int:
+        """Delete every task that matches a condition
+        
+        Only the tasks in the status and priority buckets given are
+        checked, and all deletions are stored in one batch. In journal
+        mode the storage is compacted afterwards.
+        
+        Args:
+            predicate: Function that returns True for the tasks to delete
+            status: Optional status to limit the candidates to
+            priority: Optional priority to limit the candidates to
+            
+        Returns:
+            The number of deleted tasks
+            
+        Raises:
+            FileOperationError: If saving fails (no task is deleted then)
+        """
+        tasks = [task for task in self.get_tasks(status, priority)
+                 if predicate(task)]
+        with self.batch():
+            for task in tasks:
+                self.delete_task(task.id)
+        if tasks and self._batch is None:
+            self._maybe_compact(force=True)
+        return len(tasks)
+    
+    def get_overdue_tasks(self, now: Optional[datetime] = None) -> List[Task]:
+        """Get pending timed tasks whose deadline has passed
+        
+        Only the expired front of the deadline heap is visited, so the
+        cost grows with the number of overdue tasks, not all tasks.
+        
+        Args:
+            now: The time to compare against (defaults to the current time)
+            
+        Returns:
+            List of overdue tasks, earliest deadline first
+        """
+        now = now or datetime.now()
+        expired = []
+        overdue = []
+        with self._lock:
+            heap = self._deadlines
+            while heap and heap[0][0] < now:
+                entry = heapq.heappop(heap)
+                task = self._deadline_task(entry)
+                # Skip stale entries and duplicates from reverted changes
+                if task is not None and (not expired or expired[-1] != entry):
+                    expired.append(entry)
+                    overdue.append(task)
+            for entry in expired:
+                heapq.heappush(heap, entry)
+        return overdue
+    
+    def next_tasks(self, k: int = 10) -> List[Task]:
+        """Get the k most urgent pending tasks
+        
+        Tasks are ordered by priority (high first) and then by deadline.
+        Up to k entries are popped from the urgency heap and pushed back,
+        so this takes O(k log n) instead of sorting every task.
+        
+        Args:
+            k: The number of tasks to return
+            
+        Returns:
+            List of up to k tasks, most urgent first
+        """
+        popped = []
+        urgent = []
+        with self._lock:
+            heap = self._urgency
+            while heap and len(urgent) < k:
+                entry = heapq.heappop(heap)
+                task = self.tasks.get(entry[2])
+                # Skip stale entries and duplicates from reverted changes
+                if (task is not None and task.status != COMPLETED
+                        and (not popped or popped[-1] != entry)):
+                    popped.append(entry)
+                    urgent.append(task)
+            for entry in popped:
+                heapq.heappush(heap, entry)
+        return urgent
+    
+    def next_deadline(self) -> Optional[Task]:
+        """Get the pending timed task with the earliest deadline
+        
+        Returns:
+            The task, or None if no timed task is pending
+        """
+        with self._lock:
+            heap = self._deadlines
+            while heap:
+                task = self._deadline_task(heap[0])
+                if task is not None:
+                    return task
+                heapq.heappop(heap)
+        return None
+    
+    def tasks_between(self, field: str, start: Optional[datetime] = None,
+                      end: Optional[datetime] = None) -> Iterator[Task]:
+        """Get the tasks whose timestamp lies in a range, in time order
+        
+        The IDs in the range are taken from a sorted index at once and
+        the tasks are read lazily, so a report over a short period only
+        touches the tasks in that period. Tasks that are deleted while
+        the iterator is in use are skipped.
+        
+        Args:
+            field: "created_at", "completed_at" or "deadline"
+            start: Optional inclusive lower bound
+            end: Optional exclusive upper bound
+            
+        Returns:
+            An iterator over the matching tasks
+            
+        Raises:
+            ValidationError: If the field cannot be queried by range
+        """
+        if field not in TIME_FIELDS:
+            raise ValidationError(f"Cannot query tasks by {field}")
+        with self._lock:
+            task_ids = list(self.time_indexes[field].between(start, end))
+        tasks = (self.tasks.get(task_id) for task_id in task_ids)
+        return (task for task in tasks if task is not None)
+    
+    def search(self, query: str, match_all: bool = True) -> List[Task]:
+        """Find tasks whose description contains the words of a query
+        
+        The ID sets of the query words are intersected, starting with
+        the smallest, or joined when any word may match.
+        
+        Args:
+            query: The words to search for
+            match_all: If True, tasks must contain every word (AND);
+                otherwise any word is enough (OR)
+            
+        Returns:
+            List of matching tasks in ID order
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        with self._lock:
+            postings = sorted((self.word_index.get(word, set()) for word in words),
+                              key=len)
+            if match_all:
+                task_ids = set(postings[0])
+                for posting in postings[1:]:
+                    if not task_ids:
+                        break
+                    task_ids &= posting
+            else:
+                task_ids = set().union(*postings)
+            return [self.tasks[task_id] for task_id in sorted(task_ids)]
+    
+    def fuzzy_search(self, query: str, limit: int = 5,
+                     min_similarity: float = 0.2) -> List[Task]:
+        """Find the tasks whose descriptions are most similar to a query
+        
+        Similarity is the overlap of trigrams, so typos still match.
+        Candidates come from the trigram index: a task that is in none
+        of the rarest query trigrams cannot share enough trigrams to
+        reach min_similarity, so only those lists are scanned in full.
+        
+        Args:
+            query: The text to look for
+            limit: The maximum number of tasks to return
+            min_similarity: The lowest similarity (0 to 1) to return
+            
+        Returns:
+            List of up to limit tasks, most similar first
+        """
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        # The score is at most shared / len(query_grams)
+        min_shared = max(1, math.ceil(min_similarity * len(query_grams)))
+        with self._lock:
+            postings = sorted((self.trigram_index.get(gram, set())
+                               for gram in query_grams), key=len)
+            prefix = len(postings) - min_shared + 1
+            shared = Counter(chain.from_iterable(postings[:prefix]))
+            for posting in postings[prefix:]:
+                shared.update(shared.keys() & posting)
+            scores = []
+            for task_id, count in shared.items():
+                if count >= min_shared:
+                    score = trigram_similarity(count, len(query_grams),
+                                               self.trigram_counts[task_id])
+                    if score >= min_similarity:
+                        scores.append((score, -task_id))
+            return [self.tasks[-negative_id]
+                    for _, negative_id in heapq.nlargest(limit, scores)]
+    
+    def stats(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Get task counts for summary views without visiting the tasks
+        
+        The counts are kept up to date on every change; only the overdue
+        count needs a binary search in the pending deadlines.
+        
+        Args:
+            now: The time to compare deadlines against (defaults to the
+                current time)
+            
+        Returns:
+            Dictionary with the number of tasks in total, pending,
+            completed, pending with high priority and overdue
+        """
+        now = now or datetime.now()
+        with self._lock:
+            pending = sum(self.counts[(PENDING, priority)]
+                          for priority in TASK_PRIORITIES)
+            completed = sum(self.counts[(COMPLETED, priority)]
+                            for priority in TASK_PRIORITIES)
+            return {
+                "total": len(self.tasks),
+                "pending": pending,
+                "completed": completed,
+                "high_priority": self.counts[(PENDING, "high")],
+                "overdue": self.pending_deadlines.count_before(now),
+            }
+    
+    def view_tasks(self, status: Optional[str] = None) -> None:
+        """Display tasks with optional status filter
+        
+        Args:
+            status: Optional status to filter by
+        """
+        # One lock hold, so both reads see the same version
+        with self._lock:
+            tasks = self.get_tasks(status)
+            overdue_ids = {task.id for task in self.get_overdue_tasks()}
+        if not tasks:
+            print("No tasks found!")
+            return
+        
+        
+        print("\nTasks:")
+        for task in tasks:
+            print(f"{task.id}. {task}")
+            if task.id in overdue_ids:
+                print("   ⚠️ This task is overdue!")
+
+class DescriptionIndex:
+    """A sorted list of task descriptions for autocompletion
+    
+    Each distinct description is kept once, sorted by its lowercase
+    form, so the descriptions that start with a prefix are one run of
+    the list that two binary searches find. Only that run is ranked, by
+    how often and then how recently each description was used. At most
+    max_scan entries of a run are ranked, so a one-letter prefix stays
+    fast; typing more narrows the run.
+    """
+    
+    # Sorts after every character, so key + LAST_CHAR ends a prefix run
+    LAST_CHAR = "\U0010ffff"
+    
+    def __init__(self, max_suggestions: int = 5, max_scan: int = 10000):
+        """Initialize an empty index
+        
+        Args:
+            max_suggestions: Number of descriptions returned for a prefix
+            max_scan: Largest number of matching descriptions ranked
+        """
+        self.max_suggestions = max_suggestions
+        self.max_scan = max_scan
+        # (lowercase description, description) pairs, sorted
+        self.entries: List[Tuple[str, str]] = []
+        # Rank of each description: (times used, time of last use)
+        self.ranks: Dict[str, Tuple[int, int]] = {}
+        self._clock = 0
+    
+    @classmethod
+    def from_descriptions(cls, descriptions: Iterable[str],
+                          max_suggestions: int = 5) -> 'DescriptionIndex':
+        """Build an index from descriptions, oldest first
+        
+        The list is sorted once at the end instead of inserting each
+        description in place.
+        
+        Args:
+            descriptions: The descriptions to add
+            max_suggestions: Number of descriptions returned for a prefix
+            
+        Returns:
+            DescriptionIndex instance
+        """
+        index = cls(max_suggestions)
+        for description in descriptions:
+            index._use(description)
+        index.entries = sorted((description.lower(), description)
+                               for description in index.ranks)
+        return index
+    
+    def _use(self, description: str) -> bool:
+        """Update the rank of a description
+        
+        Returns:
+            True if the description was not used before
+        """
+        self._clock += 1
+        count = self.ranks.get(description, (0, 0))[0]
+        self.ranks[description] = (count + 1, self._clock)
+        return count == 0
+    
+    def add(self, description: str) -> None:
+        """Record a use of a description
+        
+        Args:
+            description: The description that was used
+        """
+        if self._use(description):
+            bisect.insort(self.entries, (description.lower(), description))
+    
+    def complete(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Get the best descriptions that start with a prefix
+        
+        Args:
+            prefix: The typed text (case is ignored)
+            limit: Optional maximum number of suggestions
+            
+        Returns:
+            Up to limit descriptions, most used first
+        """
+        key = prefix.lower()
+        entries = self.entries
+        # A 1-tuple sorts before every entry with the same lowercase form
+        start = bisect.bisect_left(entries, (key,))
+        end = bisect.bisect_left(entries, (key + self.LAST_CHAR,), start)
+        end = min(end, start + self.max_scan)
+        matches = (description for _, description in entries[start:end])
+        best = heapq.nlargest(self.max_suggestions, matches,
+                              key=self.ranks.__getitem__)
+        return best[:limit]
+
+def input_description(completions: DescriptionIndex) -> str:
+    """Ask for a task description, completing it with Tab if possible
+    
+    Args:
+        completions: Index of earlier descriptions
+        
+    Returns:
+        The entered description
+    """
+    prompt = "Enter task description: "
+    if readline is None:
+        return input(prompt)
+    
+    def complete(text: str, state: int) -> Optional[str]:
+        matches = completions.complete(text)
+        return matches[state] if state < len(matches) else None
+    
+    readline.set_completer_delims("")  # Complete the whole line
+    readline.set_completer(complete)
+    readline.parse_and_bind("tab: complete")
+    try:
+        return input(prompt)
+    finally:
+        readline.set_completer(None)
+
+def display_menu() -> None:
+    """Display the main menu"""
+    print("\nTask Manager v5")
+    print("1. Add basic task")
+    print("2. Add timed task")
+    print("3. View all tasks")
+    print("4. View pending tasks")
+    print("5. Mark task as complete")
+    print("6. Delete task")
+    print("7. Search tasks")
+    print("8. Exit")
+
+def get_valid_input(prompt: str, valid_choices: List[str]) -> str:
     """Get valid input from user
     
     Args:
@@ -331,40 +2491,51 @@ def get_valid_number(prompt: str, min_value: int = 1) -> int:
             print("\nOperation cancelled by user")
             raise
 
-def main() -> None:
-    """Main program loop"""
+def main(write_behind: bool = False) -> None:
+    """Main program loop
+    
+    Args:
+        write_behind: If True, save changes in a background thread
+            instead of before each menu action returns
+    """
+    # Share the task file with other processes where file locks exist
+    options = {"write_behind": write_behind, "shared": fcntl is not None}
     try:
-        manager = TaskManager()
+        manager = TaskManager(**options)
     except FileOperationError as e:
         print(f"Error: {e}")
         print("Starting with empty task list")
-        manager = TaskManager()
+        manager = TaskManager(**options)
+    completions = DescriptionIndex.from_descriptions(
+        task.description for task in manager.get_tasks())
     
     while True:
         try:
             display_menu()
-            choice = get_valid_input("Enter your choice (1-6): ", 
-                                   ["1", "2", "3", "4", "5", "6"])
+            choice = get_valid_input("Enter your choice (1-8): ", 
+                                   ["1", "2", "3", "4", "5", "6", "7", "8"])
             
             if choice == "1":
-                description = input("Enter task description: ")
+                description = input_description(completions)
                 priority = get_valid_input("Enter priority (low/medium/high): ", 
                                          ["low", "medium", "high"])
                 try:
                     task = BasicTask(description, priority)
-                    manager.add_task(task)
+                    manager.add_task(task, check_duplicates=True)
+                    completions.add(task.description)
                 except ValidationError as e:
                     print(f"Error: {e}")
                 
             elif choice == "2":
-                description = input("Enter task description: ")
+                description = input_description(completions)
                 priority = get_valid_input("Enter priority (low/medium/high): ", 
                                          ["low", "medium", "high"])
                 try:
                     deadline_str = input("Enter deadline (YYYY-MM-DD HH:MM): ")
                     deadline = datetime.strptime(deadline_str, "%Y-%m-%d %H:%M")
                     task = TimedTask(description, deadline, priority)
-                    manager.add_task(task)
+                    manager.add_task(task, check_duplicates=True)
+                    completions.add(task.description)
                 except ValueError:
                     print("Invalid date format. Please use YYYY-MM-DD HH:MM")
                 except ValidationError as e:
@@ -372,6 +2543,10 @@ def main() -> None:
                     
             elif choice == "3":
                 manager.view_tasks()
+                stats = manager.stats()
+                print(f"\n{stats['pending']} pending / {stats['completed']} completed"
+                      f" / {stats['high_priority']} high priority"
+                      f" / {stats['overdue']} overdue")
                 
             elif choice == "4":
                 manager.view_tasks("pending")
@@ -380,15 +2555,39 @@ def main() -> None:
                 manager.view_tasks()
                 if manager.tasks:
                     try:
-                        task_num = get_valid_number("Enter task number to mark as complete: ")
-                        if manager.mark_task_complete(task_num - 1):
+                        task_id = get_valid_number("Enter task ID to mark as complete: ")
+                        if manager.mark_task_complete(task_id):
                             print("Task marked as complete!")
                         else:
-                            print("Invalid task number!")
+                            print("Invalid task ID!")
                     except FileOperationError as e:
                         print(f"Error: {e}")
                         
             elif choice == "6":
+                manager.view_tasks()
+                if manager.tasks:
+                    try:
+                        task_id = get_valid_number("Enter task ID to delete: ")
+                        if manager.delete_task(task_id):
+                            print("Task deleted!")
+                        else:
+                            print("Invalid task ID!")
+                    except FileOperationError as e:
+                        print(f"Error: {e}")
+                        
+            elif choice == "7":
+                query = input("Enter search words: ")
+                tasks = manager.search(query)
+                if not tasks:
+                    tasks = manager.fuzzy_search(query)
+                    if tasks:
+                        print("No exact matches. Similar tasks:")
+                    else:
+                        print("No tasks found!")
+                for task in tasks:
+                    print(f"{task.id}. {task}")
+                    
+            elif choice == "8":
                 print("Goodbye!")
                 break
                 
@@ -398,6 +2597,11 @@ def main() -> None:
         except Exception as e:
             print(f"An unexpected error occurred: {e}")
             print("Please try again")
+    
+    try:
+        manager.close()
+    except FileOperationError as e:
+        print(f"Error: {e}")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main(write_behind="--write-behind" in sys.argv[1:]) 
\ No newline at end of file
@@ -0,0 +1,717 @@
+"""
+Lazy loading for the Lesson 6.2 task manager
+
+LazyTaskManager keeps only a small index of the task file in memory:
+- Task objects are read from the file when they are first used
+- The index is saved next to the task file and rebuilt when it is stale
+- Filters, counts and deadlines are answered from the index columns
+"""
+
+import bisect
+import heapq
+import json
+import os
+import struct
+import threading
+from array import array
+from collections import Counter
+from collections.abc import MutableMapping
+from typing import (Any, BinaryIO, Callable, Dict, Iterator, List, Optional,
+                    Tuple)
+from datetime import datetime
+
+from lesson_6_2_task_manager_errors_v5 import (NO_TIME, PENDING,
+                                               TASK_PRIORITIES, TASK_STATUSES,
+                                               TIME_FIELDS, FileOperationError,
+                                               Task, TaskManager, TimeIndex,
+                                               ValidationError,
+                                               from_microseconds,
+                                               normalize_description,
+                                               scan_json_array,
+                                               to_microseconds, tokenize,
+                                               trigram_similarity, trigrams)
+
+class LazyTaskDict(MutableMapping):
+    """A dict-like collection of tasks by ID that reads tasks from disk on access
+    
+    Only the ID, file offset, length, status and priority codes and
+    deadline of each task are kept, in compact arrays sorted by ID. A
+    task object is created the first time it is accessed and then cached. Tasks added since the last
+    save have no file position (offset -1) and live only in the cache.
+    Deleted tasks keep their row, marked DELETED, until the next load.
+    """
+    
+    UNKNOWN = -1
+    DELETED = -2
+    
+    def __init__(self, read_task: Callable[[int], Task]):
+        """Initialize an empty lazy task collection
+        
+        Args:
+            read_task: Function that loads a stored task by ID
+        """
+        self._read_task = read_task
+        self.ids = array("q")
+        self.offsets = array("q")
+        self.lengths = array("q")
+        self.status_codes = array("b")
+        self.priority_codes = array("b")
+        self.deadlines = array("q")  # Microseconds since EPOCH, or NO_TIME
+        self.loaded: Dict[int, Task] = {}
+        self._live = 0
+    
+    def _find(self, task_id: int) -> int:
+        """Get the row of an ID, including deleted rows (-1 if missing)"""
+        row = bisect.bisect_left(self.ids, task_id)
+        if row < len(self.ids) and self.ids[row] == task_id:
+            return row
+        return -1
+    
+    def row_of(self, task_id: int) -> int:
+        """Get the row of a task that has not been deleted (-1 if missing)"""
+        row = self._find(task_id)
+        if row >= 0 and self.status_codes[row] == self.DELETED:
+            return -1
+        return row
+    
+    def __len__(self) -> int:
+        return self._live
+    
+    def __iter__(self) -> Iterator[int]:
+        for row in self.rows():
+            yield self.ids[row]
+    
+    def __contains__(self, task_id: object) -> bool:
+        return isinstance(task_id, int) and self.row_of(task_id) >= 0
+    
+    def __getitem__(self, task_id: int) -> Task:
+        row = self.row_of(task_id)
+        if row < 0:
+            raise KeyError(task_id)
+        return self.task_at(row)
+    
+    def __setitem__(self, task_id: int, task: Task) -> None:
+        row = self._find(task_id)
+        if row < 0:
+            # New IDs are normally the largest, so this is an append
+            row = bisect.bisect_left(self.ids, task_id)
+            self.ids.insert(row, task_id)
+            self.offsets.insert(row, -1)
+            self.lengths.insert(row, 0)
+            self.status_codes.insert(row, self.DELETED)
+            self.priority_codes.insert(row, self.UNKNOWN)
+            self.deadlines.insert(row, NO_TIME)
+        if self.status_codes[row] == self.DELETED:
+            self._live += 1
+        deadline = getattr(task, "deadline", None)
+        self.status_codes[row] = self.status_code(task.status)
+        self.priority_codes[row] = self.priority_code(task.priority)
+        self.deadlines[row] = NO_TIME if deadline is None else to_microseconds(deadline)
+        self.loaded[task_id] = task
+    
+    def __delitem__(self, task_id: int) -> None:
+        row = self.row_of(task_id)
+        if row < 0:
+            raise KeyError(task_id)
+        self.status_codes[row] = self.DELETED
+        self.loaded.pop(task_id, None)
+        self._live -= 1
+    
+    def rows(self) -> Iterator[int]:
+        """Yield the rows of all tasks that have not been deleted"""
+        for row in range(len(self.ids)):
+            if self.status_codes[row] != self.DELETED:
+                yield row
+    
+    def task_at(self, row: int) -> Task:
+        """Get the task in a row, loading it if needed"""
+        task_id = self.ids[row]
+        task = self.loaded.get(task_id)
+        if task is None:
+            task = self._read_task(task_id)
+            task.id = task_id
+            self.loaded[task_id] = task
+        return task
+    
+    def add_stored(self, task_id: int, offset: int, length: int,
+                   status_code: int, priority_code: int, deadline: int) -> None:
+        """Register a task that is stored in the task file
+        
+        Tasks must be registered in increasing ID order.
+        
+        Args:
+            task_id: The task ID
+            offset: Byte offset of the task in the file
+            length: Length of the task in bytes
+            status_code: The stored status code
+            priority_code: The stored priority code
+            deadline: The deadline in microseconds, or NO_TIME
+        """
+        self.ids.append(task_id)
+        self.offsets.append(offset)
+        self.lengths.append(length)
+        self.status_codes.append(status_code)
+        self.priority_codes.append(priority_code)
+        self.deadlines.append(deadline)
+        self._live += 1
+    
+    def status(self, row: int) -> str:
+        """Get the status of a task without loading it if possible
+        
+        Args:
+            row: The row of the task
+            
+        Returns:
+            The task status
+        """
+        task = self.loaded.get(self.ids[row])
+        if task is not None:
+            return task.status
+        code = self.status_codes[row]
+        if code == self.UNKNOWN:
+            return self.task_at(row).status
+        return TASK_STATUSES[code]
+    
+    def priority(self, row: int) -> str:
+        """Get the priority of a task without loading it if possible
+        
+        Args:
+            row: The row of the task
+            
+        Returns:
+            The task priority
+        """
+        code = self.priority_codes[row]
+        if code == self.UNKNOWN:
+            return self.task_at(row).priority
+        return TASK_PRIORITIES[code]
+    
+    @classmethod
+    def status_code(cls, status: str) -> int:
+        """Get the stored code of a status"""
+        if status in TASK_STATUSES:
+            return TASK_STATUSES.index(status)
+        return cls.UNKNOWN
+    
+    @classmethod
+    def priority_code(cls, priority: str) -> int:
+        """Get the stored code of a priority"""
+        if priority in TASK_PRIORITIES:
+            return TASK_PRIORITIES.index(priority)
+        return cls.UNKNOWN
+
+class LazyTaskManager(TaskManager):
+    """A task manager that loads task objects only when they are needed
+    
+    Startup reads a small index file with the ID, position, status,
+    priority and deadline of every task instead of the tasks themselves,
+    together with the counts behind stats(). The index is rebuilt
+    from the task file if it is missing or older than the file. Saving
+    copies the bytes of tasks that were never loaded straight from the
+    old file.
+    """
+    
+    INDEX_MAGIC = b"TASKIDX3"
+    # magic, task file size and mtime, number of tasks, number of pending
+    # deadlines
+    INDEX_HEADER = struct.Struct("<8sqqqq")
+    
+    def __init__(self, filename: str = "tasks.json", **kwargs: Any):
+        """Initialize a new lazy task manager
+        
+        Args:
+            filename: Name of the file to store tasks
+            **kwargs: Other TaskManager options, such as journal
+        """
+        if kwargs.get("file_format", "json") != "json":
+            raise ValidationError("LazyTaskManager only supports JSON task files")
+        self.index_filename = filename + ".index"
+        self._file_lock = threading.RLock()
+        self._data_file: Optional[BinaryIO] = None
+        super().__init__(filename, **kwargs)
+    
+    def _load_snapshot(self) -> None:
+        """Load the task index instead of the tasks
+        
+        Raises:
+            FileOperationError: If file operations fail
+        """
+        self.tasks = LazyTaskDict(self._read_task)
+        self._version = None
+        if self._data_file is not None:
+            self._data_file.close()
+            self._data_file = None
+        if not os.path.exists(self.filename):
+            return
+        try:
+            self._data_file = open(self.filename, "rb")
+            self._version = self._file_version(os.fstat(self._data_file.fileno()))
+            if not self._load_index():
+                self._build_index()
+                tasks = self.tasks
+                summary = self._summarize(tasks.ids, tasks.status_codes,
+                                          tasks.priority_codes, tasks.deadlines)
+                self._save_index(tasks.ids, tasks.offsets, tasks.lengths,
+                                 tasks.status_codes, tasks.priority_codes,
+                                 tasks.deadlines, summary)
+                self._apply_summary(*summary)
+        except (json.JSONDecodeError, ValidationError, IOError, struct.error) as e:
+            raise FileOperationError(f"Error loading tasks: {e}") from e
+        if self.tasks.ids:
+            self.next_id = self.tasks.ids[-1] + 1
+    
+    def _load_index(self) -> bool:
+        """Read the index file if it matches the task file
+        
+        Returns:
+            True if the index was loaded, False if it must be rebuilt
+        """
+        if not os.path.exists(self.index_filename):
+            return False
+        stat = os.stat(self.filename)
+        with open(self.index_filename, "rb") as file:
+            header = file.read(self.INDEX_HEADER.size)
+            if len(header) != self.INDEX_HEADER.size:
+                return False
+            magic, size, mtime_ns, count, pending = self.INDEX_HEADER.unpack(header)
+            if (magic != self.INDEX_MAGIC or size != stat.st_size
+                    or mtime_ns != stat.st_mtime_ns):
+                return False
+            tasks = self.tasks
+            counts, deadlines, deadline_ids = array("q"), array("q"), array("q")
+            try:
+                for column in (tasks.ids, tasks.offsets, tasks.lengths,
+                               tasks.status_codes, tasks.priority_codes,
+                               tasks.deadlines):
+                    column.fromfile(file, count)
+                counts.fromfile(file, len(TASK_STATUSES) * len(TASK_PRIORITIES))
+                deadlines.fromfile(file, pending)
+                deadline_ids.fromfile(file, pending)
+            except EOFError:
+                self.tasks = LazyTaskDict(self._read_task)
+                return False
+            tasks._live = count
+        self._apply_summary(counts, deadlines, deadline_ids)
+        return True
+    
+    def _build_index(self) -> None:
+        """Scan the task file and record where each task is stored
+        
+        Tasks without an ID (from files written before tasks had IDs)
+        are numbered in file order.
+        
+        Raises:
+            ValidationError: If a task has an invalid ID, status, priority
+                or deadline
+        """
+        entries = []
+        next_id = 1
+        # latin-1 maps every byte to one character, so positions are offsets
+        with open(self.filename, "r", encoding="latin-1") as file:
+            for start, end, task_data in scan_json_array(file):
+                if not isinstance(task_data, dict):
+                    raise ValidationError("Task record must be an object")
+                task_id = task_data.get("id") or next_id
+                if type(task_id) is not int or task_id < 1:
+                    raise ValidationError(f"Invalid task ID: {task_id!r}")
+                next_id = max(next_id, task_id + 1)
+                status = task_data.get("status", PENDING)
+                if status not in TASK_STATUSES:
+                    raise ValidationError(f"Unknown status: {status}")
+                priority = task_data.get("priority")
+                if priority not in TASK_PRIORITIES:
+                    raise ValidationError(f"Unknown priority: {priority}")
+                deadline = task_data.get("deadline")
+                try:
+                    deadline = (NO_TIME if deadline is None else
+                                to_microseconds(datetime.fromisoformat(deadline)))
+                except (TypeError, ValueError) as e:
+                    raise ValidationError(f"Invalid deadline: {deadline!r}") from e
+                entries.append((task_id, start, end - start,
+                                LazyTaskDict.status_code(status),
+                                LazyTaskDict.priority_code(priority), deadline))
+        entries.sort()
+        for entry in entries:
+            self.tasks.add_stored(*entry)
+    
+    @staticmethod
+    def _summarize(ids: array, status_codes: array, priority_codes: array,
+                   deadlines: array) -> Tuple[array, array, array]:
+        """Compute the stored counts of a set of index columns
+        
+        Args:
+            ids: ID of each task
+            status_codes: Status code of each task
+            priority_codes: Priority code of each task
+            deadlines: Deadline of each task in microseconds, or NO_TIME
+            
+        Returns:
+            The number of tasks for each (status, priority) code pair, and
+            the deadlines and IDs of the pending tasks, by deadline
+        """
+        counts = array("q", bytes(8 * len(TASK_STATUSES) * len(TASK_PRIORITIES)))
+        pending = []
+        for task_id, status_code, priority_code, deadline in zip(
+                ids, status_codes, priority_codes, deadlines):
+            if status_code < 0 or priority_code < 0:
+                continue  # Deleted, or a value without a code
+            counts[status_code * len(TASK_PRIORITIES) + priority_code] += 1
+            if TASK_STATUSES[status_code] == PENDING and deadline != NO_TIME:
+                pending.append((deadline, task_id))
+        pending.sort()
+        return (counts, array("q", (deadline for deadline, _ in pending)),
+                array("q", (task_id for _, task_id in pending)))
+    
+    def _apply_summary(self, counts: array, deadlines: array,
+                       deadline_ids: array) -> None:
+        """Set the counters behind stats() from stored counts
+        
+        Args:
+            counts: Number of tasks for each (status, priority) code pair
+            deadlines: Deadlines of the pending tasks in microseconds, sorted
+            deadline_ids: The IDs of those tasks
+        """
+        self.counts = Counter()
+        for status_code, status in enumerate(TASK_STATUSES):
+            for priority_code, priority in enumerate(TASK_PRIORITIES):
+                count = counts[status_code * len(TASK_PRIORITIES) + priority_code]
+                if count:
+                    self.counts[(status, priority)] = count
+        self.pending_deadlines = TimeIndex()
+        self.pending_deadlines.entries = [
+            (from_microseconds(deadline), task_id)
+            for deadline, task_id in zip(deadlines, deadline_ids)]
+    
+    def _save_index(self, ids: array, offsets: array, lengths: array,
+                    status_codes: array, priority_codes: array,
+                    deadlines: array,
+                    summary: Tuple[array, array, array]) -> None:
+        """Write the index for the current task file
+        
+        Args:
+            ids: ID of each stored task, in increasing order
+            offsets: Byte offset of each stored task
+            lengths: Byte length of each stored task
+            status_codes: Status code of each stored task
+            priority_codes: Priority code of each stored task
+            deadlines: Deadline of each stored task in microseconds
+            summary: The counts of the stored tasks, from _summarize
+        """
+        stat = os.stat(self.filename)
+        counts, pending_deadlines, pending_ids = summary
+        temp_filename = self.index_filename + ".tmp"
+        with open(temp_filename, "wb") as file:
+            file.write(self.INDEX_HEADER.pack(self.INDEX_MAGIC, stat.st_size,
+                                              stat.st_mtime_ns, len(ids),
+                                              len(pending_ids)))
+            for column in (ids, offsets, lengths, status_codes, priority_codes,
+                           deadlines, counts, pending_deadlines, pending_ids):
+                column.tofile(file)
+        os.replace(temp_filename, self.index_filename)
+    
+    def _read_task(self, task_id: int) -> Task:
+        """Load one task from the task file
+        
+        The position is looked up under the file lock, since compaction
+        replaces the file and the positions together.
+        
+        Args:
+            task_id: The ID of the task
+            
+        Returns:
+            The task
+            
+        Raises:
+            FileOperationError: If the task cannot be read
+        """
+        with self._file_lock:
+            row = self.tasks._find(task_id)
+            if row < 0:
+                raise FileOperationError(f"Error loading task: no task {task_id}")
+            offset, length = self.tasks.offsets[row], self.tasks.lengths[row]
+            try:
+                raw = self._read_stored(offset, length)
+                return Task.from_trusted_dict(json.loads(raw.decode("utf-8")))
+            except (AttributeError, IOError, ValueError, ValidationError) as e:
+                raise FileOperationError(f"Error loading task: {e}") from e
+    
+    def _read_stored(self, offset: int, length: int) -> bytes:
+        """Read bytes of the task file
+        
+        A forked compaction shares the file position with this process,
+        so os.pread is used where it exists: it does not move the position.
+        
+        Args:
+            offset: Byte offset to read from
+            length: Number of bytes to read
+            
+        Returns:
+            The bytes
+        """
+        if hasattr(os, "pread"):
+            return os.pread(self._data_file.fileno(), length, offset)
+        self._data_file.seek(offset)
+        return self._data_file.read(length)
+    
+    def _after_fork(self) -> None:
+        """Replace the locks, including the file lock, in a forked child"""
+        super()._after_fork()
+        self._file_lock = threading.RLock()
+    
+    def _snapshot_data(self) -> List[Any]:
+        """Capture the tasks for a snapshot without loading them
+        
+        Returns:
+            A task dictionary for each loaded task and an (ID, offset,
+            length, status code, priority code, deadline) tuple for the others
+        """
+        tasks = self.tasks
+        data: List[Any] = []
+        for row in tasks.rows():
+            task = tasks.loaded.get(tasks.ids[row])
+            if task is not None:
+                data.append(task.to_dict())
+            else:
+                data.append((tasks.ids[row], tasks.offsets[row],
+                             tasks.lengths[row], tasks.status_codes[row],
+                             tasks.priority_codes[row], tasks.deadlines[row]))
+        return data
+    
+    def _write_snapshot(self, data: List[Any]) -> None:
+        """Write a new task file and index, copying unloaded tasks as bytes
+        
+        Args:
+            data: Items returned by _snapshot_data
+            
+        Raises:
+            FileOperationError: If file operations fail
+        """
+        ids, offsets, lengths = array("q"), array("q"), array("q")
+        status_codes, priority_codes, deadlines = array("b"), array("b"), array("q")
+        temp_filename = self.filename + ".tmp"
+        try:
+            self._save_next_id()
+            with open(temp_filename, "wb") as target:
+                with self._file_lock:
+                    target.write(b"[")
+                    position = 1
+                    for number, item in enumerate(data):
+                        separator = b",\n" if number else b"\n"
+                        target.write(separator)
+                        position += len(separator)
+                        if isinstance(item, dict):
+                            raw = json.dumps(item).encode("utf-8")
+                            task_id = item["id"]
+                            code = LazyTaskDict.status_code(item["status"])
+                            priority = LazyTaskDict.priority_code(item["priority"])
+                            deadline = item.get("deadline")
+                            deadline = (NO_TIME if deadline is None else
+                                        to_microseconds(datetime.fromisoformat(deadline)))
+                        else:
+                            task_id, offset, length, code, priority, deadline = item
+                            raw = self._read_stored(offset, length)
+                        target.write(raw)
+                        ids.append(task_id)
+                        offsets.append(position)
+                        lengths.append(len(raw))
+                        status_codes.append(code)
+                        priority_codes.append(priority)
+                        deadlines.append(deadline)
+                        position += len(raw)
+                    target.write(b"\n]\n")
+            
+            with self._file_lock:
+                os.replace(temp_filename, self.filename)
+                if self._data_file is not None:
+                    self._data_file.close()
+                self._data_file = open(self.filename, "rb")
+                for task_id, offset, length in zip(ids, offsets, lengths):
+                    row = self.tasks._find(task_id)
+                    if row >= 0:
+                        self.tasks.offsets[row] = offset
+                        self.tasks.lengths[row] = length
+                self._save_index(ids, offsets, lengths, status_codes,
+                                 priority_codes, deadlines,
+                                 self._summarize(ids, status_codes,
+                                                 priority_codes, deadlines))
+        except (IOError, OSError) as e:
+            raise FileOperationError(f"Error saving tasks: {e}") from e
+    
+    def _index_task(self, task: Task) -> None:
+        """Do nothing: statuses are looked up in the task index instead"""
+    
+    def _unindex_task(self, task: Task) -> None:
+        """Do nothing: statuses are looked up in the task index instead"""
+    
+    def get_tasks(self, status: Optional[str] = None,
+                  priority: Optional[str] = None) -> List[Task]:
+        """Get tasks with optional status and priority filters
+        
+        Both filters use the codes in the index, so only the matching
+        tasks are loaded.
+        
+        Args:
+            status: Optional status to filter by
+            priority: Optional priority to filter by
+            
+        Returns:
+            List of matching tasks
+        """
+        with self._lock:
+            tasks = self.tasks
+            return [tasks.task_at(row) for row in tasks.rows()
+                    if (status is None or tasks.status(row) == status)
+                    and (priority is None or tasks.priority(row) == priority)]
+    
+    def get_overdue_tasks(self, now: Optional[datetime] = None) -> List[Task]:
+        """Get pending timed tasks whose deadline has passed
+        
+        The deadlines of pending tasks are kept in a sorted index, so
+        only the overdue tasks are loaded.
+        
+        Args:
+            now: The time to compare against (defaults to the current time)
+            
+        Returns:
+            List of overdue tasks, earliest deadline first
+        """
+        now = now or datetime.now()
+        with self._lock:
+            tasks = self.tasks
+            return [tasks[task_id] for task_id
+                    in self.pending_deadlines.between(None, now)]
+    
+    def next_tasks(self, k: int = 10) -> List[Task]:
+        """Get the k most urgent pending tasks
+        
+        The tasks are ranked by the priority codes and deadlines in the
+        index, so only the k tasks returned are loaded.
+        
+        Args:
+            k: The number of tasks to return
+            
+        Returns:
+            List of up to k tasks, most urgent first
+        """
+        with self._lock:
+            tasks = self.tasks
+            # Same order as _urgency_key: tasks without a deadline come last
+            keys = ((-TASK_PRIORITIES.index(tasks.priority(row)),
+                     tasks.deadlines[row] == NO_TIME, tasks.deadlines[row],
+                     tasks.ids[row])
+                    for row in tasks.rows() if tasks.status(row) == PENDING)
+            return [tasks[key[-1]] for key in heapq.nsmallest(k, keys)]
+    
+    def next_deadline(self) -> Optional[Task]:
+        """Get the pending timed task with the earliest deadline
+        
+        Returns:
+            The task, or None if no timed task is pending
+        """
+        with self._lock:
+            entries = self.pending_deadlines.entries
+            return self.tasks[entries[0][1]] if entries else None
+    
+    def search(self, query: str, match_all: bool = True) -> List[Task]:
+        """Find tasks whose description contains the words of a query
+        
+        The lazy index has no words, so this loads every task.
+        
+        Args:
+            query: The words to search for
+            match_all: If True, tasks must contain every word (AND);
+                otherwise any word is enough (OR)
+            
+        Returns:
+            List of matching tasks in ID order
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        if match_all:
+            return [task for task in self.get_tasks()
+                    if words <= tokenize(task.description)]
+        return [task for task in self.get_tasks()
+                if words & tokenize(task.description)]
+    
+    def find_duplicate(self, description: str) -> Optional[Task]:
+        """Find a task with the same description, ignoring case and spacing
+        
+        The lazy index has no descriptions, so this loads every task.
+        
+        Args:
+            description: The description to look for
+            
+        Returns:
+            The existing task, or None if there is none
+        """
+        key = normalize_description(description)
+        for task in self.get_tasks():
+            if normalize_description(task.description) == key:
+                return task
+        return None
+    
+    def fuzzy_search(self, query: str, limit: int = 5,
+                     min_similarity: float = 0.2) -> List[Task]:
+        """Find the tasks whose descriptions are most similar to a query
+        
+        The lazy index has no trigrams, so this loads and scores every task.
+        
+        Args:
+            query: The text to look for
+            limit: The maximum number of tasks to return
+            min_similarity: The lowest similarity (0 to 1) to return
+            
+        Returns:
+            List of up to limit tasks, most similar first
+        """
+        query_grams = trigrams(query)
+        scores = []
+        for task in self.get_tasks():
+            grams = trigrams(task.description)
+            score = trigram_similarity(len(query_grams & grams),
+                                       len(query_grams), len(grams))
+            if score >= min_similarity:
+                scores.append((score, -task.id, task))
+        return [task for _, _, task in heapq.nlargest(limit, scores,
+                                                       key=lambda s: s[:2])]
+    
+    def tasks_between(self, field: str, start: Optional[datetime] = None,
+                      end: Optional[datetime] = None) -> Iterator[Task]:
+        """Get the tasks whose timestamp lies in a range, in time order
+        
+        The lazy index has no timestamps, so this loads every task.
+        
+        Args:
+            field: "created_at", "completed_at" or "deadline"
+            start: Optional inclusive lower bound
+            end: Optional exclusive upper bound
+            
+        Returns:
+            An iterator over the matching tasks
+            
+        Raises:
+            ValidationError: If the field cannot be queried by range
+        """
+        if field not in TIME_FIELDS:
+            raise ValidationError(f"Cannot query tasks by {field}")
+        matches = []
+        for task in self.get_tasks():
+            moment = getattr(task, field, None)
+            if (moment is not None and (start is None or moment >= start)
+                    and (end is None or moment < end)):
+                matches.append((moment, task.id, task))
+        matches.sort(key=lambda match: match[:2])
+        return (task for _, _, task in matches)
+    
+    def close(self) -> None:
+        """Store waiting changes and close the task file
+        
+        Raises:
+            FileOperationError: If saving fails
+        """
+        super().close()
+        with self._file_lock:
+            if self._data_file is not None:
+                self._data_file.close()
+                self._data_file = None
\ No newline at end of file
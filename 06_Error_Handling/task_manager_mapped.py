@@ -0,0 +1,346 @@
+"""
+Memory-mapped storage for the Lesson 6.2 task manager
+
+MappedTaskManager keeps tasks in fixed-size slots of a memory-mapped file:
+- Completing a task changes one status byte in place
+- Deleting a task marks its slot as free
+- New tasks are appended to the end of the file
+"""
+
+import mmap
+import os
+import struct
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple
+
+from lesson_6_2_task_manager_errors_v5 import (NO_TIME, TASK_CLASSES,
+                                               TASK_PRIORITIES, TASK_STATUSES,
+                                               TASK_TYPES, FileOperationError,
+                                               Task, TaskManager,
+                                               from_microseconds,
+                                               to_microseconds)
+
+class MappedTaskManager(TaskManager):
+    """A task manager that keeps tasks in a memory-mapped file of fixed-size slots
+    
+    Each task has a slot of the same size, so the status and completion
+    time of a task are always at a known offset. Completing a task writes
+    those few bytes in place instead of rewriting the file. Descriptions
+    have different lengths, so they are appended to a separate heap file
+    and the slot stores their offset and length. Deleting a task marks
+    its slot as DELETED; the slot is not reused until compact() drops it,
+    and compact() stores the next ID so that the ID is not reused either.
+    """
+    
+    MAGIC = b"TASKMAP2"
+    HEADER = struct.Struct("<8sQ")  # magic, number of used slots
+    # id, type, priority, created_at, deadline, description offset and
+    # length, then status and completed_at so they can be updated together
+    SLOT = struct.Struct("<qBBqqqIBq")
+    STATUS = struct.Struct("<Bq")
+    STATUS_OFFSET = SLOT.size - STATUS.size
+    DELETED = 255
+    INITIAL_SLOTS = 1024
+    
+    def __init__(self, filename: str = "tasks.map", sync: bool = False):
+        """Initialize a new memory-mapped task manager
+        
+        Args:
+            filename: Name of the slot file
+            sync: If True, flush every change to disk before returning
+        """
+        self.heap_filename = filename + ".heap"
+        self.sync = sync
+        self._map: Optional[mmap.mmap] = None
+        self._slot_file: Optional[BinaryIO] = None
+        self._heap_file: Optional[BinaryIO] = None
+        self._slots: Dict[int, int] = {}  # Slot number of each task ID
+        self._slot_count = 0
+        super().__init__(filename)
+    
+    def _load_snapshot(self) -> None:
+        """Map the slot file and load the tasks stored in it
+        
+        Raises:
+            FileOperationError: If file operations fail
+        """
+        try:
+            exists = os.path.exists(self.filename)
+            self._slot_file = open(self.filename, "r+b" if exists else "w+b")
+            self._heap_file = open(self.heap_filename, "a+b")
+            if not exists:
+                self._slot_file.truncate(self.HEADER.size
+                                         + self.INITIAL_SLOTS * self.SLOT.size)
+            self._map = mmap.mmap(self._slot_file.fileno(), 0)
+            magic, count = self.HEADER.unpack_from(self._map)
+            if not exists:
+                self.HEADER.pack_into(self._map, 0, self.MAGIC, 0)
+            elif magic != self.MAGIC:
+                raise FileOperationError(f"{self.filename} is not a task map file")
+            
+            self._heap_file.seek(0)
+            heap = self._heap_file.read()
+            self._slot_count = count
+            for index in range(count):
+                task = self._read_slot(index, heap)
+                if task is not None:
+                    self._slots[task.id] = index
+                    self._insert(task)
+                else:
+                    # Deleted slots keep their ID until compact() drops them
+                    task_id = self.SLOT.unpack_from(self._map,
+                                                    self._slot_offset(index))[0]
+                    self.next_id = max(self.next_id, task_id + 1)
+        except (IOError, OSError, ValueError, struct.error) as e:
+            raise FileOperationError(f"Error loading tasks: {e}") from e
+    
+    def _slot_offset(self, index: int) -> int:
+        """Get the byte offset of a slot in the file"""
+        return self.HEADER.size + index * self.SLOT.size
+    
+    def _read_slot(self, index: int, heap: bytes) -> Optional[Task]:
+        """Create the task stored in a slot
+        
+        Args:
+            index: The slot number
+            heap: Contents of the description heap
+            
+        Returns:
+            Task instance, or None if the task was deleted
+        """
+        (task_id, type_code, priority_code, created_at, deadline, offset,
+         length, status_code, completed_at) = self.SLOT.unpack_from(
+            self._map, self._slot_offset(index))
+        if status_code == self.DELETED:
+            return None
+        return TASK_CLASSES[TASK_TYPES[type_code]]._restore(
+            task_id,
+            heap[offset:offset + length].decode("utf-8"),
+            TASK_PRIORITIES[priority_code],
+            TASK_STATUSES[status_code],
+            from_microseconds(created_at),
+            None if completed_at == NO_TIME else from_microseconds(completed_at),
+            None if deadline == NO_TIME else from_microseconds(deadline))
+    
+    def _grow(self, slots: int) -> None:
+        """Make room for at least the given number of slots
+        
+        The file size is doubled so that growing stays rare.
+        """
+        needed = self._slot_offset(slots)
+        if needed <= len(self._map):
+            return
+        size = len(self._map)
+        while size < needed:
+            size *= 2
+        self._map.close()
+        self._slot_file.truncate(size)
+        self._map = mmap.mmap(self._slot_file.fileno(), 0)
+    
+    def _flush(self, offset: int, length: int) -> None:
+        """Flush part of the map to disk if sync is enabled"""
+        if self.sync:
+            start = offset - offset % mmap.ALLOCATIONGRANULARITY
+            self._map.flush(start, offset + length - start)
+    
+    def _persist_add(self, task: Task) -> None:
+        """Write the description to the heap and the task to a new slot
+        
+        The slot count in the header is updated last, so a slot that was
+        only partly written is never read back.
+        
+        Raises:
+            FileOperationError: If saving fails
+        """
+        description = task.description.encode("utf-8")
+        deadline = getattr(task, "deadline", None)
+        try:
+            with self._lock:
+                self._heap_file.seek(0, os.SEEK_END)
+                offset = self._heap_file.tell()
+                self._heap_file.write(description)
+                self._heap_file.flush()
+                if self.sync:
+                    os.fsync(self._heap_file.fileno())
+                
+                index = self._slot_count
+                self._grow(index + 1)
+                slot = self._slot_offset(index)
+                self.SLOT.pack_into(
+                    self._map, slot,
+                    task.id,
+                    TASK_TYPES.index(task.get_type()),
+                    TASK_PRIORITIES.index(task.priority),
+                    to_microseconds(task.created_at),
+                    NO_TIME if deadline is None else to_microseconds(deadline),
+                    offset, len(description),
+                    TASK_STATUSES.index(task.status),
+                    NO_TIME if task.completed_at is None
+                    else to_microseconds(task.completed_at))
+                self._flush(slot, self.SLOT.size)
+                self.HEADER.pack_into(self._map, 0, self.MAGIC, index + 1)
+                self._flush(0, self.HEADER.size)
+                self._slot_count = index + 1
+                self._slots[task.id] = index
+        except (IOError, OSError, ValueError) as e:
+            raise FileOperationError(f"Error saving task: {e}") from e
+    
+    def _persist_complete(self, task: Task) -> None:
+        """Overwrite the status and completion time of one slot in place
+        
+        Raises:
+            FileOperationError: If saving fails
+        """
+        self._write_status(task, TASK_STATUSES.index(task.status),
+                           to_microseconds(task.completed_at))
+    
+    def _persist_delete(self, task: Task) -> None:
+        """Mark the slot of a deleted task in place
+        
+        Raises:
+            FileOperationError: If saving fails
+        """
+        self._write_status(task, self.DELETED, NO_TIME)
+    
+    def compact(self, wait: bool = False) -> None:
+        """Rewrite the slot file without the slots of deleted tasks
+        
+        Live slots are copied unchanged, so their descriptions stay where
+        they are in the heap file; the heap itself is not compacted. The
+        new file replaces the old one atomically.
+        
+        Args:
+            wait: Ignored, the slot file is always rewritten at once
+            
+        Raises:
+            FileOperationError: If file operations fail
+        """
+        temp_filename = self.filename + ".tmp"
+        try:
+            with self._lock:
+                self._save_next_id()
+                live = sorted((self._slots[task_id], task_id)
+                              for task_id in self.tasks)
+                with open(temp_filename, "wb") as file:
+                    file.write(self.HEADER.pack(self.MAGIC, len(live)))
+                    for index, _ in live:
+                        offset = self._slot_offset(index)
+                        file.write(self._map[offset:offset + self.SLOT.size])
+                    file.truncate(self._slot_offset(max(len(live),
+                                                        self.INITIAL_SLOTS)))
+                    if self.sync:
+                        file.flush()
+                        os.fsync(file.fileno())
+                self._map.close()
+                self._slot_file.close()
+                os.replace(temp_filename, self.filename)
+                self._slot_file = open(self.filename, "r+b")
+                self._map = mmap.mmap(self._slot_file.fileno(), 0)
+                self._slots = {task_id: number
+                               for number, (_, task_id) in enumerate(live)}
+                self._slot_count = len(live)
+        except (IOError, OSError, ValueError) as e:
+            raise FileOperationError(f"Error compacting tasks: {e}") from e
+    
+    def _commit_batch(self,
+                      changes: List[Tuple[str, Task, Callable[[], None]]]) -> None:
+        """Write the slots changed by a batch
+        
+        Slots are written in place one change at a time. If a write
+        fails, the slots written so far are put back, so the stored
+        tasks match the tasks in memory once the batch is undone.
+        
+        Args:
+            changes: The (operation, task, undo) entries, in order
+            
+        Raises:
+            FileOperationError: If saving fails
+        """
+        slot_count = self._slot_count
+        # Offset and previous bytes of each status that is overwritten
+        statuses: List[Tuple[int, bytes]] = []
+        try:
+            for operation, task, _ in changes:
+                if operation != "add":
+                    offset = (self._slot_offset(self._slots[task.id])
+                              + self.STATUS_OFFSET)
+                    statuses.append((offset,
+                                     self._map[offset:offset + self.STATUS.size]))
+                getattr(self, f"_persist_{operation}")(task)
+        except FileOperationError:
+            self._restore_slots(changes, slot_count, statuses)
+            raise
+    
+    def _restore_slots(self, changes: List[Tuple[str, Task, Callable[[], None]]],
+                       slot_count: int, statuses: List[Tuple[int, bytes]]) -> None:
+        """Put back the slots written by a batch that failed
+        
+        The slot count in the header is restored, which drops the slots
+        of added tasks. Their descriptions stay in the heap file.
+        
+        Args:
+            changes: The (operation, task, undo) entries of the batch
+            slot_count: The number of used slots before the batch
+            statuses: Offset and previous bytes of each overwritten status
+            
+        Raises:
+            FileOperationError: If the slots cannot be written
+        """
+        try:
+            with self._lock:
+                for offset, previous in reversed(statuses):
+                    self._map[offset:offset + len(previous)] = previous
+                    self._flush(offset, len(previous))
+                for operation, task, _ in changes:
+                    if (operation == "add"
+                            and self._slots.get(task.id, -1) >= slot_count):
+                        del self._slots[task.id]
+                self.HEADER.pack_into(self._map, 0, self.MAGIC, slot_count)
+                self._flush(0, self.HEADER.size)
+                self._slot_count = slot_count
+        except (OSError, ValueError) as e:
+            raise FileOperationError(f"Error undoing batch: {e}") from e
+    
+    def _write_status(self, task: Task, status_code: int,
+                      completed_at: int) -> None:
+        """Overwrite the status fields of the slot of a task
+        
+        Args:
+            task: The task whose slot is updated
+            status_code: The status code to store
+            completed_at: The completion time in microseconds
+            
+        Raises:
+            FileOperationError: If saving fails
+        """
+        offset = self._slot_offset(self._slots[task.id]) + self.STATUS_OFFSET
+        try:
+            with self._lock:
+                self.STATUS.pack_into(self._map, offset, status_code,
+                                      completed_at)
+                self._flush(offset, self.STATUS.size)
+        except (OSError, ValueError) as e:
+            raise FileOperationError(f"Error saving task: {e}") from e
+    
+    def save_tasks(self) -> None:
+        """Flush all changes to disk
+        
+        Raises:
+            FileOperationError: If flushing fails
+        """
+        try:
+            with self._lock:
+                self._map.flush()
+                self._heap_file.flush()
+                os.fsync(self._heap_file.fileno())
+        except (OSError, ValueError) as e:
+            raise FileOperationError(f"Error saving tasks: {e}") from e
+    
+    def close(self) -> None:
+        """Flush changes and close the files"""
+        if self._map is not None:
+            super().close()
+            self.save_tasks()
+            self._map.close()
+            self._slot_file.close()
+            self._heap_file.close()
+            self._map = None
\ No newline at end of file
@@ -0,0 +1,683 @@
+"""
+SQLite storage for the Lesson 6.2 task manager
+
+SQLiteTaskManager keeps tasks in an indexed SQLite database instead of a
+JSON file:
+- Filters, overdue checks and searches are indexed SQL queries
+- Every change is a single-row INSERT, UPDATE or DELETE
+- Task counts are kept up to date by triggers
+- JSON task files written by TaskManager can be imported
+"""
+
+import heapq
+import json
+import sqlite3
+import sys
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from datetime import datetime
+
+from lesson_6_2_task_manager_errors_v5 import (COMPLETED, PENDING,
+                                               TASK_CLASSES, TASK_PRIORITIES,
+                                               TIME_FIELDS, DuplicateTaskError,
+                                               FileOperationError, Task,
+                                               ValidationError, iter_json_array,
+                                               normalize_description, tokenize,
+                                               trigram_similarity, trigrams)
+
+class SQLiteTaskManager:
+    """A task manager that stores tasks in an SQLite database
+    
+    Tasks are not kept in memory. Filters and overdue checks are SQL
+    queries that use the indexes on status, priority, deadline and
+    created_at, and every change is a single-row INSERT or UPDATE.
+    AUTOINCREMENT keeps the ID of a deleted task from being reused.
+    
+    It has the same task methods as TaskManager but shares none of its
+    code, since there is no journal to compact and no in-memory index.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            type TEXT NOT NULL,
+            description TEXT NOT NULL,
+            priority TEXT NOT NULL,
+            status TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            deadline TEXT,
+            completed_at TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+        CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority);
+        CREATE INDEX IF NOT EXISTS idx_tasks_deadline ON tasks(deadline);
+        CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks(created_at);
+        CREATE INDEX IF NOT EXISTS idx_tasks_completed_at ON tasks(completed_at);
+        CREATE TABLE IF NOT EXISTS task_words (
+            word TEXT NOT NULL,
+            task_id INTEGER NOT NULL,
+            PRIMARY KEY (word, task_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_task_words_task_id ON task_words(task_id);
+        CREATE TABLE IF NOT EXISTS task_trigrams (
+            trigram TEXT NOT NULL,
+            task_id INTEGER NOT NULL,
+            PRIMARY KEY (trigram, task_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_task_trigrams_task_id
+            ON task_trigrams(task_id);
+        CREATE TRIGGER IF NOT EXISTS task_words_delete AFTER DELETE ON tasks
+        BEGIN
+            DELETE FROM task_words WHERE task_id = old.id;
+            DELETE FROM task_trigrams WHERE task_id = old.id;
+        END;
+        CREATE TABLE IF NOT EXISTS task_counts (
+            status TEXT NOT NULL,
+            priority TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (status, priority)
+        ) WITHOUT ROWID;
+        CREATE TRIGGER IF NOT EXISTS task_counts_insert AFTER INSERT ON tasks
+        BEGIN
+            INSERT INTO task_counts VALUES (new.status, new.priority, 1)
+                ON CONFLICT DO UPDATE SET count = count + 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS task_counts_delete AFTER DELETE ON tasks
+        BEGIN
+            UPDATE task_counts SET count = count - 1
+                WHERE status = old.status AND priority = old.priority;
+        END;
+        CREATE TRIGGER IF NOT EXISTS task_counts_update
+            AFTER UPDATE OF status, priority ON tasks
+        BEGIN
+            UPDATE task_counts SET count = count - 1
+                WHERE status = old.status AND priority = old.priority;
+            INSERT INTO task_counts VALUES (new.status, new.priority, 1)
+                ON CONFLICT DO UPDATE SET count = count + 1;
+        END;
+    """
+    
+    def __init__(self, filename: str = "tasks.db"):
+        """Initialize a new SQLite task manager
+        
+        Args:
+            filename: Name of the database file
+            
+        Raises:
+            FileOperationError: If the database cannot be opened
+        """
+        self.filename = filename
+        self._in_batch = False
+        self.load_tasks()
+    
+    @property
+    def tasks(self) -> Dict[int, Task]:
+        """All tasks by ID, read from the database"""
+        return {task.id: task for task in self.get_tasks()}
+    
+    def load_tasks(self) -> None:
+        """Open the database and create the schema if needed
+        
+        Raises:
+            FileOperationError: If the database cannot be opened
+        """
+        try:
+            self.connection = sqlite3.connect(self.filename)
+            # Readers see the last committed version without blocking writers
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.executescript(self.SCHEMA)
+        except sqlite3.Error as e:
+            raise FileOperationError(f"Error opening database: {e}") from e
+    
+    def _index_descriptions(self, after_id: int = 0) -> None:
+        """Add the description words and trigrams of tasks to the search indexes
+        
+        Args:
+            after_id: Only index tasks with a larger ID
+        """
+        rows = self.connection.execute(
+            "SELECT id, description FROM tasks WHERE id > ?", (after_id,)).fetchall()
+        for task_id, description in rows:
+            self._index_description(task_id, description, "INSERT OR IGNORE")
+    
+    def _index_description(self, task_id: int, description: str,
+                           insert: str = "INSERT") -> None:
+        """Add the words and trigrams of one description to the search indexes
+        
+        Args:
+            task_id: The ID of the task
+            description: The task description
+            insert: The INSERT statement variant to use
+        """
+        self.connection.executemany(
+            f"{insert} INTO task_words (word, task_id) VALUES (?, ?)",
+            ((word, task_id) for word in tokenize(description)))
+        self.connection.executemany(
+            f"{insert} INTO task_trigrams (trigram, task_id) VALUES (?, ?)",
+            ((gram, task_id) for gram in trigrams(description)))
+    
+    def _transaction(self) -> Any:
+        """Get a context that commits its changes, unless a batch is running
+        
+        Returns:
+            The connection, or a context that does nothing inside a batch
+        """
+        return nullcontext() if self._in_batch else self.connection
+    
+    @contextmanager
+    def batch(self) -> Iterator['SQLiteTaskManager']:
+        """Run the changes made inside the block in one transaction
+        
+        The transaction is committed when the block ends and rolled back
+        if it raises. A batch inside another batch joins the outer one.
+        
+        Yields:
+            The task manager
+            
+        Raises:
+            FileOperationError: If committing fails
+        """
+        if self._in_batch:
+            yield self
+            return
+        self._in_batch = True
+        try:
+            with self.connection:
+                yield self
+        except sqlite3.Error as e:
+            raise FileOperationError(f"Error saving tasks: {e}") from e
+        finally:
+            self._in_batch = False
+    
+    def save_tasks(self) -> None:
+        """Commit pending changes (each change is already committed)"""
+        try:
+            self.connection.commit()
+        except sqlite3.Error as e:
+            raise FileOperationError(f"Error saving tasks: {e}") from e
+    
+    def flush(self) -> None:
+        """Do nothing: every change is committed before its call returns"""
+    
+    def refresh(self) -> bool:
+        """Do nothing: every query reads the last committed version
+        
+        Returns:
+            False
+        """
+        return False
+    
+    def close(self) -> None:
+        """Close the database connection"""
+        self.connection.close()
+    
+    def import_json(self, json_filename: str) -> int:
+        """Copy the tasks of a JSON task file into the database
+        
+        Args:
+            json_filename: The JSON file written by TaskManager
+            
+        Returns:
+            The number of imported tasks
+            
+        Raises:
+            FileOperationError: If reading or writing fails
+        """
+        try:
+            with open(json_filename, "r") as file, self._transaction():
+                last_id = self.connection.execute(
+                    "SELECT COALESCE(MAX(id), 0) FROM tasks").fetchone()[0]
+                before = self.connection.total_changes
+                self.connection.executemany(
+                    "INSERT INTO tasks (type, description, priority, status, "
+                    "created_at, deadline, completed_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (self._row_values(task_data)
+                     for task_data in iter_json_array(file)))
+                imported = self.connection.total_changes - before
+                self._index_descriptions(last_id)
+                return imported
+        except (json.JSONDecodeError, IOError) as e:
+            raise FileOperationError(f"Error loading tasks: {e}") from e
+        except (sqlite3.Error, KeyError) as e:
+            raise FileOperationError(f"Error importing tasks: {e}") from e
+    
+    @staticmethod
+    def _row_values(data: dict) -> tuple:
+        """Convert a task dictionary to the column values of a row"""
+        return (data["type"], data["description"], data["priority"],
+                data.get("status", "pending"),
+                data.get("created_at", datetime.now().isoformat()),
+                data.get("deadline"), data.get("completed_at"))
+    
+    @staticmethod
+    def _row_to_task(row: tuple) -> Task:
+        """Convert a database row to a task"""
+        (task_id, task_type, description, priority, status, created_at,
+         deadline, completed_at) = row
+        return TASK_CLASSES[task_type]._restore(
+            task_id, description, sys.intern(priority), sys.intern(status),
+            datetime.fromisoformat(created_at),
+            datetime.fromisoformat(completed_at) if completed_at else None,
+            datetime.fromisoformat(deadline) if deadline else None)
+    
+    def _query(self, where: str = "", params: tuple = ()) -> List[tuple]:
+        """Run a SELECT on the tasks table
+        
+        Args:
+            where: Optional WHERE clause
+            params: Parameters for the clause
+            
+        Returns:
+            The matching rows in insertion order
+            
+        Raises:
+            FileOperationError: If the query fails
+        """
+        sql = ("SELECT id, type, description, priority, status, created_at, "
+               "deadline, completed_at FROM tasks")
+        if where:
+            sql += " WHERE " + where
+        try:
+            return self.connection.execute(sql + " ORDER BY id", params).fetchall()
+        except sqlite3.Error as e:
+            raise FileOperationError(f"Error reading tasks: {e}") from e
+    
+    def find_duplicate(self, description: str) -> Optional[Task]:
+        """Find a task with the same description, ignoring case and spacing
+        
+        Candidates come from the indexed word table, so no Bloom filter
+        has to be built from the whole database.
+        
+        Args:
+            description: The description to look for
+            
+        Returns:
+            The existing task, or None if there is none
+            
+        Raises:
+            FileOperationError: If the query fails
+        """
+        key = normalize_description(description)
+        candidates = self.search(key) if tokenize(key) else self.get_tasks()
+        for task in candidates:
+            if normalize_description(task.description) == key:
+                return task
+        return None
+    
+    def add_task(self, task: Task, check_duplicates: bool = False) -> None:
+        """Add a new task with a single INSERT
+        
+        Args:
+            task: The task to add
+            check_duplicates: If True, refuse a task whose description
+                matches an existing task
+            
+        Raises:
+            DuplicateTaskError: If check_duplicates is set and the task
+                is a duplicate
+            FileOperationError: If saving fails
+        """
+        if check_duplicates:
+            duplicate = self.find_duplicate(task.description)
+            if duplicate is not None:
+                raise DuplicateTaskError(
+                    f"Task {duplicate.id} already has this description")
+        try:
+            with self._transaction():
+                cursor = self.connection.execute(
+                    "INSERT INTO tasks (type, description, priority, status, "
+                    "created_at, deadline, completed_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    self._row_values(task.to_dict()))
+                self._index_description(cursor.lastrowid, task.description)
+        except sqlite3.Error as e:
+            raise FileOperationError(f"Error saving task: {e}") from e
+        task.id = cursor.lastrowid
+        print(f"Task added: {task.description}")
+    
+    def get_task(self, task_id: int) -> Optional[Task]:
+        """Get a task by its ID
+        
+        Args:
+            task_id: The ID of the task
+            
+        Returns:
+            The task, or None if there is no task with that ID
+        """
+        rows = self._query("id = ?", (task_id,))
+        return self._row_to_task(rows[0]) if rows else None
+    
+    def get_tasks(self, status: Optional[str] = None,
+                  priority: Optional[str] = None) -> List[Task]:
+        """Get tasks with optional status and priority filters
+        
+        Args:
+            status: Optional status to filter by
+            priority: Optional priority to filter by
+            
+        Returns:
+            List of matching tasks
+        """
+        conditions, params = [], []
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if priority is not None:
+            conditions.append("priority = ?")
+            params.append(priority)
+        rows = self._query(" AND ".join(conditions), tuple(params))
+        return [self._row_to_task(row) for row in rows]
+    
+    def get_overdue_tasks(self, now: Optional[datetime] = None) -> List[Task]:
+        """Get pending tasks whose deadline has passed
+        
+        Args:
+            now: The time to compare against (defaults to the current time)
+            
+        Returns:
+            List of overdue tasks
+        """
+        rows = self._query("deadline < ? AND status != 'completed'",
+                           ((now or datetime.now()).isoformat(),))
+        return [self._row_to_task(row) for row in rows]
+    
+    def tasks_between(self, field: str, start: Optional[datetime] = None,
+                      end: Optional[datetime] = None) -> Iterator[Task]:
+        """Get the tasks whose timestamp lies in a range, in time order
+        
+        The range is an indexed query and rows are read as they are used.
+        
+        Args:
+            field: "created_at", "completed_at" or "deadline"
+            start: Optional inclusive lower bound
+            end: Optional exclusive upper bound
+            
+        Returns:
+            An iterator over the matching tasks
+            
+        Raises:
+            ValidationError: If the field cannot be queried by range
+            FileOperationError: If the query fails
+        """
+        if field not in TIME_FIELDS:
+            raise ValidationError(f"Cannot query tasks by {field}")
+        conditions, params = [f"{field} IS NOT NULL"], []
+        if start is not None:
+            conditions.append(f"{field} >= ?")
+            params.append(start.isoformat())
+        if end is not None:
+            conditions.append(f"{field} < ?")
+            params.append(end.isoformat())
+        try:
+            cursor = self.connection.execute(
+                "SELECT id, type, description, priority, status, created_at, "
+                "deadline, completed_at FROM tasks WHERE "
+                + " AND ".join(conditions) + f" ORDER BY {field}, id", params)
+        except sqlite3.Error as e:
+            raise FileOperationError(f"Error reading tasks: {e}") from e
+        return (self._row_to_task(row) for row in cursor)
+    
+    def search(self, query: str, match_all: bool = True) -> List[Task]:
+        """Find tasks whose description contains the words of a query
+        
+        Args:
+            query: The words to search for
+            match_all: If True, tasks must contain every word (AND);
+                otherwise any word is enough (OR)
+            
+        Returns:
+            List of matching tasks in ID order
+            
+        Raises:
+            FileOperationError: If the query fails
+        """
+        words = sorted(tokenize(query))
+        if not words:
+            return []
+        operator = " INTERSECT " if match_all else " UNION "
+        matching_ids = operator.join(
+            ["SELECT task_id FROM task_words WHERE word = ?"] * len(words))
+        rows = self._query(f"id IN ({matching_ids})", tuple(words))
+        return [self._row_to_task(row) for row in rows]
+    
+    def fuzzy_search(self, query: str, limit: int = 5,
+                     min_similarity: float = 0.2) -> List[Task]:
+        """Find the tasks whose descriptions are most similar to a query
+        
+        Candidates are the tasks that share a trigram with the query,
+        found through the task_trigrams table.
+        
+        Args:
+            query: The text to look for
+            limit: The maximum number of tasks to return
+            min_similarity: The lowest similarity (0 to 1) to return
+            
+        Returns:
+            List of up to limit tasks, most similar first
+            
+        Raises:
+            FileOperationError: If the query fails
+        """
+        query_grams = sorted(trigrams(query))
+        if not query_grams:
+            return []
+        placeholders = ", ".join("?" * len(query_grams))
+        try:
+            candidates = self.connection.execute(
+                "SELECT task_id, COUNT(*), (SELECT COUNT(*) FROM task_trigrams "
+                "AS other WHERE other.task_id = matches.task_id) "
+                f"FROM task_trigrams AS matches WHERE trigram IN ({placeholders}) "
+                "GROUP BY task_id", query_grams).fetchall()
+        except sqlite3.Error as e:
+            raise FileOperationError(f"Error reading tasks: {e}") from e
+        scores = []
+        for task_id, shared, total in candidates:
+            score = trigram_similarity(shared, len(query_grams), total)
+            if score >= min_similarity:
+                scores.append((score, -task_id))
+        best = heapq.nlargest(limit, scores)
+        return [self.get_task(-negative_id) for _, negative_id in best]
+    
+    def next_tasks(self, k: int = 10) -> List[Task]:
+        """Get the k most urgent pending tasks
+        
+        Args:
+            k: The number of tasks to return
+            
+        Returns:
+            List of up to k tasks, by priority (high first) and then deadline
+            
+        Raises:
+            FileOperationError: If the query fails
+        """
+        try:
+            rows = self.connection.execute(
+                "SELECT id, type, description, priority, status, created_at, "
+                "deadline, completed_at FROM tasks WHERE status != 'completed' "
+                "ORDER BY CASE priority WHEN 'high' THEN 0 WHEN 'medium' THEN 1 "
+                "ELSE 2 END, deadline IS NULL, deadline, id LIMIT ?", (k,))
+            return [self._row_to_task(row) for row in rows]
+        except sqlite3.Error as e:
+            raise FileOperationError(f"Error reading tasks: {e}") from e
+    
+    def next_deadline(self) -> Optional[Task]:
+        """Get the pending task with the earliest deadline
+        
+        Returns:
+            The task, or None if no timed task is pending
+        """
+        row = self.connection.execute(
+            "SELECT id, type, description, priority, status, created_at, "
+            "deadline, completed_at FROM tasks WHERE deadline IS NOT NULL "
+            "AND status != 'completed' ORDER BY deadline LIMIT 1").fetchone()
+        return None if row is None else self._row_to_task(row)
+    
+    def _execute(self, sql: str, params: tuple) -> int:
+        """Run one change in its own transaction
+        
+        Args:
+            sql: The statement to run
+            params: Parameters for the statement
+            
+        Returns:
+            The number of changed rows
+            
+        Raises:
+            FileOperationError: If the statement fails
+        """
+        try:
+            with self._transaction():
+                return self.connection.execute(sql, params).rowcount
+        except sqlite3.Error as e:
+            raise FileOperationError(f"Error saving task: {e}") from e
+    
+    def mark_task_complete(self, task_id: int) -> bool:
+        """Mark a task as complete with a single UPDATE
+        
+        Args:
+            task_id: The ID of the task
+            
+        Returns:
+            True if successful, False otherwise
+            
+        Raises:
+            FileOperationError: If saving fails
+        """
+        return self._execute(
+            "UPDATE tasks SET status = 'completed', completed_at = ? WHERE id = ?",
+            (datetime.now().isoformat(), task_id)) == 1
+    
+    def delete_task(self, task_id: int) -> bool:
+        """Delete a task with a single DELETE
+        
+        Args:
+            task_id: The ID of the task
+            
+        Returns:
+            True if successful, False otherwise
+            
+        Raises:
+            FileOperationError: If saving fails
+        """
+        return self._execute("DELETE FROM tasks WHERE id = ?", (task_id,)) == 1
+    
+    def complete_where(self, predicate: Callable[[Task], bool],
+                       priority: Optional[str] = None) -> int:
+        """Mark every pending task that matches a condition as complete
+        
+        The candidates are read with an indexed query and updated with
+        one executemany in a single transaction.
+        
+        Args:
+            predicate: Function that returns True for the tasks to complete
+            priority: Optional priority to limit the candidates to
+            
+        Returns:
+            The number of completed tasks
+            
+        Raises:
+            FileOperationError: If saving fails
+        """
+        completed_at = datetime.now().isoformat()
+        task_ids = [(completed_at, task.id)
+                    for task in self.get_tasks(PENDING, priority) if predicate(task)]
+        try:
+            with self._transaction():
+                self.connection.executemany(
+                    "UPDATE tasks SET status = 'completed', completed_at = ? "
+                    "WHERE id = ?", task_ids)
+        except sqlite3.Error as e:
+            raise FileOperationError(f"Error saving tasks: {e}") from e
+        return len(task_ids)
+    
+    def delete_where(self, predicate: Callable[[Task], bool],
+                     status: Optional[str] = None,
+                     priority: Optional[str] = None) -> int:
+        """Delete every task that matches a condition
+        
+        The candidates are read with an indexed query and deleted with
+        one executemany in a single transaction. The database file is
+        vacuumed afterwards to give the free pages back.
+        
+        Args:
+            predicate: Function that returns True for the tasks to delete
+            status: Optional status to limit the candidates to
+            priority: Optional priority to limit the candidates to
+            
+        Returns:
+            The number of deleted tasks
+            
+        Raises:
+            FileOperationError: If saving fails
+        """
+        task_ids = [(task.id,) for task in self.get_tasks(status, priority)
+                    if predicate(task)]
+        try:
+            with self._transaction():
+                self.connection.executemany("DELETE FROM tasks WHERE id = ?",
+                                            task_ids)
+            if task_ids and not self._in_batch:
+                self.connection.execute("VACUUM")
+        except sqlite3.Error as e:
+            raise FileOperationError(f"Error saving tasks: {e}") from e
+        return len(task_ids)
+    
+    def stats(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Get task counts from the counts table kept by triggers
+        
+        The overdue count is an indexed range count on deadline.
+        
+        Args:
+            now: The time to compare deadlines against (defaults to the
+                current time)
+            
+        Returns:
+            Dictionary with the number of tasks in total, pending,
+            completed, pending with high priority and overdue
+            
+        Raises:
+            FileOperationError: If the query fails
+        """
+        try:
+            counts = Counter({(status, priority): count for status, priority, count
+                              in self.connection.execute(
+                                  "SELECT status, priority, count FROM task_counts")})
+            overdue = self.connection.execute(
+                "SELECT COUNT(*) FROM tasks WHERE deadline < ? "
+                "AND status != 'completed'",
+                ((now or datetime.now()).isoformat(),)).fetchone()[0]
+        except sqlite3.Error as e:
+            raise FileOperationError(f"Error reading tasks: {e}") from e
+        return {
+            "total": sum(counts.values()),
+            "pending": sum(counts[(PENDING, priority)]
+                           for priority in TASK_PRIORITIES),
+            "completed": sum(counts[(COMPLETED, priority)]
+                             for priority in TASK_PRIORITIES),
+            "high_priority": counts[(PENDING, "high")],
+            "overdue": overdue,
+        }
+    
+    def view_tasks(self, status: Optional[str] = None) -> None:
+        """Display tasks with optional status filter
+        
+        Args:
+            status: Optional status to filter by
+        """
+        if status is None:
+            rows = self._query()
+        else:
+            rows = self._query("status = ?", (status,))
+        if not rows:
+            print("No tasks found!")
+            return
+        
+        overdue_ids = {row[0] for row in self._query(
+            "deadline < ? AND status != 'completed'",
+            (datetime.now().isoformat(),))}
+        
+        print("\nTasks:")
+        for row in rows:
+            print(f"{row[0]}. {self._row_to_task(row)}")
+            if row[0] in overdue_ids:
+                print("   ⚠️ This task is overdue!")
\ No newline at end of file
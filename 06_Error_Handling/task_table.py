@@ -0,0 +1,304 @@
+"""
+Column-oriented task table for the Lesson 6.2 task manager
+
+TaskTable stores tasks in NumPy arrays, one per field, instead of one
+object per task:
+- Filters such as pending or overdue tasks are vectorized comparisons
+- A table can be streamed from a JSON task file without creating a task
+  object for each record
+"""
+
+import json
+from typing import Iterable, List, Optional
+from datetime import datetime
+
+from lesson_6_2_task_manager_errors_v5 import (COMPLETED, NO_TIME,
+                                               TASK_CLASSES, TASK_PRIORITIES,
+                                               TASK_STATUSES, TASK_TYPES,
+                                               FileOperationError, Task,
+                                               TaskError, TimedTask,
+                                               ValidationError,
+                                               check_task_schema,
+                                               from_microseconds,
+                                               iter_json_array, to_microseconds)
+
+try:
+    import numpy as np
+except ImportError:  # TaskTable checks for it when a table is created
+    np = None
+
+class TaskTable:
+    """A column-oriented table of tasks backed by NumPy arrays
+    
+    Instead of one object per task, every field is stored in its own
+    array: int8 codes for type, priority and status, int64 microsecond
+    timestamps, and one shared byte buffer for all descriptions with an
+    offset array into it. Filters such as pending or overdue tasks are
+    vectorized comparisons over whole columns.
+    """
+    
+    def __init__(self, capacity: int = 1024):
+        """Initialize an empty task table
+        
+        Args:
+            capacity: Number of rows to allocate up front
+            
+        Raises:
+            TaskError: If NumPy is not installed
+        """
+        if np is None:
+            raise TaskError("TaskTable requires NumPy (pip install numpy)")
+        capacity = max(capacity, 1)
+        self._size = 0
+        self.ids = np.zeros(capacity, dtype=np.int64)  # 0 for no ID
+        self.type_codes = np.zeros(capacity, dtype=np.int8)
+        self.priority_codes = np.zeros(capacity, dtype=np.int8)
+        self.status_codes = np.zeros(capacity, dtype=np.int8)
+        self.created_at = np.zeros(capacity, dtype=np.int64)
+        self.deadline = np.full(capacity, NO_TIME, dtype=np.int64)
+        self.completed_at = np.full(capacity, NO_TIME, dtype=np.int64)
+        # Description i is descriptions[offsets[i]:offsets[i + 1]]
+        self.offsets = np.zeros(capacity + 1, dtype=np.int64)
+        self.descriptions = bytearray()
+    
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[Task]) -> 'TaskTable':
+        """Build a table from task objects
+        
+        The tasks are appended one at a time, so a generator is never
+        turned into a list first.
+        
+        Args:
+            tasks: The tasks to copy into the table
+            
+        Returns:
+            TaskTable instance
+        """
+        table = cls()
+        for task in tasks:
+            table.append(task)
+        return table
+    
+    @classmethod
+    def from_json(cls, filename: str) -> 'TaskTable':
+        """Build a table from a JSON task file written by TaskManager
+        
+        Records are streamed from the file and copied straight into the
+        columns, without creating a task object for each one.
+        
+        Args:
+            filename: The task file to read
+            
+        Returns:
+            TaskTable instance
+            
+        Raises:
+            ValidationError: If a record is invalid
+            FileOperationError: If the file cannot be read
+        """
+        table = cls()
+        try:
+            with open(filename, "r") as file:
+                for data in iter_json_array(file):
+                    table.append_record(data)
+        except (json.JSONDecodeError, IOError) as e:
+            raise FileOperationError(f"Error loading tasks: {e}") from e
+        return table
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the table's arrays and description buffer"""
+        columns = (self.ids, self.type_codes, self.priority_codes, self.status_codes,
+                   self.created_at, self.deadline, self.completed_at,
+                   self.offsets)
+        return sum(column.nbytes for column in columns) + len(self.descriptions)
+    
+    def _grow(self) -> None:
+        """Double the capacity of every column"""
+        capacity = len(self.type_codes) * 2
+        for name in ("ids", "type_codes", "priority_codes", "status_codes",
+                     "created_at", "deadline", "completed_at"):
+            column = getattr(self, name)
+            grown = np.full(capacity, NO_TIME if name in ("deadline", "completed_at")
+                            else 0, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            setattr(self, name, grown)
+        offsets = np.zeros(capacity + 1, dtype=np.int64)
+        offsets[:self._size + 1] = self.offsets[:self._size + 1]
+        self.offsets = offsets
+    
+    def _append_row(self, task_id: Optional[int], type_code: int,
+                    description: str, priority_code: int, status_code: int,
+                    created_at: int, deadline: int, completed_at: int) -> int:
+        """Add a row from column values
+        
+        Args:
+            task_id: The task ID, or None
+            type_code: Index of the type in TASK_TYPES
+            description: The task description
+            priority_code: Index of the priority in TASK_PRIORITIES
+            status_code: Index of the status in TASK_STATUSES
+            created_at: Creation time in microseconds since EPOCH
+            deadline: Deadline in microseconds, or NO_TIME
+            completed_at: Completion time in microseconds, or NO_TIME
+            
+        Returns:
+            The row number of the new row
+        """
+        if self._size == len(self.type_codes):
+            self._grow()
+        row = self._size
+        self.ids[row] = task_id or 0
+        self.type_codes[row] = type_code
+        self.priority_codes[row] = priority_code
+        self.status_codes[row] = status_code
+        self.created_at[row] = created_at
+        self.deadline[row] = deadline
+        self.completed_at[row] = completed_at
+        self.descriptions += description.encode("utf-8")
+        self.offsets[row + 1] = len(self.descriptions)
+        self._size += 1
+        return row
+    
+    def append(self, task: Task) -> int:
+        """Add a task as a new row
+        
+        Args:
+            task: The task to add
+            
+        Returns:
+            The row number of the task
+        """
+        deadline = getattr(task, "deadline", None)
+        return self._append_row(
+            task.id,
+            TASK_TYPES.index(task.get_type()),
+            task.description,
+            TASK_PRIORITIES.index(task.priority),
+            TASK_STATUSES.index(task.status),
+            to_microseconds(task.created_at),
+            NO_TIME if deadline is None else to_microseconds(deadline),
+            NO_TIME if task.completed_at is None
+            else to_microseconds(task.completed_at))
+    
+    def append_record(self, data: dict) -> int:
+        """Add a stored task record as a new row
+        
+        Args:
+            data: Dictionary written by Task.to_dict
+            
+        Returns:
+            The row number of the task
+            
+        Raises:
+            ValidationError: If the record is invalid
+        """
+        check_task_schema(data)
+        task_id = data.get("id")
+        deadline = data.get("deadline")
+        completed_at = data.get("completed_at")
+        if task_id is not None and (type(task_id) is not int or task_id < 1):
+            raise ValidationError(f"Invalid task ID: {task_id!r}")
+        if TASK_CLASSES[data["type"]] is TimedTask and not deadline:
+            raise ValidationError("Timed task without a deadline")
+        try:
+            values = (
+                to_microseconds(datetime.fromisoformat(data["created_at"])),
+                to_microseconds(datetime.fromisoformat(deadline))
+                if deadline else NO_TIME,
+                to_microseconds(datetime.fromisoformat(completed_at))
+                if completed_at else NO_TIME)
+        except (TypeError, ValueError) as e:
+            raise ValidationError(f"Invalid task data: {e}") from e
+        return self._append_row(task_id, TASK_TYPES.index(data["type"]),
+                                data["description"],
+                                TASK_PRIORITIES.index(data["priority"]),
+                                TASK_STATUSES.index(data["status"]), *values)
+    
+    def description(self, row: int) -> str:
+        """Get the description of a row"""
+        start, end = self.offsets[row], self.offsets[row + 1]
+        return self.descriptions[start:end].decode("utf-8")
+    
+    def task(self, row: int) -> Task:
+        """Create a task object from a row
+        
+        Args:
+            row: The row number
+            
+        Returns:
+            Task instance
+        """
+        deadline = int(self.deadline[row])
+        completed_at = int(self.completed_at[row])
+        return TASK_CLASSES[TASK_TYPES[self.type_codes[row]]]._restore(
+            int(self.ids[row]) or None,
+            self.description(row),
+            TASK_PRIORITIES[self.priority_codes[row]],
+            TASK_STATUSES[self.status_codes[row]],
+            from_microseconds(int(self.created_at[row])),
+            None if completed_at == NO_TIME else from_microseconds(completed_at),
+            None if deadline == NO_TIME else from_microseconds(deadline))
+    
+    def mark_complete(self, row: int) -> None:
+        """Mark a row as completed now"""
+        self.status_codes[row] = TASK_STATUSES.index(COMPLETED)
+        self.completed_at[row] = to_microseconds(datetime.now())
+    
+    def rows(self, status: Optional[str] = None,
+             priority: Optional[str] = None) -> 'np.ndarray':
+        """Get the row numbers that match the given filters
+        
+        Args:
+            status: Optional status to filter by
+            priority: Optional priority to filter by
+            
+        Returns:
+            Array of matching row numbers
+        """
+        mask = None
+        if status is not None:
+            mask = self.status_codes[:self._size] == TASK_STATUSES.index(status)
+        if priority is not None:
+            priority_mask = (self.priority_codes[:self._size]
+                             == TASK_PRIORITIES.index(priority))
+            mask = priority_mask if mask is None else mask & priority_mask
+        if mask is None:
+            return np.arange(self._size)
+        return np.flatnonzero(mask)
+    
+    def overdue_rows(self, now: Optional[datetime] = None) -> 'np.ndarray':
+        """Get the row numbers of pending tasks whose deadline has passed
+        
+        Args:
+            now: The time to compare against (defaults to the current time)
+            
+        Returns:
+            Array of matching row numbers
+        """
+        now_us = to_microseconds(now or datetime.now())
+        deadline = self.deadline[:self._size]
+        mask = ((deadline != NO_TIME) & (deadline < now_us)
+                & (self.status_codes[:self._size] != TASK_STATUSES.index(COMPLETED)))
+        return np.flatnonzero(mask)
+    
+    def count(self, status: Optional[str] = None,
+              priority: Optional[str] = None) -> int:
+        """Count the rows that match the given filters"""
+        return len(self.rows(status, priority))
+    
+    def get_tasks(self, status: Optional[str] = None,
+                  priority: Optional[str] = None) -> List[Task]:
+        """Get task objects with optional status and priority filters
+        
+        Args:
+            status: Optional status to filter by
+            priority: Optional priority to filter by
+            
+        Returns:
+            List of matching tasks
+        """
+        return [self.task(row) for row in self.rows(status, priority)]
\ No newline at end of file
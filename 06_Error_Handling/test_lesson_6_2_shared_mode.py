@@ -0,0 +1,112 @@
+"""
+Tests for the shared mode of the Lesson 6.2 task manager
+
+These tests cover:
+- Changes queued while the writer thread waits for the file lock
+- Redoing changes on top of a version saved by another process
+- Task IDs reserved across processes, so a rebase keeps them
+"""
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from lesson_6_2_task_manager_errors_v5 import BasicTask, TaskManager, fcntl
+
+class PausingTaskManager(TaskManager):
+    """A task manager whose writer thread stops before its first file lock"""
+    
+    def __init__(self, *args, **kwargs):
+        self.writer_waiting = threading.Event()
+        self.resume_writer = threading.Event()
+        super().__init__(*args, **kwargs)
+    
+    @contextmanager
+    def _exclusive_lock(self):
+        """Signal the test and wait for it before the writer takes the lock"""
+        if (threading.current_thread() is self._writer_thread
+                and not self.writer_waiting.is_set()):
+            self.writer_waiting.set()
+            self.resume_writer.wait(5)
+        with super()._exclusive_lock():
+            yield
+
+@unittest.skipIf(fcntl is None, "shared mode needs fcntl file locks")
+class TestSharedWriteBehind(unittest.TestCase):
+    """Test write-behind mode on a task file shared with other processes"""
+    
+    def setUp(self):
+        """Create a temporary task file and silence the task manager"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.filename = os.path.join(directory.name, "tasks.json")
+        patcher = patch("builtins.print")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def open_manager(self) -> PausingTaskManager:
+        """Open a write-behind manager that stores changes quickly"""
+        manager = PausingTaskManager(self.filename, write_behind=True,
+                                     shared=True, flush_interval_ms=10)
+        self.addCleanup(manager.close)
+        # Runs before close, so a failed test never leaves the writer waiting
+        self.addCleanup(manager.resume_writer.set)
+        return manager
+    
+    def wait_for_writer(self, manager: PausingTaskManager) -> None:
+        """Wait until the writer has taken the queued changes and stopped"""
+        self.assertTrue(manager.writer_waiting.wait(5),
+                        "writer did not take the changes")
+    
+    def stored_tasks(self) -> dict:
+        """Read the task file: description -> (ID, status)"""
+        with open(self.filename) as file:
+            return {data["description"]: (data["id"], data["status"])
+                    for data in json.load(file)}
+    
+    def test_changes_queued_during_rebase_are_kept(self):
+        """Changes made while the writer waits survive its rebase"""
+        manager = self.open_manager()
+        
+        manager.add_task(BasicTask("first"))
+        self.wait_for_writer(manager)
+        # Another process saves before the writer has the lock
+        TaskManager(self.filename, shared=True).add_task(BasicTask("other"))
+        # Queued after the writer took the queue, before it has the lock
+        manager.add_task(BasicTask("second"))
+        manager.mark_task_complete(1)
+        manager.resume_writer.set()
+        manager.flush()
+        
+        descriptions = sorted(task.description for task in manager.tasks.values())
+        self.assertEqual(descriptions, ["first", "other", "second"])
+        # Every task keeps the ID it reserved when it was added
+        self.assertEqual(self.stored_tasks(), {"first": (1, "completed"),
+                                               "other": (2, "pending"),
+                                               "second": (3, "pending")})
+    
+    def test_rebase_does_not_complete_a_different_task(self):
+        """A task replaced on disk under the same ID is left alone"""
+        with open(self.filename, "w") as file:
+            json.dump([BasicTask("old").to_dict() | {"id": 1}], file)
+        manager = self.open_manager()
+        
+        manager.mark_task_complete(1)
+        self.wait_for_writer(manager)
+        # Another program rewrites the file with a different task 1
+        replacement = BasicTask("replacement")
+        replacement.created_at = replacement.created_at.replace(year=2000)
+        with open(self.filename + ".tmp", "w") as file:
+            json.dump([replacement.to_dict() | {"id": 1}], file)
+        os.replace(self.filename + ".tmp", self.filename)
+        manager.resume_writer.set()
+        manager.flush()
+        
+        self.assertEqual(self.stored_tasks(), {"replacement": (1, "pending")})
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
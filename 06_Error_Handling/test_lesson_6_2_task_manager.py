@@ -0,0 +1,266 @@
+"""
+Tests for the storage of the Lesson 6.2 task manager
+
+These tests cover:
+- Replaying and compacting the journal
+- The streaming JSON array parser
+- The binary task file format
+- Rolling back a batch that fails
+"""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from lesson_6_2_task_manager_errors_v5 import (BasicTask, FileOperationError,
+                                               Task, TaskManager, TimedTask,
+                                               iter_json_array,
+                                               scan_json_array)
+
+def make_tasks() -> list:
+    """Create a few tasks of both types and priorities"""
+    timed = TimedTask("Submit report", datetime.now() + timedelta(days=2), "high")
+    return [BasicTask("Buy milk", "low"), timed, BasicTask("Call mum")]
+
+def stored_state(manager: TaskManager) -> list:
+    """Get the tasks of a manager as dictionaries, in ID order"""
+    return [manager.tasks[task_id].to_dict() for task_id in sorted(manager.tasks)]
+
+class StorageTestCase(unittest.TestCase):
+    """Base class with a temporary task file and a silenced task manager"""
+    
+    def setUp(self):
+        """Create a temporary directory and silence the task manager"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.filename = os.path.join(directory.name, "tasks.json")
+        patcher = patch("builtins.print")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def open_manager(self, **kwargs) -> TaskManager:
+        """Open a task manager on the temporary file"""
+        manager = TaskManager(self.filename, **kwargs)
+        self.addCleanup(manager.close)
+        return manager
+
+class TestJournal(StorageTestCase):
+    """Test journal mode"""
+    
+    def test_changes_are_replayed_on_load(self):
+        """Adds, completions and deletions survive a restart"""
+        manager = self.open_manager(journal=True)
+        for task in make_tasks():
+            manager.add_task(task)
+        manager.mark_task_complete(1)
+        manager.delete_task(2)
+        expected = stored_state(manager)
+        
+        self.assertFalse(os.path.exists(self.filename))
+        reloaded = self.open_manager(journal=True)
+        self.assertEqual(stored_state(reloaded), expected)
+        self.assertEqual(reloaded.compaction_stats()["journal_records"], 5)
+        self.assertEqual(reloaded.next_id, 4)
+    
+    def test_damaged_last_record_is_ignored(self):
+        """A record cut off by a crash does not stop the load"""
+        manager = self.open_manager(journal=True)
+        manager.add_task(BasicTask("Buy milk"))
+        with open(self.filename + ".journal", "a") as file:
+            file.write('{"op": "add", "task": {"id": 2, "ty')
+        
+        reloaded = self.open_manager(journal=True)
+        self.assertEqual([task.description for task in reloaded.tasks.values()],
+                         ["Buy milk"])
+    
+    def test_damaged_record_in_the_middle_fails(self):
+        """Only the last record may be damaged"""
+        with open(self.filename + ".journal", "w") as file:
+            file.write('{"op": "add"\n{"op": "delete", "id": 1}\n')
+        
+        with self.assertRaises(FileOperationError):
+            TaskManager(self.filename, journal=True)
+    
+    def test_compaction_writes_a_snapshot(self):
+        """Passing the record limit folds the journal into the task file"""
+        manager = self.open_manager(journal=True, compact_max_records=3)
+        for task in make_tasks():
+            manager.add_task(task)
+        manager.wait_for_compaction()
+        manager.mark_task_complete(3)
+        expected = stored_state(manager)
+        
+        stats = manager.compaction_stats()
+        self.assertEqual(stats["compactions"], 1)
+        self.assertEqual(stats["journal_records"], 1)
+        self.assertFalse(os.path.exists(self.filename + ".journal.compacting"))
+        with open(self.filename) as file:
+            self.assertEqual(len(json.load(file)), 3)
+        self.assertEqual(stored_state(self.open_manager(journal=True)), expected)
+    
+    def test_unfinished_compaction_is_replayed(self):
+        """Records of a compaction that did not finish are not lost"""
+        manager = self.open_manager(journal=True)
+        for task in make_tasks():
+            manager.add_task(task)
+        expected = stored_state(manager)
+        # The program stopped after rotating the journal
+        os.replace(self.filename + ".journal",
+                   self.filename + ".journal.compacting")
+        
+        self.assertEqual(stored_state(self.open_manager(journal=True)), expected)
+    
+    @unittest.skipUnless(hasattr(os, "fork"), "fork snapshots need os.fork")
+    def test_forked_compaction(self):
+        """A forked child writes the same snapshot as a thread"""
+        manager = self.open_manager(journal=True, snapshot_mode="fork")
+        for task in make_tasks():
+            manager.add_task(task)
+        expected = stored_state(manager)
+        manager.compact(wait=True)
+        
+        self.assertEqual(manager.compaction_stats()["compactions"], 1)
+        self.assertFalse(os.path.exists(self.filename + ".journal.compacting"))
+        # Without journal mode only the snapshot is read
+        self.assertEqual(stored_state(self.open_manager()), expected)
+
+class TestJsonArrayParser(unittest.TestCase):
+    """Test the streaming JSON array parser"""
+    
+    DOCUMENT = ('[\n {"description": "a, [b]", "id": 1},\n'
+                ' 12345.5e-3, "text \\" ]", [1, [2]], true, null, -7\n]\n')
+    
+    def test_matches_json_load_for_every_buffer_size(self):
+        """Elements split across chunks are parsed as a whole"""
+        expected = json.loads(self.DOCUMENT)
+        for buffer_size in range(1, len(self.DOCUMENT) + 2):
+            with self.subTest(buffer_size=buffer_size):
+                parsed = list(iter_json_array(io.StringIO(self.DOCUMENT),
+                                              buffer_size))
+                self.assertEqual(parsed, expected)
+    
+    def test_positions_cover_each_element(self):
+        """scan_json_array reports where each element is in the file"""
+        for buffer_size in (1, 5, 64):
+            with self.subTest(buffer_size=buffer_size):
+                for start, end, value in scan_json_array(
+                        io.StringIO(self.DOCUMENT), buffer_size):
+                    self.assertEqual(json.loads(self.DOCUMENT[start:end]), value)
+    
+    def test_empty_array(self):
+        """An empty array has no elements"""
+        self.assertEqual(list(iter_json_array(io.StringIO(" [ ] "), 1)), [])
+    
+    def test_invalid_documents(self):
+        """Malformed arrays raise JSONDecodeError"""
+        for document in ("", "{}", "[1,]", "[1 2]", "[1", "[1] x", "[1.]",
+                         '["open'):
+            for buffer_size in (1, 64):
+                with self.subTest(document=document, buffer_size=buffer_size):
+                    with self.assertRaises(json.JSONDecodeError):
+                        list(iter_json_array(io.StringIO(document), buffer_size))
+
+class TestBinaryFormat(StorageTestCase):
+    """Test the binary task file format"""
+    
+    def test_record_round_trip(self):
+        """A task converted to bytes and back is unchanged"""
+        for task in make_tasks():
+            task.id = 7
+            task.mark_complete()
+            with self.subTest(description=task.description):
+                self.assertEqual(Task.from_bytes(task.to_bytes()).to_dict(),
+                                 task.to_dict())
+    
+    def test_file_round_trip(self):
+        """A binary task file loads the tasks that were saved"""
+        manager = self.open_manager(file_format="binary")
+        for task in make_tasks():
+            manager.add_task(task)
+        manager.mark_task_complete(2)
+        manager.delete_task(1)
+        expected = stored_state(manager)
+        
+        reloaded = self.open_manager(file_format="binary")
+        self.assertEqual(stored_state(reloaded), expected)
+        self.assertEqual(reloaded.stats()["completed"], 1)
+    
+    def test_json_file_is_rejected(self):
+        """Opening a JSON task file in binary format fails"""
+        self.open_manager().add_task(BasicTask("Buy milk"))
+        
+        with self.assertRaises(FileOperationError):
+            TaskManager(self.filename, file_format="binary")
+
+class TestBatchRollback(StorageTestCase):
+    """Test that a failed batch leaves no change behind"""
+    
+    def prepare(self, **kwargs) -> TaskManager:
+        """Open a manager with stored tasks and remember their state"""
+        manager = self.open_manager(**kwargs)
+        for task in make_tasks():
+            manager.add_task(task)
+        self.before = stored_state(manager)
+        self.before_stats = manager.stats()
+        return manager
+    
+    def change_everything(self, manager: TaskManager) -> None:
+        """Add, complete and delete tasks inside the current batch"""
+        manager.add_task(BasicTask("Water plants"))
+        manager.mark_task_complete(2)
+        manager.delete_task(1)
+    
+    def assert_unchanged(self, manager: TaskManager, **kwargs) -> None:
+        """Check memory, indexes and the stored tasks"""
+        self.assertEqual(stored_state(manager), self.before)
+        self.assertEqual(manager.stats(), self.before_stats)
+        self.assertEqual(manager.search("plants"), [])
+        self.assertEqual([task.id for task in manager.next_tasks()], [2, 3, 1])
+        self.assertEqual(stored_state(TaskManager(self.filename, **kwargs)),
+                         self.before)
+    
+    def test_exception_in_block(self):
+        """An exception inside the block undoes its changes"""
+        manager = self.prepare()
+        with self.assertRaises(RuntimeError):
+            with manager.batch():
+                self.change_everything(manager)
+                raise RuntimeError("stop")
+        self.assert_unchanged(manager)
+    
+    def test_failed_save(self):
+        """A batch whose save fails is undone"""
+        manager = self.prepare()
+        with patch.object(TaskManager, "_write_snapshot",
+                          side_effect=FileOperationError("disk full")):
+            with self.assertRaises(FileOperationError):
+                with manager.batch():
+                    self.change_everything(manager)
+        self.assert_unchanged(manager)
+    
+    def test_failed_journal_write(self):
+        """In journal mode nothing of a failed batch is stored"""
+        manager = self.prepare(journal=True)
+        with patch("builtins.open", side_effect=IOError("disk full")):
+            with self.assertRaises(FileOperationError):
+                with manager.batch():
+                    self.change_everything(manager)
+        self.assert_unchanged(manager, journal=True)
+    
+    def test_batch_is_stored_once(self):
+        """A batch that succeeds writes the task file a single time"""
+        manager = self.prepare()
+        with patch.object(TaskManager, "_write_snapshot",
+                          wraps=manager._write_snapshot) as write:
+            with manager.batch():
+                self.change_everything(manager)
+        self.assertEqual(write.call_count, 1)
+        self.assertEqual(stored_state(TaskManager(self.filename)),
+                         stored_state(manager))
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
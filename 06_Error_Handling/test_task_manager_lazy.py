@@ -0,0 +1,132 @@
+"""
+Tests for the lazy loading task manager
+
+These tests cover:
+- Building the index from the task file
+- Reusing the saved index
+- Rebuilding an index that is missing, stale or damaged
+- Saving changes without loading every task
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from lesson_6_2_task_manager_errors_v5 import BasicTask, TaskManager, TimedTask
+from task_manager_lazy import LazyTaskManager
+
+def state(manager: TaskManager) -> list:
+    """Get the tasks of a manager as dictionaries, in ID order"""
+    return sorted((task.to_dict() for task in manager.get_tasks()),
+                  key=lambda data: data["id"])
+
+class TestLazyIndex(unittest.TestCase):
+    """Test the index of LazyTaskManager"""
+    
+    def setUp(self):
+        """Store a few tasks with the regular task manager"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.filename = os.path.join(directory.name, "tasks.json")
+        self.index_filename = self.filename + ".index"
+        patcher = patch("builtins.print")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        
+        manager = TaskManager(self.filename)
+        manager.add_task(BasicTask("Buy milk", "low"))
+        manager.add_task(TimedTask("Submit report",
+                                   datetime.now() + timedelta(days=2), "high"))
+        manager.add_task(BasicTask("Call mum"))
+        manager.mark_task_complete(1)
+        self.expected = state(manager)
+        self.expected_stats = manager.stats()
+    
+    def open_lazy(self) -> LazyTaskManager:
+        """Open a lazy manager on the task file"""
+        manager = LazyTaskManager(self.filename)
+        self.addCleanup(manager.close)
+        return manager
+    
+    def assert_matches(self, manager: LazyTaskManager) -> None:
+        """Check the tasks, counts and filters against the stored tasks"""
+        self.assertEqual(state(manager), self.expected)
+        self.assertEqual(manager.stats(), self.expected_stats)
+        self.assertEqual([task.id for task in manager.get_tasks("pending")],
+                         [2, 3])
+        self.assertEqual([task.id for task in manager.next_tasks()], [2, 3])
+    
+    def test_index_is_built_without_loading_tasks(self):
+        """Opening reads positions only; tasks load when they are used"""
+        manager = self.open_lazy()
+        
+        self.assertTrue(os.path.exists(self.index_filename))
+        self.assertEqual(len(manager.tasks), 3)
+        self.assertEqual(manager.stats(), self.expected_stats)
+        self.assertEqual(manager.tasks.loaded, {})
+        self.assertEqual(manager.get_task(3).description, "Call mum")
+        self.assertEqual(list(manager.tasks.loaded), [3])
+        self.assert_matches(manager)
+    
+    def test_saved_index_is_reused(self):
+        """A second open does not scan the task file"""
+        self.open_lazy().close()
+        
+        with patch.object(LazyTaskManager, "_build_index") as build:
+            manager = self.open_lazy()
+        build.assert_not_called()
+        self.assert_matches(manager)
+    
+    def test_missing_index_is_rebuilt(self):
+        """Deleting the index only costs a scan"""
+        self.open_lazy().close()
+        os.remove(self.index_filename)
+        
+        self.assert_matches(self.open_lazy())
+        self.assertTrue(os.path.exists(self.index_filename))
+    
+    def test_stale_index_is_rebuilt(self):
+        """An index older than the task file is not used"""
+        self.open_lazy().close()
+        manager = TaskManager(self.filename)
+        manager.add_task(BasicTask("Water plants", "high"))
+        manager.delete_task(2)
+        self.expected = state(manager)
+        self.expected_stats = manager.stats()
+        
+        lazy = self.open_lazy()
+        self.assertEqual(state(lazy), self.expected)
+        self.assertEqual(lazy.stats(), self.expected_stats)
+        self.assertEqual([task.id for task in lazy.next_tasks()], [4, 3])
+    
+    def test_truncated_index_is_rebuilt(self):
+        """An index cut short is rebuilt instead of failing"""
+        self.open_lazy().close()
+        with open(self.index_filename, "r+b") as file:
+            file.truncate(os.path.getsize(self.index_filename) - 8)
+        
+        with patch.object(LazyTaskManager, "_build_index", autospec=True,
+                          side_effect=LazyTaskManager._build_index) as build:
+            manager = self.open_lazy()
+        build.assert_called_once()
+        self.assert_matches(manager)
+    
+    def test_changes_are_saved(self):
+        """Changes reach the task file and a matching index"""
+        manager = self.open_lazy()
+        manager.add_task(BasicTask("Water plants"))
+        manager.mark_task_complete(2)
+        manager.delete_task(3)
+        self.assertEqual(sorted(manager.tasks.loaded), [2, 4])
+        expected = state(manager)
+        manager.close()
+        
+        self.assertEqual(state(TaskManager(self.filename)), expected)
+        with patch.object(LazyTaskManager, "_build_index") as build:
+            self.assertEqual(state(self.open_lazy()), expected)
+        build.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
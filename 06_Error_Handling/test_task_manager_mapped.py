@@ -0,0 +1,94 @@
+"""
+Tests for the memory-mapped task manager
+
+These tests cover:
+- Storing and loading tasks in fixed-size slots
+- Compacting the slot file without reusing IDs
+- Putting slots back when a batch fails
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from lesson_6_2_task_manager_errors_v5 import (BasicTask, FileOperationError,
+                                               TimedTask)
+from task_manager_mapped import MappedTaskManager
+
+def state(manager: MappedTaskManager) -> list:
+    """Get the tasks of a manager as dictionaries, in ID order"""
+    return [manager.tasks[task_id].to_dict() for task_id in sorted(manager.tasks)]
+
+class TestMappedStorage(unittest.TestCase):
+    """Test the slot file of MappedTaskManager"""
+    
+    def setUp(self):
+        """Create a slot file with a few tasks"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.filename = os.path.join(directory.name, "tasks.map")
+        patcher = patch("builtins.print")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        
+        self.manager = self.open_manager()
+        self.manager.add_task(BasicTask("Buy milk", "low"))
+        self.manager.add_task(TimedTask("Submit report",
+                                        datetime.now() + timedelta(days=2),
+                                        "high"))
+        self.manager.add_task(BasicTask("Call mum"))
+    
+    def open_manager(self) -> MappedTaskManager:
+        """Open a mapped manager on the slot file"""
+        manager = MappedTaskManager(self.filename)
+        self.addCleanup(manager.close)
+        return manager
+    
+    def reopen(self) -> MappedTaskManager:
+        """Close the manager and load the slot file again"""
+        self.manager.close()
+        self.manager = self.open_manager()
+        return self.manager
+    
+    def test_round_trip(self):
+        """Added, completed and deleted tasks load as they were stored"""
+        self.manager.mark_task_complete(2)
+        self.manager.delete_task(1)
+        expected = state(self.manager)
+        
+        manager = self.reopen()
+        self.assertEqual(state(manager), expected)
+        self.assertEqual(manager.stats()["completed"], 1)
+        self.assertEqual(manager.next_id, 4)
+    
+    def test_compact_keeps_ids(self):
+        """Dropping deleted slots does not free their IDs"""
+        self.manager.delete_task(3)
+        self.manager.delete_task(1)
+        self.manager.compact()
+        expected = state(self.manager)
+        
+        manager = self.reopen()
+        self.assertEqual(state(manager), expected)
+        self.assertEqual(manager._slot_count, 1)
+        manager.add_task(BasicTask("Water plants"))
+        self.assertEqual(manager.get_task(4).description, "Water plants")
+    
+    def test_failed_batch_restores_slots(self):
+        """Slots written before a failure are put back"""
+        expected = state(self.manager)
+        with patch.object(MappedTaskManager, "_persist_delete",
+                          side_effect=FileOperationError("disk full")):
+            with self.assertRaises(FileOperationError):
+                with self.manager.batch():
+                    self.manager.add_task(BasicTask("Water plants"))
+                    self.manager.mark_task_complete(2)
+                    self.manager.delete_task(1)
+        
+        self.assertEqual(state(self.manager), expected)
+        self.assertEqual(state(self.reopen()), expected)
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -5,18 +5,57 @@ This version of the task manager includes:
 - Timestamps for task creation and completion
 - File path configuration via command line arguments
 - Enhanced task display with dates
+- Optional append-only journal with background compaction
+- Optional SQLite storage (use a data file ending in .db)
+- Compact task objects using __slots__
+- Stable task IDs for direct lookup, completion and deletion
+- Range queries on creation and completion times using sorted indexes
+- Word search over task descriptions using an inverted index
+- Typo-tolerant fuzzy search using a trigram index
+- Tab completion of task descriptions from a sorted description list
 """
 
+import bisect
+import heapq
 import json
+import math
 import os
+import re
+import sqlite3
 import sys
+import threading
+import time
+from collections import Counter
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set, Tuple
+
+try:
+    import readline
+except ImportError:  # Not available on Windows
+    readline = None
+
+WORD_PATTERN = re.compile(r"\w+")
+
+def tokenize(text: str) -> Set[str]:
+    """Return the distinct lowercase words of a text"""
+    return set(WORD_PATTERN.findall(text.lower()))
+
+def trigrams(text: str) -> Set[str]:
+    """Return the distinct trigrams of the words of a text, padded at the ends"""
+    grams = set()
+    for word in WORD_PATTERN.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
 
 class Task:
     """Represents a task with timestamps"""
     
+    # Fixed attribute slots instead of a per-instance __dict__
+    __slots__ = ("id", "description", "created_at", "completed_at", "is_completed")
+    
     def __init__(self, description: str):
+        self.id: Optional[int] = None  # Set when the task is added
         self.description = description
         self.created_at = datetime.now()
         self.completed_at = None
@@ -30,6 +69,7 @@ class Task:
     def to_dict(self) -> Dict[str, Any]:
         """Convert task to dictionary for JSON serialization"""
         return {
+            "id": self.id,
             "description": self.description,
             "created_at": self.created_at.isoformat(),
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
@@ -40,6 +80,7 @@ class Task:
     def from_dict(cls, data: Dict[str, Any]) -> 'Task':
         """Create task from dictionary"""
         task = cls(data["description"])
+        task.id = data.get("id")
         task.created_at = datetime.fromisoformat(data["created_at"])
         if data["completed_at"]:
             task.completed_at = datetime.fromisoformat(data["completed_at"])
@@ -53,49 +94,377 @@ class Task:
         completed = self.completed_at.strftime("%Y-%m-%d %H:%M") if self.completed_at else "Not completed"
         return f"{status} {self.description} (Created: {created}, Completed: {completed})"
 
+class TimeIndex:
+    """Sorted (timestamp, task ID) pairs, searched by bisection"""
+    
+    __slots__ = ("entries",)
+    
+    def __init__(self):
+        self.entries: List[Tuple[datetime, int]] = []
+    
+    def add(self, moment: datetime, task_id: int) -> None:
+        """Add an entry, appending when it is the newest"""
+        entry = (moment, task_id)
+        if not self.entries or self.entries[-1] < entry:
+            self.entries.append(entry)
+        else:
+            bisect.insort(self.entries, entry)
+    
+    def remove(self, moment: datetime, task_id: int) -> None:
+        """Remove an entry if it is present"""
+        entry = (moment, task_id)
+        i = bisect.bisect_left(self.entries, entry)
+        if i < len(self.entries) and self.entries[i] == entry:
+            del self.entries[i]
+    
+    def between(self, start: Optional[datetime] = None,
+                end: Optional[datetime] = None) -> Iterator[int]:
+        """Yield task IDs with start <= timestamp < end, oldest first"""
+        entries = self.entries
+        # (moment,) sorts before every entry with that timestamp
+        low = 0 if start is None else bisect.bisect_left(entries, (start,))
+        high = len(entries) if end is None else bisect.bisect_left(entries, (end,))
+        # Iterate over a copy, since the caller may change tasks meanwhile
+        for _, task_id in entries[low:high]:
+            yield task_id
+
 class TaskManager:
     """Manages a list of tasks with file persistence"""
     
-    def __init__(self, data_file: str = "tasks.json"):
+    def __init__(self, data_file: str = "tasks.json", journal: bool = False,
+                 compact_max_records: int = 1000,
+                 compact_max_bytes: int = 1024 * 1024):
         self.data_file = data_file
-        self.tasks: List[Task] = []
+        self.journal = journal
+        self.journal_file = data_file + ".journal"
+        self.next_id_file = data_file + ".next_id"
+        self.compacting_file = data_file + ".journal.compacting"
+        self.compact_max_records = compact_max_records
+        self.compact_max_bytes = compact_max_bytes
+        self.tasks: Dict[int, Task] = {}  # Tasks by ID, in insertion order
+        self.next_id = 1
+        self.created_index = TimeIndex()
+        self.completed_index = TimeIndex()
+        self.word_index: Dict[str, Set[int]] = {}  # word -> task IDs
+        self.trigram_index: Dict[str, Set[int]] = {}  # trigram -> task IDs
+        self.trigram_counts: Dict[int, int] = {}  # task ID -> number of trigrams
+        self._lock = threading.Lock()
+        self._compaction_thread: Optional[threading.Thread] = None
+        self._journal_records = 0
+        self._journal_bytes = 0
+        self._compactions = 0
+        self._last_compaction_seconds = 0.0
         self.load_tasks()
     
     def load_tasks(self) -> None:
-        """Load tasks from file"""
+        """Load tasks from file, then replay the journal in journal mode"""
         if os.path.exists(self.data_file):
             try:
                 with open(self.data_file, 'r') as f:
                     data = json.load(f)
-                    self.tasks = [Task.from_dict(task_data) for task_data in data]
+                    for task_data in data:
+                        self._insert(Task.from_dict(task_data))
             except (json.JSONDecodeError, IOError) as e:
                 print(f"Error loading tasks: {e}")
-                self.tasks = []
+                self.tasks = {}
+                self.created_index = TimeIndex()
+                self.completed_index = TimeIndex()
+                self.word_index = {}
+                self.trigram_index = {}
+                self.trigram_counts = {}
+        self._load_next_id()
+        
+        if self.journal:
+            self._journal_records = 0
+            self._journal_bytes = 0
+            self._replay_journal(self.compacting_file)
+            self._replay_journal(self.journal_file)
+            self._maybe_compact()
     
     def save_tasks(self) -> None:
-        """Save tasks to file"""
+        """Save tasks to file (and clear the journal in journal mode)"""
+        if self.journal:
+            self.wait_for_compaction()
+        with self._lock:
+            self._write_snapshot([task.to_dict() for task in self.tasks.values()])
+            if self.journal:
+                try:
+                    open(self.journal_file, 'w').close()
+                    if os.path.exists(self.compacting_file):
+                        os.remove(self.compacting_file)
+                except OSError as e:
+                    print(f"Error clearing journal: {e}")
+                self._journal_records = 0
+                self._journal_bytes = 0
+    
+    def _load_next_id(self) -> None:
+        """Read the stored next ID, so IDs of deleted tasks are not reused"""
+        if not os.path.exists(self.next_id_file):
+            return
         try:
-            with open(self.data_file, 'w') as f:
-                json.dump([task.to_dict() for task in self.tasks], f, indent=2)
-        except IOError as e:
+            with open(self.next_id_file, 'r') as f:
+                self.next_id = max(self.next_id, json.load(f)["next_id"])
+        except (IOError, ValueError, KeyError, TypeError) as e:
+            print(f"Error loading next task ID: {e}")
+    
+    def _save_next_id(self) -> None:
+        """Store the next ID, which only grows"""
+        temp_file = self.next_id_file + ".tmp"
+        with open(temp_file, 'w') as f:
+            json.dump({"next_id": self.next_id}, f)
+        os.replace(temp_file, self.next_id_file)
+    
+    def _write_snapshot(self, data: List[Dict[str, Any]]) -> bool:
+        """Write task data to a temporary file and move it into place
+        
+        The next ID is stored first, since the snapshot may no longer
+        contain the task with the largest ID.
+        """
+        temp_file = self.data_file + ".tmp"
+        try:
+            self._save_next_id()
+            with open(temp_file, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(temp_file, self.data_file)
+            return True
+        except (IOError, OSError) as e:
             print(f"Error saving tasks: {e}")
+            return False
+    
+    def _record(self, record: Dict[str, Any]) -> None:
+        """Persist one change: append it to the journal or save everything"""
+        if not self.journal:
+            self.save_tasks()
+            return
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            try:
+                with open(self.journal_file, 'a') as f:
+                    f.write(line)
+            except IOError as e:
+                print(f"Error writing journal: {e}")
+                return
+            self._journal_records += 1
+            self._journal_bytes += len(line)
+        self._maybe_compact()
+    
+    def _replay_journal(self, journal_file: str) -> None:
+        """Apply journal records, skipping those already in the snapshot"""
+        if not os.path.exists(journal_file):
+            return
+        with open(journal_file, 'r') as f:
+            lines = f.readlines()
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A partly written last line from an interrupted save
+                break
+            task_id = record.get("id")
+            if record["op"] == "add":
+                task = Task.from_dict(record["task"])
+                if task.id not in self.tasks:
+                    self._insert(task)
+            elif record["op"] == "complete" and task_id in self.tasks:
+                task = self.tasks[task_id]
+                if task.completed_at:
+                    self.completed_index.remove(task.completed_at, task_id)
+                task.is_completed = True
+                task.completed_at = datetime.fromisoformat(record["completed_at"])
+                self.completed_index.add(task.completed_at, task_id)
+            elif record["op"] == "delete" and task_id in self.tasks:
+                self._remove(self.tasks[task_id])
+            self._journal_records += 1
+            self._journal_bytes += len(line)
+    
+    def _maybe_compact(self) -> None:
+        """Compact the journal once it passes a threshold"""
+        if (self._journal_records >= self.compact_max_records
+                or self._journal_bytes >= self.compact_max_bytes):
+            self.compact()
+    
+    def compact(self, wait: bool = False) -> None:
+        """Write a fresh snapshot in the background and drop the old journal"""
+        if not self.journal:
+            return
+        with self._lock:
+            thread = self._compaction_thread
+            if thread is None or not thread.is_alive():
+                data = [task.to_dict() for task in self.tasks.values()]
+                if os.path.exists(self.journal_file):
+                    if os.path.exists(self.compacting_file):
+                        # An earlier compaction was interrupted; keep its records
+                        with open(self.journal_file, 'r') as source, \
+                                open(self.compacting_file, 'a') as target:
+                            target.write(source.read())
+                        os.remove(self.journal_file)
+                    else:
+                        os.replace(self.journal_file, self.compacting_file)
+                self._journal_records = 0
+                self._journal_bytes = 0
+                self._compaction_thread = threading.Thread(
+                    target=self._run_compaction, args=(data,))
+                self._compaction_thread.start()
+        if wait:
+            self.wait_for_compaction()
+    
+    def _run_compaction(self, data: List[Dict[str, Any]]) -> None:
+        """Background part of compact()"""
+        started = time.perf_counter()
+        if self._write_snapshot(data) and os.path.exists(self.compacting_file):
+            os.remove(self.compacting_file)
+            self._compactions += 1
+            self._last_compaction_seconds = time.perf_counter() - started
+    
+    def wait_for_compaction(self) -> None:
+        """Block until a running compaction has finished"""
+        if self._compaction_thread is not None:
+            self._compaction_thread.join()
+    
+    def compaction_stats(self) -> Dict[str, Any]:
+        """Return journal size and compaction counters"""
+        thread = self._compaction_thread
+        return {
+            "journal_records": self._journal_records,
+            "journal_bytes": self._journal_bytes,
+            "compact_max_records": self.compact_max_records,
+            "compact_max_bytes": self.compact_max_bytes,
+            "compactions": self._compactions,
+            "last_compaction_seconds": self._last_compaction_seconds,
+            "compacting": thread is not None and thread.is_alive(),
+        }
+    
+    def _insert(self, task: Task) -> None:
+        """Store a task by its ID, giving it the next free ID if it has none"""
+        if task.id is None:
+            task.id = self.next_id
+        self.tasks[task.id] = task
+        self.next_id = max(self.next_id, task.id + 1)
+        self.created_index.add(task.created_at, task.id)
+        if task.completed_at:
+            self.completed_index.add(task.completed_at, task.id)
+        for word in tokenize(task.description):
+            self.word_index.setdefault(word, set()).add(task.id)
+        grams = trigrams(task.description)
+        for gram in grams:
+            self.trigram_index.setdefault(gram, set()).add(task.id)
+        self.trigram_counts[task.id] = len(grams)
+    
+    def _remove(self, task: Task) -> None:
+        """Drop a task and its index entries"""
+        del self.tasks[task.id]
+        self.created_index.remove(task.created_at, task.id)
+        if task.completed_at:
+            self.completed_index.remove(task.completed_at, task.id)
+        for index, terms in ((self.word_index, tokenize(task.description)),
+                             (self.trigram_index, trigrams(task.description))):
+            for term in terms:
+                task_ids = index[term]
+                task_ids.discard(task.id)
+                if not task_ids:
+                    del index[term]
+        del self.trigram_counts[task.id]
     
     def add_task(self, description: str) -> None:
         """Add a new task"""
         task = Task(description)
-        self.tasks.append(task)
-        self.save_tasks()
-        print(f"Added task: {description}")
+        self._insert(task)
+        self._record({"op": "add", "task": task.to_dict()})
+        print(f"Added task {task.id}: {description}")
+    
+    def get_task(self, task_id: int) -> Optional[Task]:
+        """Return the task with the given ID, or None"""
+        return self.tasks.get(task_id)
     
-    def complete_task(self, index: int) -> None:
+    def complete_task(self, task_id: int) -> None:
         """Mark a task as completed"""
-        try:
-            task = self.tasks[index]
-            task.complete()
-            self.save_tasks()
-            print(f"Completed task: {task.description}")
-        except IndexError:
-            print("Invalid task index")
+        task = self.tasks.get(task_id)
+        if task is None:
+            print("Invalid task ID")
+            return
+        if task.completed_at:
+            self.completed_index.remove(task.completed_at, task_id)
+        task.complete()
+        self.completed_index.add(task.completed_at, task_id)
+        self._record({"op": "complete", "id": task_id,
+                      "completed_at": task.completed_at.isoformat()})
+        print(f"Completed task: {task.description}")
+    
+    def delete_task(self, task_id: int) -> None:
+        """Delete a task"""
+        task = self.tasks.get(task_id)
+        if task is None:
+            print("Invalid task ID")
+            return
+        self._remove(task)
+        self._record({"op": "delete", "id": task_id})
+        print(f"Deleted task: {task.description}")
+    
+    def tasks_created_between(self, start: Optional[datetime] = None,
+                              end: Optional[datetime] = None) -> Iterator[Task]:
+        """Yield tasks created in [start, end), oldest first"""
+        for task_id in self.created_index.between(start, end):
+            task = self.tasks.get(task_id)
+            if task is not None:  # Deleted while the caller was iterating
+                yield task
+    
+    def tasks_completed_between(self, start: Optional[datetime] = None,
+                                end: Optional[datetime] = None) -> Iterator[Task]:
+        """Yield tasks completed in [start, end), oldest first"""
+        for task_id in self.completed_index.between(start, end):
+            task = self.tasks.get(task_id)
+            if task is not None:  # Deleted while the caller was iterating
+                yield task
+    
+    def search(self, query: str, match_all: bool = True) -> List[Task]:
+        """Return tasks containing all (or, if not match_all, any) query words
+        
+        Intersects the ID sets of the words, smallest first.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        postings = sorted((self.word_index.get(word, set()) for word in words),
+                          key=len)
+        if match_all:
+            task_ids = set(postings[0])
+            for posting in postings[1:]:
+                if not task_ids:
+                    break
+                task_ids &= posting
+        else:
+            task_ids = set().union(*postings)
+        return [self.tasks[task_id] for task_id in sorted(task_ids)]
+    
+    def fuzzy_search(self, query: str, limit: int = 5,
+                     min_similarity: float = 0.2) -> List[Task]:
+        """Return up to limit tasks most similar to query, best first
+        
+        Similarity is the Jaccard overlap of trigrams. A task must share
+        min_shared trigrams to qualify, so it must appear in one of the
+        rarest len - min_shared + 1 trigram lists; only those are scanned.
+        """
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        postings = sorted((self.trigram_index.get(gram, set())
+                           for gram in query_grams), key=len)
+        min_shared = max(1, math.ceil(min_similarity * len(query_grams)))
+        prefix = len(postings) - min_shared + 1
+        shared = Counter()
+        for posting in postings[:prefix]:
+            shared.update(posting)
+        for posting in postings[prefix:]:
+            shared.update(shared.keys() & posting)
+        scores = []
+        for task_id, count in shared.items():
+            if count >= min_shared:
+                total = self.trigram_counts[task_id]
+                score = count / (len(query_grams) + total - count)
+                if score >= min_similarity:
+                    scores.append((score, -task_id))
+        return [self.tasks[-negative_id]
+                for _, negative_id in heapq.nlargest(limit, scores)]
     
     def list_tasks(self) -> None:
         """Display all tasks"""
@@ -104,37 +473,346 @@ class TaskManager:
             return
         
         print("\nTasks:")
-        for i, task in enumerate(self.tasks):
-            print(f"{i + 1}. {task}")
+        for task in self.tasks.values():
+            print(f"{task.id}. {task}")
+
+class SQLiteTaskManager:
+    """Stores tasks in an indexed SQLite database instead of a JSON file
+    
+    Filters are SQL queries on the indexed columns and every change is a
+    single-row INSERT or UPDATE, so nothing has to hold all tasks in memory.
+    AUTOINCREMENT keeps the ID of a deleted task from being reused.
+    It has the same task methods as TaskManager, but no journal to compact.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            description TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            completed_at TEXT,
+            is_completed INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_is_completed ON tasks(is_completed);
+        CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks(created_at);
+        CREATE INDEX IF NOT EXISTS idx_tasks_completed_at ON tasks(completed_at);
+        CREATE TABLE IF NOT EXISTS task_words (
+            word TEXT NOT NULL,
+            task_id INTEGER NOT NULL,
+            PRIMARY KEY (word, task_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_task_words_task_id ON task_words(task_id);
+        CREATE TABLE IF NOT EXISTS task_trigrams (
+            trigram TEXT NOT NULL,
+            task_id INTEGER NOT NULL,
+            PRIMARY KEY (trigram, task_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_task_trigrams_task_id ON task_trigrams(task_id);
+        CREATE TRIGGER IF NOT EXISTS task_words_delete AFTER DELETE ON tasks
+        BEGIN
+            DELETE FROM task_words WHERE task_id = old.id;
+            DELETE FROM task_trigrams WHERE task_id = old.id;
+        END;
+    """
+    
+    INSERT = ("INSERT INTO tasks (description, created_at, completed_at, "
+              "is_completed) VALUES (?, ?, ?, ?)")
+    SELECT = ("SELECT id, description, created_at, completed_at, is_completed "
+              "FROM tasks")
+    
+    def __init__(self, data_file: str = "tasks.db"):
+        self.data_file = data_file
+        self.load_tasks()
+    
+    @property
+    def tasks(self) -> Dict[int, Task]:
+        """All tasks by ID, read from the database"""
+        return {task.id: task for task in self.get_tasks()}
+    
+    def load_tasks(self) -> None:
+        """Open the database and create the schema if needed"""
+        self.connection = sqlite3.connect(self.data_file)
+        self.connection.executescript(self.SCHEMA)
+    
+    def _index_descriptions(self, after_id: int = 0) -> None:
+        """Add words and trigrams of tasks with id > after_id to the search tables"""
+        rows = self.connection.execute(
+            "SELECT id, description FROM tasks WHERE id > ?", (after_id,)).fetchall()
+        for task_id, description in rows:
+            self._index_description(task_id, description, "INSERT OR IGNORE")
+    
+    def _index_description(self, task_id: int, description: str,
+                           insert: str = "INSERT") -> None:
+        """Add the words and trigrams of one description to the search tables"""
+        self.connection.executemany(
+            f"{insert} INTO task_words (word, task_id) VALUES (?, ?)",
+            ((word, task_id) for word in tokenize(description)))
+        self.connection.executemany(
+            f"{insert} INTO task_trigrams (trigram, task_id) VALUES (?, ?)",
+            ((gram, task_id) for gram in trigrams(description)))
+    
+    def save_tasks(self) -> None:
+        """Commit pending changes (each change is already committed)"""
+        self.connection.commit()
+    
+    def close(self) -> None:
+        """Close the database connection"""
+        self.connection.close()
+    
+    def import_json(self, json_file: str) -> int:
+        """Copy the tasks of a JSON task file into the database"""
+        try:
+            with open(json_file, 'r') as f:
+                data = json.load(f)
+            with self.connection:
+                last_id = self.connection.execute(
+                    "SELECT COALESCE(MAX(id), 0) FROM tasks").fetchone()[0]
+                self.connection.executemany(self.INSERT, [
+                    (d["description"], d["created_at"], d["completed_at"],
+                     int(d["is_completed"])) for d in data])
+                self._index_descriptions(last_id)
+        except (json.JSONDecodeError, KeyError, IOError, sqlite3.Error) as e:
+            print(f"Error importing tasks: {e}")
+            return 0
+        return len(data)
+    
+    def get_tasks(self, completed: Optional[bool] = None) -> List[Task]:
+        """Get all tasks, or only completed/open ones, in insertion order"""
+        sql = self.SELECT
+        params: tuple = ()
+        if completed is not None:
+            sql += " WHERE is_completed = ?"
+            params = (int(completed),)
+        rows = self.connection.execute(sql + " ORDER BY id", params)
+        return [self._row_to_task(row) for row in rows]
+    
+    def get_task(self, task_id: int) -> Optional[Task]:
+        """Return the task with the given ID, or None, using the primary key"""
+        row = self.connection.execute(self.SELECT + " WHERE id = ?",
+                                      (task_id,)).fetchone()
+        return None if row is None else self._row_to_task(row)
+    
+    @staticmethod
+    def _row_to_task(row: tuple) -> Task:
+        """Create a task from a row returned by SELECT"""
+        task_id, description, created_at, completed_at, is_completed = row
+        return Task.from_dict({"id": task_id,
+                               "description": description,
+                               "created_at": created_at,
+                               "completed_at": completed_at,
+                               "is_completed": bool(is_completed)})
+    
+    def _tasks_between(self, column: str, start: Optional[datetime],
+                       end: Optional[datetime]) -> Iterator[Task]:
+        """Yield tasks whose column is in [start, end) using its index"""
+        sql = f"{self.SELECT} WHERE {column} IS NOT NULL"
+        params = []
+        if start is not None:
+            sql += f" AND {column} >= ?"
+            params.append(start.isoformat())
+        if end is not None:
+            sql += f" AND {column} < ?"
+            params.append(end.isoformat())
+        for row in self.connection.execute(sql + f" ORDER BY {column}, id", params):
+            yield self._row_to_task(row)
+    
+    def tasks_created_between(self, start: Optional[datetime] = None,
+                              end: Optional[datetime] = None) -> Iterator[Task]:
+        """Yield tasks created in [start, end), oldest first"""
+        return self._tasks_between("created_at", start, end)
+    
+    def tasks_completed_between(self, start: Optional[datetime] = None,
+                                end: Optional[datetime] = None) -> Iterator[Task]:
+        """Yield tasks completed in [start, end), oldest first"""
+        return self._tasks_between("completed_at", start, end)
+    
+    def search(self, query: str, match_all: bool = True) -> List[Task]:
+        """Return tasks containing all (or any) query words via task_words"""
+        words = sorted(tokenize(query))
+        if not words:
+            return []
+        operator = " INTERSECT " if match_all else " UNION "
+        matching_ids = operator.join(
+            ["SELECT task_id FROM task_words WHERE word = ?"] * len(words))
+        rows = self.connection.execute(
+            f"{self.SELECT} WHERE id IN ({matching_ids}) ORDER BY id", words)
+        return [self._row_to_task(row) for row in rows]
+    
+    def fuzzy_search(self, query: str, limit: int = 5,
+                     min_similarity: float = 0.2) -> List[Task]:
+        """Return up to limit tasks most similar to query, using task_trigrams"""
+        query_grams = sorted(trigrams(query))
+        if not query_grams:
+            return []
+        placeholders = ", ".join("?" * len(query_grams))
+        candidates = self.connection.execute(
+            "SELECT task_id, COUNT(*), (SELECT COUNT(*) FROM task_trigrams AS other "
+            "WHERE other.task_id = matches.task_id) FROM task_trigrams AS matches "
+            f"WHERE trigram IN ({placeholders}) GROUP BY task_id", query_grams)
+        scores = []
+        for task_id, shared, total in candidates:
+            score = shared / (len(query_grams) + total - shared)
+            if score >= min_similarity:
+                scores.append((score, -task_id))
+        return [self.get_task(-negative_id)
+                for _, negative_id in heapq.nlargest(limit, scores)]
+    
+    def add_task(self, description: str) -> None:
+        """Add a new task with a single INSERT"""
+        task = Task(description)
+        try:
+            with self.connection:
+                cursor = self.connection.execute(self.INSERT, (
+                    task.description, task.created_at.isoformat(), None, 0))
+                self._index_description(cursor.lastrowid, description)
+        except sqlite3.Error as e:
+            print(f"Error saving task: {e}")
+            return
+        print(f"Added task {cursor.lastrowid}: {description}")
+    
+    def complete_task(self, task_id: int) -> None:
+        """Mark a task as completed with a single UPDATE"""
+        task = self.get_task(task_id)
+        if task is None:
+            print("Invalid task ID")
+            return
+        with self.connection:
+            self.connection.execute(
+                "UPDATE tasks SET is_completed = 1, completed_at = ? WHERE id = ?",
+                (datetime.now().isoformat(), task_id))
+        print(f"Completed task: {task.description}")
+    
+    def delete_task(self, task_id: int) -> None:
+        """Delete a task with a single DELETE"""
+        task = self.get_task(task_id)
+        if task is None:
+            print("Invalid task ID")
+            return
+        with self.connection:
+            self.connection.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        print(f"Deleted task: {task.description}")
+    
+    def list_tasks(self) -> None:
+        """Display all tasks"""
+        tasks = self.get_tasks()
+        if not tasks:
+            print("No tasks found")
+            return
+        
+        print("\nTasks:")
+        for task in tasks:
+            print(f"{task.id}. {task}")
+
+
+class DescriptionIndex:
+    """Descriptions sorted by lowercase form; a prefix is a run found with bisect,
+    ranked by use count then recency (at most max_scan entries of it)"""
+    
+    LAST_CHAR = "\U0010ffff"  # Sorts after every character
+    
+    def __init__(self, descriptions: Iterable[str] = (), max_suggestions: int = 5,
+                 max_scan: int = 10000):
+        self.max_suggestions = max_suggestions
+        self.max_scan = max_scan
+        self.ranks: Dict[str, Tuple[int, int]] = {}  # description -> (uses, last use)
+        self._clock = 0
+        for description in descriptions:
+            self._use(description)
+        # (lowercase description, description), sorted once
+        self.entries = sorted((description.lower(), description)
+                              for description in self.ranks)
+    
+    def _use(self, description: str) -> bool:
+        """Update the rank of a description; True if it is new"""
+        self._clock += 1
+        count = self.ranks.get(description, (0, 0))[0]
+        self.ranks[description] = (count + 1, self._clock)
+        return count == 0
+    
+    def add(self, description: str) -> None:
+        """Record a use of a description, inserting it if it is new"""
+        if self._use(description):
+            bisect.insort(self.entries, (description.lower(), description))
+    
+    def complete(self, prefix: str) -> List[str]:
+        """Return the best descriptions starting with prefix, ignoring case"""
+        key = prefix.lower()
+        entries = self.entries
+        start = bisect.bisect_left(entries, (key,))
+        end = bisect.bisect_left(entries, (key + self.LAST_CHAR,), start)
+        end = min(end, start + self.max_scan)
+        matches = (description for _, description in entries[start:end])
+        return heapq.nlargest(self.max_suggestions, matches, key=self.ranks.__getitem__)
+
+def input_description(completions: DescriptionIndex) -> str:
+    """Ask for a task description, completing it with Tab when readline is available"""
+    prompt = "Enter task description: "
+    if readline is None:
+        return input(prompt)
+    
+    def complete(text: str, state: int) -> Optional[str]:
+        matches = completions.complete(text)
+        return matches[state] if state < len(matches) else None
+    
+    readline.set_completer_delims("")  # Complete the whole line
+    readline.set_completer(complete)
+    readline.parse_and_bind("tab: complete")
+    try:
+        return input(prompt)
+    finally:
+        readline.set_completer(None)
+
 
 def main():
     """Main function"""
     # Get data file from command line arguments or use default
     data_file = sys.argv[1] if len(sys.argv) > 1 else "tasks.json"
-    manager = TaskManager(data_file)
+    if data_file.endswith(".db"):
+        manager = SQLiteTaskManager(data_file)
+    else:
+        manager = TaskManager(data_file)
+    completions = DescriptionIndex(task.description for task in manager.tasks.values())
     
     while True:
         print("\nTask Manager Menu:")
         print("1. Add task")
         print("2. Complete task")
         print("3. List tasks")
-        print("4. Exit")
+        print("4. Delete task")
+        print("5. Search tasks")
+        print("6. Exit")
         
-        choice = input("Enter your choice (1-4): ")
+        choice = input("Enter your choice (1-6): ")
         
         if choice == "1":
-            description = input("Enter task description: ")
+            description = input_description(completions)
             manager.add_task(description)
+            completions.add(description)
         elif choice == "2":
             manager.list_tasks()
             try:
-                index = int(input("Enter task number to complete: ")) - 1
-                manager.complete_task(index)
+                task_id = int(input("Enter task ID to complete: "))
+                manager.complete_task(task_id)
             except ValueError:
                 print("Invalid input. Please enter a number.")
         elif choice == "3":
             manager.list_tasks()
         elif choice == "4":
+            manager.list_tasks()
+            try:
+                task_id = int(input("Enter task ID to delete: "))
+                manager.delete_task(task_id)
+            except ValueError:
+                print("Invalid input. Please enter a number.")
+        elif choice == "5":
+            query = input("Enter search words: ")
+            tasks = manager.search(query)
+            if not tasks:
+                tasks = manager.fuzzy_search(query)
+                print("No exact matches. Similar tasks:" if tasks else "No tasks found")
+            for task in tasks:
+                print(f"{task.id}. {task}")
+        elif choice == "6":
             print("Goodbye!")
             break
         else: